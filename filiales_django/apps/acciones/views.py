@@ -19,7 +19,10 @@ class AccionSolidariaViewSet(FilialScopedQuerysetMixin, BaseModelViewSet):
         "fecha": ["exact", "gte", "lte"],
     }
     search_fields = ["nombre", "descripcion", "ubicacion", "filial__nombre"]
+    full_text_search = True
     ordering_fields = ["fecha", "created_at", "estado", "nombre"]
+    query_budget = {"list": 6, "retrieve": 5}
+    conditional_related = ("filial", "imagenes")
     allow_filial_user_writes = True
 
     def get_queryset(self):  # type: ignore[override]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auditoria", "0002_alter_accion_user_agent"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="accion",
+            index=models.Index(
+                fields=["created_at", "id"], name="accion_created_id_idx"
+            ),
+        ),
+    ]
@@ -46,6 +46,7 @@ class Accion(TimeStampedModel):
             models.Index(fields=("recurso", "recurso_id"), name="accion_recurso_idx"),
             models.Index(fields=("usuario",), name="accion_usuario_idx"),
             models.Index(fields=("filial",), name="accion_filial_idx"),
+            models.Index(fields=("created_at", "id"), name="accion_created_id_idx"),
         ]
 
     def __str__(self) -> str:
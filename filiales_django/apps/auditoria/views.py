@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-import csv
-from io import StringIO
-
+from apps.auditoria import exportacion
 from apps.auditoria.models import Accion
 from apps.auditoria.serializers import AccionSerializer
 from apps.core.viewsets import BaseModelViewSet
-from django.http import HttpResponse
-from rest_framework import decorators
+from django.http import StreamingHttpResponse
+from rest_framework import decorators, exceptions
 
 
 class AccionViewSet(BaseModelViewSet):
@@ -22,8 +20,10 @@ class AccionViewSet(BaseModelViewSet):
     }
     search_fields = ["recurso", "accion"]
     ordering_fields = ["created_at", "accion", "recurso"]
+    query_budget = {"list": 5, "retrieve": 4}
     http_method_names = ["get", "head", "options"]
     allow_filial_user_writes = False
+    exportar_chunk_size = 2000
 
     def get_queryset(self):  # type: ignore[override]
         queryset = super().get_queryset()
@@ -38,24 +38,23 @@ class AccionViewSet(BaseModelViewSet):
 
     @decorators.action(detail=False, methods=["get"], url_path="exportar")
     def exportar(self, request):
+        formato = request.query_params.get("formato", "csv")
+        if formato not in exportacion.FORMATOS:
+            opciones = ", ".join(exportacion.FORMATOS)
+            raise exceptions.ValidationError(
+                {"formato": f"Formato no soportado. Opciones: {opciones}"}
+            )
+        incluir_payload = request.query_params.get("incluir_payload", "").lower()
         queryset = self.filter_queryset(self.get_queryset())
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-        writer.writerow(
-            ["id", "usuario", "filial", "recurso", "recurso_id", "accion", "created_at"]
+        content_type, filename = exportacion.FORMATOS[formato]
+        response = StreamingHttpResponse(
+            exportacion.exportar(
+                queryset,
+                formato,
+                incluir_payload=incluir_payload in ("1", "true"),
+                chunk_size=self.exportar_chunk_size,
+            ),
+            content_type=content_type,
         )
-        for accion in queryset:
-            writer.writerow(
-                [
-                    accion.id,
-                    accion.usuario_id,
-                    accion.filial_id,
-                    accion.recurso,
-                    accion.recurso_id,
-                    accion.accion,
-                    accion.created_at.isoformat(),
-                ]
-            )
-        response = HttpResponse(buffer.getvalue(), content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=auditoria.csv"
+        response["Content-Disposition"] = f"attachment; filename={filename}"
         return response
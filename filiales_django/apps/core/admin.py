@@ -1 +1,20 @@
 """Admin configurado desde las apps específicas."""
+
+from apps.core.models import CorreoSaliente, WebhookSaliente
+from django.contrib import admin
+
+
+@admin.register(WebhookSaliente)
+class WebhookSalienteAdmin(admin.ModelAdmin):
+    list_display = ("id", "evento", "estado", "intentos", "proximo_intento", "url")
+    list_filter = ("estado", "evento")
+    search_fields = ("url", "ultimo_error")
+    ordering = ("-created_at",)
+
+
+@admin.register(CorreoSaliente)
+class CorreoSalienteAdmin(admin.ModelAdmin):
+    list_display = ("id", "destinatario", "asunto", "estado", "intentos", "created_at")
+    list_filter = ("estado",)
+    search_fields = ("destinatario", "asunto", "ultimo_error")
+    ordering = ("-created_at",)
@@ -1,15 +1,97 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
 
-from apps.core.services import dispatch_webhook
+from apps.core.services import dispatch_webhooks
+from django.conf import settings
 from django.db import transaction
 
 logger = logging.getLogger(__name__)
 
+_pendientes: ContextVar[list | None] = ContextVar("audit_pendientes", default=None)
 
-def log_action(
+
+def _persistir(registros: list) -> None:
+    from apps.auditoria.models import Accion
+
+    if not registros:
+        return
+    Accion.objects.bulk_create(registros)
+    _notificar(registros)
+
+
+def _notificar(registros: list) -> None:
+    try:
+        dispatch_webhooks(
+            "auditoria",
+            [
+                {
+                    "id": registro.id,
+                    "usuario": registro.usuario_id,
+                    "filial": registro.filial_id,
+                    "recurso": registro.recurso,
+                    "recurso_id": registro.recurso_id,
+                    "accion": registro.accion,
+                    "payload": registro.payload,
+                }
+                for registro in registros
+            ],
+        )
+    except Exception as exc:  # pragma: no cover - logging safeguard
+        logger.exception("Error enviando webhook de auditoria: %%s", exc)
+
+
+def flush_audit(registros: list) -> None:
+    """Persiste los registros acumulados cuando confirma la transacción en curso.
+
+    Para entonces la respuesta ya está confirmada: una falla al insertar se
+    registra en el log en lugar de convertir el request en un 500.
+    """
+
+    def _flush() -> None:
+        pendientes = list(registros)
+        registros.clear()
+        try:
+            _persistir(pendientes)
+        except Exception:
+            logger.exception(
+                "No se pudo escribir la auditoría de %d acciones", len(pendientes)
+            )
+
+    transaction.on_commit(_flush)
+
+
+@contextmanager
+def audit_buffer() -> Iterator[list]:
+    """Acumula las acciones auditadas y las inserta con un único ``bulk_create``."""
+    registros: list = []
+    token = _pendientes.set(registros)
+    try:
+        yield registros
+    finally:
+        _pendientes.reset(token)
+        flush_audit(registros)
+
+
+def registrar(registros: list) -> None:
+    """Inserta ``registros`` en la transacción en curso con un único INSERT.
+
+    A diferencia de ``log_action`` no espera al buffer del request: la
+    auditoría se confirma o se revierte junto con los cambios que describe.
+    El webhook de auditoría sale al confirmar.
+    """
+    from apps.auditoria.models import Accion
+
+    if not registros:
+        return
+    Accion.objects.bulk_create(registros)
+    transaction.on_commit(lambda: _notificar(registros))
+
+
+def nueva_accion(
     *,
     usuario,
     recurso: str,
@@ -18,38 +100,49 @@ def log_action(
     payload: dict[str, Any] | None = None,
     filial=None,
     request=None,
-) -> None:
+):
+    """``Accion`` sin guardar con la IP y el user agent de ``request``."""
     from apps.auditoria.models import Accion
 
     ip = None
     user_agent = None
     if request:
         ip = request.META.get("REMOTE_ADDR")
-        user_agent = request.META.get("HTTP_USER_AGENT")
-    payload = payload or {}
-    with transaction.atomic():
-        registro = Accion.objects.create(
-            usuario=usuario,
-            filial=filial,
-            recurso=recurso,
-            recurso_id=str(recurso_id),
-            accion=accion,
-            payload=payload,
-            ip=ip,
-            user_agent=user_agent,
-        )
-    try:
-        dispatch_webhook(
-            "auditoria",
-            {
-                "id": registro.id,
-                "usuario": usuario.pk if usuario else None,
-                "filial": filial.pk if filial else None,
-                "recurso": recurso,
-                "recurso_id": registro.recurso_id,
-                "accion": accion,
-                "payload": payload,
-            },
-        )
-    except Exception as exc:  # pragma: no cover - logging safeguard
-        logger.exception("Error enviando webhook de auditoria: %%s", exc)
+        user_agent = (request.META.get("HTTP_USER_AGENT") or "")[:255] or None
+    return Accion(
+        usuario=usuario,
+        filial=filial,
+        recurso=recurso,
+        recurso_id=str(recurso_id),
+        accion=accion,
+        payload=payload or {},
+        ip=ip,
+        user_agent=user_agent,
+    )
+
+
+def log_action(
+    *,
+    usuario,
+    recurso: str,
+    recurso_id: Any,
+    accion: str,
+    payload: dict[str, Any] | None = None,
+    filial=None,
+    request=None,
+) -> None:
+    registro = nueva_accion(
+        usuario=usuario,
+        recurso=recurso,
+        recurso_id=recurso_id,
+        accion=accion,
+        payload=payload,
+        filial=filial,
+        request=request,
+    )
+    pendientes = _pendientes.get()
+    if pendientes is None or getattr(settings, "AUDIT_SYNC", False):
+        _persistir([registro])
+        return
+    # Solo se audita lo que efectivamente se confirma en la base.
+    transaction.on_commit(lambda: pendientes.append(registro))
@@ -0,0 +1,94 @@
+"""Inserción masiva por lotes: ``bulk_create`` o ``COPY`` en PostgreSQL."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from django.db import connections, models, transaction
+
+NULO = r"\N"
+
+Progreso = Callable[[str, int, int | None], None]
+
+
+def lotes(filas: Iterable, tamano: int) -> Iterator[list]:
+    filas = iter(filas)
+    while lote := list(islice(filas, tamano)):
+        yield lote
+
+
+def _columnas(model) -> list[models.Field]:
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if not (field.primary_key and isinstance(field, models.AutoField))
+    ]
+
+
+def _valor_copy(field: models.Field, obj, connection) -> str:
+    valor = field.pre_save(obj, add=True)
+    if valor is None:
+        return NULO
+    if isinstance(field, models.JSONField):
+        return json.dumps(valor, cls=field.encoder)
+    valor = field.get_db_prep_save(valor, connection)
+    if valor is None:
+        return NULO
+    return str(valor)
+
+
+def _copiar(model, lote: list, using: str) -> None:
+    connection = connections[using]
+    columnas = _columnas(model)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for obj in lote:
+        writer.writerow([_valor_copy(field, obj, connection) for field in columnas])
+    buffer.seek(0)
+    quote = connection.ops.quote_name
+    sql = (
+        f"COPY {quote(model._meta.db_table)} "
+        f"({', '.join(quote(field.column) for field in columnas)}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{NULO}')"
+    )
+    with connection.cursor() as cursor:
+        # ``cursor.cursor`` es el cursor de psycopg2 debajo del wrapper de Django.
+        cursor.cursor.copy_expert(sql, buffer)
+
+
+def insertar(
+    model,
+    filas: Iterable,
+    *,
+    batch_size: int = 5_000,
+    total: int | None = None,
+    con_ids: bool = False,
+    usar_copy: bool = True,
+    progreso: Progreso | None = None,
+    using: str = "default",
+) -> list[int]:
+    """Inserta ``filas`` (instancias sin guardar) por lotes de ``batch_size``.
+
+    En PostgreSQL usa ``COPY FROM STDIN`` salvo que se necesiten los ids
+    generados (``con_ids``), en cuyo caso recurre a ``bulk_create``. Como
+    ``bulk_create``, no llama a ``save()`` ni dispara señales.
+    """
+    copy = usar_copy and not con_ids and connections[using].vendor == "postgresql"
+    ids: list[int] = []
+    insertados = 0
+    for lote in lotes(filas, batch_size):
+        with transaction.atomic(using=using):
+            if copy:
+                _copiar(model, lote, using)
+            else:
+                creados = model.objects.using(using).bulk_create(lote)
+                if con_ids:
+                    ids.extend(obj.pk for obj in creados)
+        insertados += len(lote)
+        if progreso:
+            progreso(model._meta.label, insertados, total)
+    return ids
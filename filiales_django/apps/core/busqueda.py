@@ -0,0 +1,102 @@
+"""Búsqueda de texto completo para los ``search_fields`` de las vistas.
+
+En PostgreSQL las tablas con búsqueda tienen una columna ``busqueda``
+(``tsvector`` generado y almacenado, con índice GIN) que crean sus migraciones
+con la configuración ``es_unaccent``: español con stemming y sin acentos. La
+columna no está declarada en los modelos, así que nunca viaja en los
+``SELECT`` ni existe en SQLite.
+
+Las vistas con ``full_text_search = True`` buscan ``?search=`` sobre esa
+columna y ordenan por ``ts_rank`` salvo que se pida ``?ordering=``. Cada
+término se busca como prefijo (``to_tsquery('riv':*)``), así que ``Riv``
+encuentra "River", igual que con ``icontains``. Los campos relacionados de
+``search_fields`` (``filial__nombre``) no están en la columna: se comparan
+con ``icontains`` y se combinan con OR, término a término, como hace el
+``SearchFilter`` de DRF, que sigue siendo el comportamiento en SQLite y en
+las demás vistas.
+"""
+
+from __future__ import annotations
+
+import operator
+from functools import reduce
+from typing import Iterable
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import connections
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+CONFIGURACION = "es_unaccent"
+COLUMNA = "busqueda"
+
+
+def _es_postgres(queryset) -> bool:
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def vector(model, using: str = "default") -> RawSQL:
+    """Referencia a la columna ``busqueda`` de ``model``."""
+    quote = connections[using].ops.quote_name
+    return RawSQL(
+        f"{quote(model._meta.db_table)}.{quote(COLUMNA)}",
+        [],
+        output_field=SearchVectorField(),
+    )
+
+
+def consulta_prefijo(termino: str) -> SearchQuery:
+    """``to_tsquery`` que acepta palabras que empiecen con ``termino``."""
+    literal = termino.replace("\\", "\\\\").replace("'", "''")
+    return SearchQuery(f"'{literal}':*", config=CONFIGURACION, search_type="raw")
+
+
+def buscar(queryset, terminos: Iterable[str], relacionados: Iterable[str] = ()):
+    """Filtra ``queryset`` por ``terminos`` y lo ordena por relevancia.
+
+    Cada término debe aparecer como prefijo en la columna ``busqueda`` o en
+    alguno de los lookups ``relacionados`` (``"filial__nombre__icontains"``).
+    """
+    relacionados = list(relacionados)
+    consultas = [(termino, consulta_prefijo(termino)) for termino in terminos]
+    condiciones = [
+        reduce(
+            operator.or_,
+            [Q(vector_busqueda=consulta)]
+            + [Q(**{lookup: termino}) for lookup in relacionados],
+        )
+        for termino, consulta in consultas
+    ]
+    columna = vector(queryset.model, queryset.db)
+    rango = SearchRank(columna, reduce(operator.and_, [c for _, c in consultas]))
+    return (
+        queryset.alias(vector_busqueda=columna)
+        .filter(*condiciones)
+        .alias(rango_busqueda=rango)
+        .order_by("-rango_busqueda", "-pk")
+    )
+
+
+class BusquedaTextoFilter(SearchFilter):
+    """``SearchFilter`` que usa la columna ``busqueda`` cuando está disponible."""
+
+    def usa_texto_completo(self, queryset, view) -> bool:
+        return getattr(view, "full_text_search", False) and _es_postgres(queryset)
+
+    def filter_queryset(self, request, queryset, view):
+        terminos = self.get_search_terms(request)
+        campos = [str(campo) for campo in self.get_search_fields(view, request) or ()]
+        if (
+            not terminos
+            or not self.usa_texto_completo(queryset, view)
+            # Las relaciones a muchos necesitan ``distinct``, incompatible con
+            # ordenar por rango: se buscan como siempre.
+            or self.must_call_distinct(queryset, campos)
+        ):
+            return super().filter_queryset(request, queryset, view)
+        relacionados = [
+            self.construct_search(campo) for campo in campos if LOOKUP_SEP in campo
+        ]
+        return buscar(queryset, terminos, relacionados)
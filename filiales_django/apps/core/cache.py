@@ -0,0 +1,234 @@
+"""Caché de dos niveles con invalidación por tags.
+
+Delante de la caché compartida (``CACHES["default"]``: locmem, archivo o un
+servidor compatible con Redis) hay un LRU en memoria del proceso, acotado en
+cantidad de entradas (``CACHE_LOCAL_MAX_ENTRADAS``) y en antigüedad
+(``CACHE_LOCAL_TTL``), que evita traer y deserializar el valor en lecturas
+repetidas.
+
+Cada entrada guarda la versión de sus tags al momento de calcularse. Invalidar
+un tag incrementa su versión en la caché compartida, por lo que todas las
+entradas que lo usan quedan obsoletas en todos los procesos sin tener que
+conocer sus claves. Para eso cada lectura de una entrada con tags, aun con
+acierto local, consulta las versiones vigentes en la caché compartida (un
+``get_many`` de enteros): solo las entradas sin tags se sirven sin ir a la
+red. Estas solo se borran del LRU del proceso que llama a ``borrar``; en los
+demás viven hasta ``CACHE_LOCAL_TTL``.
+
+Las claves pasan por ``make_key`` del backend, de modo que ``KEY_PREFIX`` y
+``VERSION`` (``CACHE_VERSION``) también aplican al nivel local. Los valores
+del nivel local se comparten entre llamadas: deben tratarse como de solo
+lectura.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+_AUSENTE = object()
+
+_metricas = {"local": 0, "compartida": 0, "misses": 0, "invalidaciones": 0}
+_metricas_lock = threading.Lock()
+
+
+def _registrar(metrica: str) -> None:
+    with _metricas_lock:
+        _metricas[metrica] += 1
+
+
+class LRULocal:
+    """Diccionario LRU con vencimiento, seguro entre threads."""
+
+    def __init__(self, max_entradas: int, ttl: float):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._datos: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def get(self, clave: str) -> Any:
+        with self._lock:
+            item = self._datos.get(clave)
+            if item is None:
+                return _AUSENTE
+            vence, valor = item
+            if vence <= time.monotonic():
+                del self._datos[clave]
+                return _AUSENTE
+            self._datos.move_to_end(clave)
+            return valor
+
+    def set(self, clave: str, valor: Any, ttl: float | None = None) -> None:
+        if self.max_entradas <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def delete(self, *claves: str) -> None:
+        with self._lock:
+            for clave in claves:
+                self._datos.pop(clave, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+
+_local: LRULocal | None = None
+
+
+def _nivel_local() -> LRULocal:
+    global _local
+    if _local is None:
+        _local = LRULocal(
+            getattr(settings, "CACHE_LOCAL_MAX_ENTRADAS", 1000),
+            getattr(settings, "CACHE_LOCAL_TTL", 5.0),
+        )
+    return _local
+
+
+def _compartida():
+    return caches["default"]
+
+
+def limpiar_local() -> None:
+    """Vacía el nivel local y vuelve a leer su configuración."""
+    global _local
+    _local = None
+
+
+def _clave_tag(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def _version_inicial() -> int:
+    # Si el tag se pierde por desalojo no puede volver a una versión ya usada.
+    return time.time_ns() // 1000
+
+
+def _versiones(tags: Iterable[str]) -> dict[str, int]:
+    tags = sorted(set(tags))
+    if not tags:
+        return {}
+    compartida = _compartida()
+    guardadas = compartida.get_many([_clave_tag(tag) for tag in tags])
+    versiones = {}
+    for tag in tags:
+        version = guardadas.get(_clave_tag(tag))
+        if version is None:
+            compartida.add(_clave_tag(tag), _version_inicial(), None)
+            version = compartida.get(_clave_tag(tag))
+        versiones[tag] = version
+    return versiones
+
+
+def _vigente(entrada: tuple[Any, dict[str, int]]) -> bool:
+    _, versiones = entrada
+    return not versiones or _versiones(versiones) == versiones
+
+
+def _ttl_local(timeout) -> float | None:
+    if timeout is DEFAULT_TIMEOUT:
+        timeout = _compartida().default_timeout
+    return None if timeout is None else float(timeout)
+
+
+def _leer(clave: str) -> Any:
+    local = _nivel_local()
+    clave_local = _compartida().make_key(clave)
+    entrada = local.get(clave_local)
+    nivel = "local"
+    if entrada is _AUSENTE:
+        entrada = _compartida().get(clave, _AUSENTE)
+        nivel = "compartida"
+    if entrada is _AUSENTE or not _vigente(entrada):
+        local.delete(clave_local)
+        _registrar("misses")
+        return _AUSENTE
+    if nivel == "compartida":
+        local.set(clave_local, entrada)
+    _registrar(nivel)
+    return entrada[0]
+
+
+def _escribir(clave: str, valor: Any, timeout, versiones: dict[str, int]) -> None:
+    entrada = (valor, versiones)
+    _compartida().set(clave, entrada, timeout)
+    _nivel_local().set(_compartida().make_key(clave), entrada, _ttl_local(timeout))
+
+
+def obtener(clave: str, default: Any = None) -> Any:
+    valor = _leer(clave)
+    return default if valor is _AUSENTE else valor
+
+
+def guardar(
+    clave: str, valor: Any, timeout=DEFAULT_TIMEOUT, tags: Iterable[str] = ()
+) -> None:
+    _escribir(clave, valor, timeout, _versiones(tags))
+
+
+def obtener_o_calcular(
+    clave: str,
+    calcular: Callable[[], Any],
+    timeout=DEFAULT_TIMEOUT,
+    tags: Iterable[str] = (),
+) -> Any:
+    """Devuelve el valor cacheado o lo calcula y lo guarda con ``tags``."""
+    valor = _leer(clave)
+    if valor is not _AUSENTE:
+        return valor
+    # Las versiones se leen antes de calcular: si un tag se invalida mientras
+    # tanto, la entrada nace obsoleta en lugar de guardar datos viejos.
+    versiones = _versiones(tags)
+    valor = calcular()
+    _escribir(clave, valor, timeout, versiones)
+    return valor
+
+
+def borrar(*claves: str) -> None:
+    _compartida().delete_many(list(claves))
+    _nivel_local().delete(*(_compartida().make_key(clave) for clave in claves))
+
+
+def invalidar_tags(*tags: str) -> None:
+    """Deja obsoletas, en todos los procesos, las entradas con alguno de ``tags``."""
+    compartida = _compartida()
+    for tag in set(tags):
+        try:
+            compartida.incr(_clave_tag(tag))
+        except ValueError:
+            compartida.add(_clave_tag(tag), _version_inicial(), None)
+    if tags:
+        _registrar("invalidaciones")
+
+
+def metricas() -> dict[str, float]:
+    with _metricas_lock:
+        valores: dict[str, float] = dict(_metricas)
+    lecturas = valores["local"] + valores["compartida"] + valores["misses"]
+    aciertos = valores["local"] + valores["compartida"]
+    valores["hit_ratio"] = round(aciertos / lecturas, 4) if lecturas else 0.0
+    valores["entradas_locales"] = len(_nivel_local())
+    return valores
+
+
+def reiniciar_metricas() -> None:
+    with _metricas_lock:
+        for metrica in _metricas:
+            _metricas[metrica] = 0
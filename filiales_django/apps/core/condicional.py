@@ -0,0 +1,109 @@
+"""GET condicional: ETag débil, ``Last-Modified`` y respuestas 304.
+
+La firma de un queryset sale de un único agregado (``MAX(updated_at)`` y
+``COUNT``) sobre el queryset ya filtrado y con el alcance del usuario, de modo
+que una respuesta sin cambios se resuelve sin traer filas ni serializar. Las
+altas y modificaciones mueven el máximo y las bajas el conteo. Los
+``queryset.update()`` deben actualizar ``updated_at`` para que se note el
+cambio.
+
+Las bajas no mueven ``MAX(updated_at)``, así que ``Last-Modified`` solo se
+emite con ``con_fecha=True``, donde ninguna baja puede pasar inadvertida (el
+detalle de un objeto sin relaciones serializadas). En el resto la validación
+es solo por ETag e ``If-Modified-Since`` se ignora.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Iterable
+
+from django.db.models import Count, Max, QuerySet
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+CAMPO_MODIFICACION = "updated_at"
+
+
+def _etag(*partes: Any) -> str:
+    contenido = json.dumps(partes, sort_keys=True, default=str, separators=(",", ":"))
+    return "W/" + quote_etag(hashlib.sha1(contenido.encode()).hexdigest())
+
+
+def _tiene_modificacion(model) -> bool:
+    return any(field.name == CAMPO_MODIFICACION for field in model._meta.get_fields())
+
+
+def firma(
+    queryset: QuerySet,
+    relaciones: Iterable[str] = (),
+    partes: Iterable[Any] = (),
+    con_fecha: bool = False,
+) -> tuple[str, datetime | None] | None:
+    """``(etag, last_modified)`` de ``queryset`` o ``None`` si no aplica.
+
+    ``relaciones`` son caminos a modelos relacionados que también se
+    serializan (por ejemplo ``"items"``): suman su conteo y su última
+    modificación. ``partes`` se agregan al hash (usuario, vista).
+    ``last_modified`` es ``None`` salvo con ``con_fecha``.
+    """
+    model = queryset.model
+    if not _tiene_modificacion(model):
+        return None
+    agregados = {
+        "total": Count("pk", distinct=True),
+        "modificado": Max(CAMPO_MODIFICACION),
+    }
+    for relacion in relaciones:
+        agregados[f"total_{relacion}"] = Count(relacion, distinct=True)
+        relacionado = model._meta.get_field(relacion).related_model
+        if _tiene_modificacion(relacionado):
+            agregados[f"modificado_{relacion}"] = Max(
+                f"{relacion}__{CAMPO_MODIFICACION}"
+            )
+    valores = queryset.order_by().aggregate(**agregados)
+    fechas = [
+        valor
+        for clave, valor in valores.items()
+        if clave.startswith("modificado") and valor is not None
+    ]
+    last_modified = max(fechas) if fechas and con_fecha else None
+    return _etag(sorted(valores.items()), *partes), last_modified
+
+
+def firma_de_datos(datos: Any, partes: Iterable[Any] = ()) -> tuple[str, None]:
+    """Firma de datos ya calculados (por ejemplo, contadores cacheados)."""
+    return _etag(datos, *partes), None
+
+
+def no_modificado(request, etag: str, last_modified: datetime | None):
+    """Respuesta 304 (o 412) si el cliente ya tiene la versión vigente."""
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def aplicar_cabeceras(response, etag: str, last_modified: datetime | None):
+    if response.status_code == 200:
+        response.headers["ETag"] = etag
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+        # Los clientes pueden guardar la respuesta pero deben revalidarla.
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def responder(request, firma_calculada, generar):
+    """Devuelve 304 si corresponde; si no, ``generar()`` con las cabeceras."""
+    if firma_calculada is None:
+        return generar()
+    etag, last_modified = firma_calculada
+    respuesta = no_modificado(request, etag, last_modified)
+    if respuesta is not None:
+        respuesta.headers["ETag"] = etag
+        return respuesta
+    return aplicar_cabeceras(generar(), etag, last_modified)
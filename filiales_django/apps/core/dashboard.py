@@ -0,0 +1,136 @@
+"""Contadores del dashboard calculados en una sola consulta y cacheados."""
+
+from __future__ import annotations
+
+import threading
+from typing import Iterable
+
+from apps.core import cache
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Func, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+CLAVE_RESUMEN = "dashboard:resumen:{alcance}"
+
+_metricas = {"hits": 0, "misses": 0, "invalidaciones": 0}
+_metricas_lock = threading.Lock()
+
+
+def _registrar(metrica: str, cantidad: int = 1) -> None:
+    with _metricas_lock:
+        _metricas[metrica] += cantidad
+
+
+def _clave(filial_id: int | None) -> str:
+    alcance = f"filial:{filial_id}" if filial_id else "global"
+    return CLAVE_RESUMEN.format(alcance=alcance)
+
+
+def _subconsulta_conteo(queryset: QuerySet) -> tuple[str, tuple]:
+    # COUNT como Func no agrega GROUP BY: devuelve una única fila escalar.
+    conteo = (
+        queryset.order_by()
+        .annotate(total=Func(F("pk"), function="COUNT"))
+        .values("total")
+    )
+    return conteo.query.sql_with_params()
+
+
+def _querysets(filial_id: int | None) -> dict[str, QuerySet]:
+    from apps.acciones.models import AccionSolidaria
+    from apps.entradas.models import SolicitudEntrada
+    from apps.filiales.models import Autoridad, Filial
+
+    filiales = Filial.objects.all()
+    autoridades = Autoridad.objects.filter(activo=True)
+    acciones = AccionSolidaria.objects.all()
+    solicitudes = SolicitudEntrada.objects.all()
+    if filial_id:
+        filiales = filiales.filter(id=filial_id)
+        autoridades = autoridades.filter(filial_id=filial_id)
+        acciones = acciones.filter(filial_id=filial_id)
+        solicitudes = solicitudes.filter(filial_id=filial_id)
+    return {
+        "total_filiales": filiales,
+        "filiales_activas": filiales.filter(activa=True),
+        "total_integrantes": autoridades,
+        "total_acciones": acciones,
+        "total_entradas": solicitudes,
+        "solicitudes_pendientes": solicitudes.filter(
+            estado=SolicitudEntrada.Estados.PENDIENTE
+        ),
+    }
+
+
+def calcular_resumen(filial_id: int | None = None) -> dict[str, int]:
+    """Calcula todos los contadores en un único round-trip a la base."""
+    querysets = _querysets(filial_id)
+    columnas = []
+    params: list = []
+    for alias, queryset in querysets.items():
+        sql, sql_params = _subconsulta_conteo(queryset)
+        columnas.append(f"({sql}) AS {connection.ops.quote_name(alias)}")
+        params.extend(sql_params)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {', '.join(columnas)}", params)
+        fila = cursor.fetchone()
+    return {alias: valor or 0 for alias, valor in zip(querysets, fila)}
+
+
+def obtener_resumen(filial_id: int | None = None) -> dict[str, int]:
+    calculado = False
+
+    def _calcular() -> dict[str, int]:
+        nonlocal calculado
+        calculado = True
+        return calcular_resumen(filial_id)
+
+    resumen = cache.obtener_o_calcular(
+        _clave(filial_id),
+        _calcular,
+        getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300),
+        tags=[_clave(filial_id)],
+    )
+    _registrar("misses" if calculado else "hits")
+    return resumen
+
+
+def invalidar_resumen(filial_ids: Iterable[int | None] = ()) -> None:
+    """Invalida el resumen global y el de las filiales indicadas."""
+    claves = {_clave(None)} | {
+        _clave(filial_id) for filial_id in filial_ids if filial_id
+    }
+    cache.invalidar_tags(*claves)
+    _registrar("invalidaciones")
+
+
+def metricas_cache() -> dict[str, float]:
+    with _metricas_lock:
+        metricas = dict(_metricas)
+    consultas = metricas["hits"] + metricas["misses"]
+    metricas["hit_ratio"] = round(metricas["hits"] / consultas, 4) if consultas else 0.0
+    return metricas
+
+
+def reiniciar_metricas() -> None:
+    with _metricas_lock:
+        for metrica in _metricas:
+            _metricas[metrica] = 0
+
+
+@receiver(post_save, sender="filiales.Filial")
+@receiver(post_delete, sender="filiales.Filial")
+def _invalidar_por_filial(sender, instance, **kwargs):
+    invalidar_resumen([instance.pk])
+
+
+@receiver(post_save, sender="filiales.Autoridad")
+@receiver(post_delete, sender="filiales.Autoridad")
+@receiver(post_save, sender="acciones.AccionSolidaria")
+@receiver(post_delete, sender="acciones.AccionSolidaria")
+@receiver(post_save, sender="entradas.SolicitudEntrada")
+@receiver(post_delete, sender="entradas.SolicitudEntrada")
+def _invalidar_por_registro(sender, instance, **kwargs):
+    invalidar_resumen([instance.filial_id])
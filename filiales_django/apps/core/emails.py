@@ -0,0 +1,189 @@
+"""Cola de notificaciones por email y su envío en lotes."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Iterable
+
+from apps.core import outbox
+from apps.core.models import CorreoSaliente
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_ENVIO = [
+    "estado",
+    "intentos",
+    "proximo_intento",
+    "ultimo_error",
+    "enviado_at",
+    "updated_at",
+]
+
+
+@dataclass
+class ResultadoEnvio:
+    correos: int = 0
+    enviados: int = 0
+    reintentos: int = 0
+    descartados: int = 0
+
+    @property
+    def procesados(self) -> int:
+        return self.enviados + self.reintentos + self.descartados
+
+
+def encolar_correos(
+    asunto: str,
+    mensaje: str,
+    destinatarios: Iterable[str],
+    *,
+    html_mensaje: str | None = None,
+) -> list[CorreoSaliente]:
+    ahora = timezone.now()
+    return CorreoSaliente.objects.bulk_create(
+        [
+            CorreoSaliente(
+                destinatario=destinatario,
+                asunto=asunto[:255],
+                mensaje=mensaje,
+                html_mensaje=html_mensaje or "",
+                proximo_intento=ahora,
+            )
+            for destinatario in dict.fromkeys(destinatarios)
+        ]
+    )
+
+
+def _agrupar(lote: list[CorreoSaliente], digest: bool) -> list[list[CorreoSaliente]]:
+    """Agrupa los correos de un lote que se enviarán como un único email.
+
+    Los duplicados exactos para un mismo destinatario siempre se fusionan; en
+    modo digest se fusionan todos los correos de cada destinatario.
+    """
+    grupos: dict[tuple, list[CorreoSaliente]] = {}
+    for correo in lote:
+        if digest:
+            clave = (correo.destinatario,)
+        else:
+            clave = (correo.destinatario, correo.asunto, correo.mensaje)
+        grupos.setdefault(clave, []).append(correo)
+    return list(grupos.values())
+
+
+def _construir_email(grupo: list[CorreoSaliente], connection) -> EmailMultiAlternatives:
+    primero = grupo[0]
+    distintos = list(dict.fromkeys((correo.asunto, correo.mensaje) for correo in grupo))
+    if len(distintos) == 1:
+        email = EmailMultiAlternatives(
+            primero.asunto,
+            primero.mensaje,
+            settings.DEFAULT_FROM_EMAIL,
+            [primero.destinatario],
+            connection=connection,
+        )
+        if primero.html_mensaje:
+            email.attach_alternative(primero.html_mensaje, "text/html")
+        return email
+    cuerpo = "\n\n".join(f"- {asunto}\n{mensaje}" for asunto, mensaje in distintos)
+    return EmailMultiAlternatives(
+        f"Resumen de notificaciones ({len(distintos)})",
+        cuerpo,
+        settings.DEFAULT_FROM_EMAIL,
+        [primero.destinatario],
+        connection=connection,
+    )
+
+
+def _registrar_fallo(
+    lote: list[CorreoSaliente], error: str, resultado: ResultadoEnvio
+) -> None:
+    ahora = timezone.now()
+    max_intentos = getattr(settings, "EMAIL_MAX_INTENTOS", 5)
+    for correo in lote:
+        correo.ultimo_error = error[:2000]
+        if correo.intentos >= max_intentos:
+            correo.estado = CorreoSaliente.Estados.DESCARTADO
+            correo.proximo_intento = ahora
+            resultado.descartados += 1
+        else:
+            correo.proximo_intento = ahora + outbox.calcular_backoff(
+                correo.intentos,
+                base=getattr(settings, "EMAIL_BACKOFF_BASE", 60),
+                maximo=getattr(settings, "EMAIL_BACKOFF_MAX", 3600),
+            )
+            resultado.reintentos += 1
+
+
+def reiniciar_conexion(connection) -> None:
+    """Descarta la conexión para que el próximo ``open()`` vuelva a conectar.
+
+    ``EmailBackend.open()`` de SMTP no hace nada mientras ``connection`` esté
+    asignada, aunque el servidor la haya cerrado.
+    """
+    try:
+        connection.close()
+    except Exception:  # pragma: no cover - la conexión ya estaba rota
+        pass
+    if hasattr(connection, "connection"):
+        connection.connection = None
+
+
+def _registrar_envio(grupo: list[CorreoSaliente], ahora) -> None:
+    for correo in grupo:
+        correo.estado = CorreoSaliente.Estados.ENVIADO
+        correo.enviado_at = ahora
+        correo.ultimo_error = ""
+
+
+def enviar_pendientes(
+    *,
+    batch_size: int | None = None,
+    connection=None,
+    digest: bool | None = None,
+) -> ResultadoEnvio:
+    """Envía un lote de la cola reutilizando una única conexión SMTP.
+
+    Cada email se envía y registra por separado: si uno falla, solo sus
+    correos vuelven a la cola y se abre una única conexión nueva que
+    comparten los siguientes. Sin una conexión abierta, ``send_messages``
+    abriría y cerraría una por email.
+    """
+    batch_size = batch_size or getattr(settings, "EMAIL_BATCH_SIZE", 200)
+    if digest is None:
+        digest = getattr(settings, "EMAIL_DIGEST", True)
+    resultado = ResultadoEnvio()
+    lote = outbox.reclamar_lote(CorreoSaliente, batch_size, reserva_por_item=1)
+    if not lote:
+        return resultado
+    conexion_propia = connection is None
+    connection = connection or get_connection()
+    ahora = timezone.now()
+    for correo in lote:
+        correo.intentos += 1
+        correo.updated_at = ahora
+    abrir = conexion_propia
+    try:
+        for grupo in _agrupar(lote, digest):
+            try:
+                if abrir:
+                    connection.open()
+                    abrir = False
+                connection.send_messages([_construir_email(grupo, connection)])
+            except Exception as exc:
+                logger.exception("Error sending queued email: %s", exc)
+                _registrar_fallo(grupo, str(exc), resultado)
+                reiniciar_conexion(connection)
+                abrir = True
+            else:
+                _registrar_envio(grupo, ahora)
+                resultado.enviados += len(grupo)
+                resultado.correos += 1
+    finally:
+        if conexion_propia:
+            connection.close()
+        CorreoSaliente.objects.bulk_update(lote, CAMPOS_ENVIO)
+    return resultado
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from bench.generador import USUARIO_ADMIN
+from bench.runner import RUTAS_EXTRA, Caso, casos_router, comparar, guardar, medir
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Mide latencia, consultas y bytes de todos los endpoints GET de la API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--usuario", default=USUARIO_ADMIN)
+        parser.add_argument("--iteraciones", type=int, default=20)
+        parser.add_argument("--calentamiento", type=int, default=2)
+        parser.add_argument(
+            "--filtro", help="Solo mide los casos cuyo nombre contiene este texto."
+        )
+        parser.add_argument("--salida", default="bench/resultados/ultimo.json")
+        parser.add_argument(
+            "--comparar", help="Informe JSON previo contra el que comparar la corrida."
+        )
+        parser.add_argument("--umbral", type=float, default=0.10)
+
+    def handle(self, *args, **options):
+        from config.urls import router
+
+        usuario = get_user_model().objects.filter(username=options["usuario"]).first()
+        if usuario is None:
+            raise CommandError(
+                f"No existe el usuario {options['usuario']}; ejecute bench_datos primero."
+            )
+        casos = casos_router(router.registry)
+        casos += [Caso(nombre, url) for nombre, url in RUTAS_EXTRA]
+        if options["filtro"]:
+            casos = [caso for caso in casos if options["filtro"] in caso.nombre]
+
+        def aviso(resultado) -> None:
+            self.stdout.write(
+                f"{resultado.nombre:<45} {resultado.status} "
+                f"p50={resultado.p50_ms:.1f}ms p95={resultado.p95_ms:.1f}ms "
+                f"p99={resultado.p99_ms:.1f}ms q={resultado.consultas} "
+                f"{resultado.bytes}B"
+            )
+
+        resultados = medir(
+            casos,
+            usuario,
+            iteraciones=options["iteraciones"],
+            calentamiento=options["calentamiento"],
+            aviso=aviso,
+        )
+        informe = guardar(
+            resultados,
+            Path(options["salida"]),
+            iteraciones=options["iteraciones"],
+            usuario=usuario.username,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Resultados en {options['salida']}"))
+        if not options["comparar"]:
+            return
+        base = json.loads(Path(options["comparar"]).read_text())
+        regresiones = 0
+        for fila in comparar(base, informe, umbral=options["umbral"]):
+            marca = "REGRESION" if fila["regresion"] else ""
+            regresiones += bool(fila["regresion"])
+            self.stdout.write(
+                f"{fila['nombre']:<45} {fila['antes']:.1f} -> {fila['despues']:.1f}ms "
+                f"({fila['variacion']:+.1%}) q {fila['consultas_antes']} -> "
+                f"{fila['consultas_despues']} {marca}"
+            )
+        if regresiones:
+            raise CommandError(f"{regresiones} casos con regresión")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+
+from bench.generador import ESCALAS, Generador
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos a escala para los benchmarks (usar una base dedicada)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--escala", choices=sorted(ESCALAS), default="chica")
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--semilla", type=int, default=1234)
+        parser.add_argument(
+            "--filiales", type=int, help="Reemplaza el valor de la escala."
+        )
+        parser.add_argument(
+            "--mensajes", type=int, help="Reemplaza el valor de la escala."
+        )
+        parser.add_argument(
+            "--auditoria", type=int, help="Reemplaza el valor de la escala."
+        )
+
+    def handle(self, *args, **options):
+        escala = ESCALAS[options["escala"]]
+        ajustes = {
+            campo: options[campo]
+            for campo in ("filiales", "mensajes", "auditoria")
+            if options[campo] is not None
+        }
+        escala = replace(escala, **ajustes)
+        inicio = time.monotonic()
+
+        def progreso(modelo: str, insertados: int, total: int) -> None:
+            if insertados == total or insertados % (options["batch_size"] * 20) == 0:
+                self.stdout.write(f"{modelo}: {insertados}/{total}")
+
+        generador = Generador(
+            escala,
+            batch_size=options["batch_size"],
+            semilla=options["semilla"],
+            progreso=progreso,
+        )
+        try:
+            generador.generar()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Datos de benchmark generados en {time.monotonic() - inicio:.1f}s"
+            )
+        )
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+
+from apps.core.emails import enviar_pendientes, reiniciar_conexion
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Envía las notificaciones por email encoladas"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=10.0,
+            help="Segundos de espera entre lotes; funciona como ventana del digest.",
+        )
+        parser.add_argument(
+            "--sin-digest",
+            action="store_true",
+            help="Envía un email por notificación en lugar de un resumen.",
+        )
+        parser.add_argument(
+            "--una-vez",
+            action="store_true",
+            help="Vacía la cola una vez y termina.",
+        )
+
+    def handle(self, *args, **options):
+        digest = False if options["sin_digest"] else None
+        connection = get_connection()
+        total = 0
+        try:
+            while True:
+                try:
+                    connection.open()
+                except Exception as exc:
+                    # Servidor caído: se reintenta en el próximo ciclo.
+                    self.stderr.write(f"No se pudo conectar al servidor SMTP: {exc}")
+                    reiniciar_conexion(connection)
+                    if options["una_vez"]:
+                        break
+                    time.sleep(options["intervalo"])
+                    continue
+                resultado = enviar_pendientes(
+                    batch_size=options["batch_size"],
+                    connection=connection,
+                    digest=digest,
+                )
+                total += resultado.procesados
+                if resultado.procesados:
+                    self.stdout.write(
+                        f"Notificaciones: {resultado.enviados} en "
+                        f"{resultado.correos} emails - "
+                        f"reintentos: {resultado.reintentos} - "
+                        f"descartadas: {resultado.descartados}"
+                    )
+                    continue
+                if options["una_vez"]:
+                    break
+                time.sleep(options["intervalo"])
+        except KeyboardInterrupt:  # pragma: no cover - interrupción manual
+            pass
+        finally:
+            connection.close()
+        self.stdout.write(self.style.SUCCESS(f"Notificaciones procesadas: {total}"))
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+
+from apps.core.webhooks import crear_sesion, entregar_pendientes
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Entrega los webhooks pendientes del outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=2.0,
+            help="Segundos de espera cuando no hay webhooks pendientes.",
+        )
+        parser.add_argument(
+            "--una-vez",
+            action="store_true",
+            help="Vacía la cola una vez y termina.",
+        )
+
+    def handle(self, *args, **options):
+        session = crear_sesion()
+        total = 0
+        try:
+            while True:
+                resultado = entregar_pendientes(
+                    batch_size=options["batch_size"], session=session
+                )
+                total += resultado.procesados
+                if resultado.procesados:
+                    self.stdout.write(
+                        f"Enviados: {resultado.enviados} - "
+                        f"reintentos: {resultado.reintentos} - "
+                        f"descartados: {resultado.descartados}"
+                    )
+                    continue
+                if options["una_vez"]:
+                    break
+                time.sleep(options["intervalo"])
+        except KeyboardInterrupt:  # pragma: no cover - interrupción manual
+            pass
+        finally:
+            session.close()
+        self.stdout.write(self.style.SUCCESS(f"Webhooks procesados: {total}"))
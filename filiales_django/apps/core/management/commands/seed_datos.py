@@ -1,28 +1,84 @@
 from __future__ import annotations
 
 import random
+import time
 from datetime import datetime, timedelta
 
+from apps.core import respuestas
+from apps.core.bulk import insertar
+from apps.core.dashboard import invalidar_resumen
 from apps.entradas.models import AsignacionEntrada, SolicitudEntrada
+from apps.filiales import estadisticas
 from apps.filiales.models import Autoridad, Filial
+from apps.mensajes import resumen
 from apps.mensajes.models import Conversacion, Mensaje
 from apps.partidos.models import Partido
 from apps.pedidos.models import Pedido, PedidoItem, Producto
 from apps.usuarios.models import PerfilUsuario
 from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
 from faker import Faker
 
 User = get_user_model()
 
 
+ESCALA_BASE = {
+    "filiales": 156,
+    "autoridades": 5,
+    "usuarios": 2,
+    "partidos": 40,
+    "solicitudes": 5_000,
+    "pedidos": 3_000,
+    "conversaciones": 500,
+    "mensajes": 20_000,
+}
+CUPO_PARTIDO = 5_000
+ITEMS_POR_PEDIDO = 3
+
+
 class Command(BaseCommand):
     help = "Crea datos de prueba para el sistema de filiales"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Genera los datos en memoria y los inserta por lotes (requiere base vacía).",
+        )
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiplicador de las cantidades base del modo --bulk.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        for nombre in (
+            "filiales",
+            "partidos",
+            "solicitudes",
+            "pedidos",
+            "conversaciones",
+            "mensajes",
+        ):
+            parser.add_argument(
+                f"--{nombre}", type=int, help=f"Cantidad de {nombre} (modo --bulk)."
+            )
+        parser.add_argument(
+            "--autoridades", type=int, help="Autoridades por filial (modo --bulk)."
+        )
+        parser.add_argument(
+            "--usuarios", type=int, help="Usuarios por filial (modo --bulk)."
+        )
+
     def handle(self, *args, **options):
         fake = Faker("es_AR")
         Faker.seed(1234)
         random.seed(1234)
+        if options["bulk"]:
+            self._sembrar_masivo(fake, options)
+            return
         filiales = self._crear_filiales(fake)
         self.stdout.write(
             self.style.SUCCESS(f"Filiales disponibles: {Filial.objects.count()}")
@@ -312,3 +368,305 @@ class Command(BaseCommand):
                     emisor=usuario,
                     texto=fake.paragraph(),
                 )
+
+    # --- Modo --bulk -----------------------------------------------------------
+
+    def _cantidades(self, options) -> dict[str, int]:
+        cantidades = {}
+        for nombre, base in ESCALA_BASE.items():
+            valor = options.get(nombre)
+            if valor is None:
+                # Las cantidades por filial no escalan: escalan las filiales.
+                por_filial = nombre in ("autoridades", "usuarios")
+                valor = base if por_filial else max(1, round(base * options["scale"]))
+            cantidades[nombre] = valor
+        return cantidades
+
+    def _progreso(self, modelo: str, insertados: int, total: int | None) -> None:
+        paso = max(self._batch_size, (total or 0) // 10)
+        if insertados == total or insertados % paso < self._batch_size:
+            porcentaje = f" ({insertados * 100 // total}%)" if total else ""
+            segundos = time.monotonic() - self._inicio
+            self.stdout.write(
+                f"  {modelo}: {insertados}/{total}{porcentaje} - {segundos:.1f}s"
+            )
+
+    def _insertar(self, model, filas, total: int, *, con_ids: bool = False):
+        return insertar(
+            model,
+            filas,
+            batch_size=self._batch_size,
+            total=total,
+            con_ids=con_ids,
+            progreso=self._progreso,
+        )
+
+    def _sembrar_masivo(self, fake: Faker, options) -> None:
+        if Filial.objects.exists():
+            raise CommandError("El modo --bulk requiere una base sin filiales.")
+        cantidades = self._cantidades(options)
+        self._batch_size = options["batch_size"]
+        self._inicio = time.monotonic()
+        self.stdout.write(
+            "Generando: " + ", ".join(f"{k}={v}" for k, v in cantidades.items())
+        )
+        # Faker es lento: se pre-generan textos y se reutilizan.
+        frases = [fake.sentence() for _ in range(500)]
+        calles = [fake.street_address() for _ in range(500)]
+        telefonos = [fake.phone_number() for _ in range(200)]
+        nombres = [fake.name() for _ in range(1_000)]
+        hoy = datetime.now().date()
+        ahora = timezone.now()
+
+        catalogo_ciudades = [
+            ("La Plata", "Buenos Aires"),
+            ("Ensenada", "Buenos Aires"),
+            ("Berisso", "Buenos Aires"),
+            ("CABA", "Ciudad Autónoma de Buenos Aires"),
+            ("Mar del Plata", "Buenos Aires"),
+            ("Rosario", "Santa Fe"),
+            ("Córdoba", "Córdoba"),
+            ("Mendoza", "Mendoza"),
+            ("Neuquén", "Neuquén"),
+            ("Bahía Blanca", "Buenos Aires"),
+        ]
+        total_filiales = cantidades["filiales"]
+
+        def _filiales():
+            for idx in range(1, total_filiales + 1):
+                ciudad, provincia = catalogo_ciudades[
+                    (idx - 1) % len(catalogo_ciudades)
+                ]
+                yield Filial(
+                    nombre=f"Filial {ciudad} {idx:05d}",
+                    codigo=f"FIL-{idx:05d}",
+                    ciudad=ciudad,
+                    provincia=provincia,
+                    pais="Argentina",
+                    direccion=random.choice(calles),
+                    contacto_email=f"filial{idx:05d}@edlp.com",
+                    contacto_telefono=random.choice(telefonos),
+                )
+
+        filiales = self._insertar(Filial, _filiales(), total_filiales, con_ids=True)
+
+        por_filial = cantidades["autoridades"]
+        cargos = list(Autoridad.Cargos.values)
+        self._insertar(
+            Autoridad,
+            (
+                Autoridad(
+                    filial_id=filial_id,
+                    cargo=cargos[indice % len(cargos)],
+                    persona_nombre=random.choice(nombres),
+                    persona_documento=str(random.randint(20_000_000, 45_000_000)),
+                    telefono=random.choice(telefonos),
+                    desde=hoy - timedelta(days=random.randint(30, 1_500)),
+                    activo=indice < 3,
+                    es_socio=random.random() < 0.4,
+                )
+                for filial_id in filiales
+                for indice in range(por_filial)
+            ),
+            len(filiales) * por_filial,
+        )
+
+        password = make_password("pass1234")
+        cuentas = [
+            ("admin_global", PerfilUsuario.Roles.ADMINISTRADOR, None),
+            ("coordinador_global", PerfilUsuario.Roles.COORDINADOR, None),
+            *(
+                (
+                    f"user_{filial_id}_{indice}",
+                    PerfilUsuario.Roles.USUARIO_FILIAL,
+                    filial_id,
+                )
+                for filial_id in filiales
+                for indice in range(cantidades["usuarios"])
+            ),
+        ]
+        user_ids = self._insertar(
+            User,
+            (
+                User(
+                    username=username,
+                    email=f"{username}@edlp.com",
+                    password=password,
+                    first_name=username.split("_")[0].capitalize(),
+                    last_name="EDLP",
+                )
+                for username, _, _ in cuentas
+            ),
+            len(cuentas),
+            con_ids=True,
+        )
+        self._insertar(
+            PerfilUsuario,
+            (
+                PerfilUsuario(
+                    user_id=user_id,
+                    rol=rol,
+                    filial_id=filial_id,
+                    es_socio=random.random() < 0.4,
+                )
+                for user_id, (_, rol, filial_id) in zip(user_ids, cuentas)
+            ),
+            len(cuentas),
+        )
+        admin_id = user_ids[0]
+        autores = [
+            (user_id, filial_id)
+            for user_id, (_, _, filial_id) in zip(user_ids, cuentas)
+            if filial_id
+        ]
+
+        productos = [producto.id for producto in self._crear_productos()]
+        total_partidos = cantidades["partidos"]
+        partidos = self._insertar(
+            Partido,
+            (
+                Partido(
+                    titulo=f"Estudiantes vs Rival {numero:04d}",
+                    fecha=ahora + timedelta(days=numero - total_partidos // 2),
+                    lugar=random.choice(["Estadio UNO", "Estadio Libertadores"]),
+                    descripcion=random.choice(frases),
+                    cupo_total=CUPO_PARTIDO,
+                    cupo_disponible=CUPO_PARTIDO,
+                )
+                for numero in range(total_partidos)
+            ),
+            total_partidos,
+            con_ids=True,
+        )
+
+        # Las solicitudes se insertan con ids para poder asignar entradas a las
+        # aprobadas; el cupo se descuenta en memoria para no sobrepasarlo.
+        total_solicitudes = cantidades["solicitudes"]
+        disponible = dict.fromkeys(partidos, CUPO_PARTIDO)
+        asignadas: list[int] = []
+        pendiente = SolicitudEntrada.Estados.PENDIENTE
+
+        def _solicitudes():
+            for _ in range(total_solicitudes):
+                user_id, filial_id = random.choice(autores)
+                partido_id = random.choice(partidos)
+                cantidad = random.randint(10, 80)
+                estado = random.choice(SolicitudEntrada.Estados.values)
+                asignada = 0
+                if estado in (
+                    SolicitudEntrada.Estados.APROBADA,
+                    SolicitudEntrada.Estados.PARCIAL,
+                ):
+                    if estado == SolicitudEntrada.Estados.PARCIAL:
+                        asignada = random.randint(1, cantidad - 1)
+                    else:
+                        asignada = cantidad
+                    if asignada > disponible[partido_id]:
+                        estado, asignada = pendiente, 0
+                    disponible[partido_id] -= asignada
+                asignadas.append(asignada)
+                yield SolicitudEntrada(
+                    filial_id=filial_id,
+                    partido_id=partido_id,
+                    cantidad_solicitada=cantidad,
+                    motivo=random.choice(frases),
+                    estado=estado,
+                    total_asignado=asignada,
+                    created_by_id=user_id,
+                )
+
+        solicitudes = self._insertar(
+            SolicitudEntrada, _solicitudes(), total_solicitudes, con_ids=True
+        )
+        con_asignacion = [
+            (solicitud_id, cantidad)
+            for solicitud_id, cantidad in zip(solicitudes, asignadas)
+            if cantidad
+        ]
+        self._insertar(
+            AsignacionEntrada,
+            (
+                AsignacionEntrada(
+                    solicitud_id=solicitud_id,
+                    cantidad_asignada=cantidad,
+                    asignado_por_id=admin_id,
+                )
+                for solicitud_id, cantidad in con_asignacion
+            ),
+            len(con_asignacion),
+        )
+        for partido_id, cupo in disponible.items():
+            Partido.objects.filter(pk=partido_id).update(cupo_disponible=cupo)
+
+        total_pedidos = cantidades["pedidos"]
+
+        def _pedidos():
+            for _ in range(total_pedidos):
+                user_id, filial_id = random.choice(autores)
+                yield Pedido(
+                    filial_id=filial_id,
+                    estado=random.choice(Pedido.Estados.values),
+                    observaciones=random.choice(frases),
+                    created_by_id=user_id,
+                )
+
+        pedidos = self._insertar(Pedido, _pedidos(), total_pedidos, con_ids=True)
+        self._insertar(
+            PedidoItem,
+            (
+                PedidoItem(
+                    pedido_id=pedido_id,
+                    producto_id=producto_id,
+                    cantidad=random.randint(1, 10),
+                    detalle=random.choice(frases),
+                )
+                for pedido_id in pedidos
+                for producto_id in random.sample(productos, ITEMS_POR_PEDIDO)
+            ),
+            len(pedidos) * ITEMS_POR_PEDIDO,
+        )
+
+        total_conversaciones = cantidades["conversaciones"]
+
+        def _conversaciones():
+            for numero in range(total_conversaciones):
+                user_id, filial_id = random.choice(autores)
+                es_global = numero % 10 == 0
+                yield Conversacion(
+                    asunto=random.choice(frases)[:255],
+                    creada_por_id=admin_id if es_global else user_id,
+                    visibilidad=(
+                        Conversacion.Visibilidad.GLOBAL
+                        if es_global
+                        else Conversacion.Visibilidad.FILIAL
+                    ),
+                    filial_id=None if es_global else filial_id,
+                )
+
+        conversaciones = self._insertar(
+            Conversacion, _conversaciones(), total_conversaciones, con_ids=True
+        )
+        total_mensajes = cantidades["mensajes"]
+        emisores = [user_id for user_id, _ in autores]
+        self._insertar(
+            Mensaje,
+            (
+                Mensaje(
+                    conversacion_id=random.choice(conversaciones),
+                    emisor_id=random.choice(emisores),
+                    texto=random.choice(frases),
+                )
+                for _ in range(total_mensajes)
+            ),
+            total_mensajes,
+        )
+
+        # bulk_create y COPY no disparan señales: se recalculan los derivados.
+        estadisticas.recalcular()
+        resumen.recalcular()
+        invalidar_resumen()
+        respuestas.invalidar(Filial._meta.label, Partido._meta.label)
+        segundos = time.monotonic() - self._inicio
+        self.stdout.write(
+            self.style.SUCCESS(f"Carga masiva completada en {segundos:.1f}s.")
+        )
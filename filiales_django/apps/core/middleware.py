@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+import random
+
+from apps.core.audit import audit_buffer
+from apps.core.queries import PresupuestoConsultasExcedido, registrar_consultas
+from django.conf import settings
+
+logger = logging.getLogger("apps.core.queries")
+
+
+class AuditBufferMiddleware:
+    """Agrupa la auditoría de cada request en un único INSERT.
+
+    Solo se escriben las acciones cuya transacción confirmó: lo registrado en
+    un bloque atómico que se revierte, o en un request que falla con
+    ``ATOMIC_REQUESTS``, se descarta.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit_buffer():
+            return self.get_response(request)
+
+
+class QueryBudgetMiddleware:
+    """Controla la cantidad de consultas SQL de cada request.
+
+    Las vistas declaran ``query_budget`` (un entero o un dict por acción del
+    viewset). En producción se muestrea con ``QUERY_BUDGET_SAMPLE_RATE`` y los
+    excesos solo se registran; con ``QUERY_BUDGET_STRICT`` se controlan todos
+    los requests y los excesos lanzan ``PresupuestoConsultasExcedido``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        estricto = getattr(settings, "QUERY_BUDGET_STRICT", False)
+        muestreo = getattr(settings, "QUERY_BUDGET_SAMPLE_RATE", 0.0)
+        if not estricto and (muestreo <= 0 or random.random() >= muestreo):
+            return self.get_response(request)
+        with registrar_consultas() as registro:
+            response = self.get_response(request)
+        problemas = registro.problemas(
+            getattr(request, "_query_budget", None),
+            getattr(settings, "QUERY_BUDGET_REPETICIONES", 5),
+        )
+        if problemas:
+            mensaje = (
+                f"{request.method} {request.path} "
+                f"({getattr(request, '_query_budget_vista', '?')}): "
+                + "; ".join(problemas)
+            )
+            if estricto:
+                raise PresupuestoConsultasExcedido(mensaje)
+            logger.warning("Query budget exceeded: %s", mensaje)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        vista = getattr(view_func, "cls", None)
+        presupuesto = getattr(vista, "query_budget", None)
+        accion = (getattr(view_func, "actions", None) or {}).get(request.method.lower())
+        if isinstance(presupuesto, dict):
+            presupuesto = presupuesto.get(accion)
+        request._query_budget = presupuesto
+        if vista is not None:
+            request._query_budget_vista = f"{vista.__name__}.{accion or request.method}"
+        return None
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookSaliente",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("evento", models.CharField(max_length=50)),
+                ("url", models.URLField(max_length=500)),
+                ("payload", models.JSONField(blank=True, default=dict)),
+                (
+                    "estado",
+                    models.CharField(
+                        choices=[
+                            ("PENDIENTE", "Pendiente"),
+                            ("ENVIADO", "Enviado"),
+                            ("DESCARTADO", "Descartado"),
+                        ],
+                        default="PENDIENTE",
+                        max_length=20,
+                    ),
+                ),
+                ("intentos", models.PositiveIntegerField(default=0)),
+                ("proximo_intento", models.DateTimeField()),
+                ("ultimo_error", models.TextField(blank=True)),
+                ("enviado_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ("proximo_intento", "id"),
+                "indexes": [
+                    models.Index(
+                        fields=["estado", "proximo_intento"],
+                        name="webhook_estado_prox_idx",
+                    )
+                ],
+            },
+        ),
+    ]
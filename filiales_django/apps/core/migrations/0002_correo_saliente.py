@@ -0,0 +1,62 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CorreoSaliente",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "estado",
+                    models.CharField(
+                        choices=[
+                            ("PENDIENTE", "Pendiente"),
+                            ("ENVIADO", "Enviado"),
+                            ("DESCARTADO", "Descartado"),
+                        ],
+                        default="PENDIENTE",
+                        max_length=20,
+                    ),
+                ),
+                ("intentos", models.PositiveIntegerField(default=0)),
+                ("proximo_intento", models.DateTimeField()),
+                ("ultimo_error", models.TextField(blank=True)),
+                ("enviado_at", models.DateTimeField(blank=True, null=True)),
+                ("destinatario", models.EmailField(max_length=254)),
+                ("asunto", models.CharField(max_length=255)),
+                ("mensaje", models.TextField()),
+                ("html_mensaje", models.TextField(blank=True)),
+            ],
+            options={
+                "ordering": ("proximo_intento", "id"),
+                "abstract": False,
+                "indexes": [
+                    models.Index(
+                        fields=["estado", "proximo_intento"],
+                        name="correo_estado_prox_idx",
+                    ),
+                    models.Index(
+                        fields=["destinatario"], name="correo_destinatario_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
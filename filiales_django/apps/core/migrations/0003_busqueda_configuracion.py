@@ -0,0 +1,38 @@
+from django.db import migrations
+
+CREAR = """
+CREATE EXTENSION IF NOT EXISTS unaccent;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = pg_catalog.spanish);
+        ALTER TEXT SEARCH CONFIGURATION es_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    END IF;
+END
+$$;
+"""
+
+BORRAR = "DROP TEXT SEARCH CONFIGURATION IF EXISTS es_unaccent;"
+
+
+def crear_configuracion(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREAR)
+
+
+def borrar_configuracion(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(BORRAR)
+
+
+class Migration(migrations.Migration):
+    """Configuración de texto completo en español sin acentos (solo PostgreSQL)."""
+
+    dependencies = [
+        ("core", "0002_correo_saliente"),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_configuracion, borrar_configuracion),
+    ]
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from typing import Any
 
+from apps.core import trigramas
 from django.db.models import QuerySet
+from rest_framework import decorators, response
 
 
 class FilialScopedQuerysetMixin:
@@ -35,3 +37,35 @@ class FilialScopedQuerysetMixin:
         if profile and profile.es_usuario_filial:
             kwargs[self.scope_field] = profile.filial
         return kwargs
+
+
+class BusquedaDifusaMixin:
+    """Agrega ``GET buscar/?q=&limite=``: typeahead tolerante a errores de tipeo."""
+
+    fuzzy_search_fields: tuple[str, ...] = ()
+    fuzzy_search_limit = 10
+    fuzzy_search_max_limit = 50
+
+    def get_fuzzy_search_limit(self) -> int:
+        try:
+            limite = int(self.request.query_params["limite"])  # type: ignore[attr-defined]
+        except (KeyError, ValueError):
+            return self.fuzzy_search_limit
+        return max(1, min(limite, self.fuzzy_search_max_limit))
+
+    @decorators.action(detail=False, methods=["get"], url_path="buscar")
+    def buscar(self, request):
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+        objetos = trigramas.buscar(
+            queryset,
+            self.fuzzy_search_fields,
+            request.query_params.get("q", ""),
+            self.get_fuzzy_search_limit(),
+        )
+        datos = self.get_serializer(objetos, many=True).data  # type: ignore[attr-defined]
+        return response.Response(
+            [
+                {**fila, "similitud": round(objeto.similitud, 4)}
+                for fila, objeto in zip(datos, objetos)
+            ]
+        )
@@ -8,3 +8,62 @@ class TimeStampedModel(models.Model):
     class Meta:
         abstract = True
         ordering = ("-created_at",)
+
+
+class EnvioPendiente(TimeStampedModel):
+    """Base de los outbox de entregas asíncronas con reintentos."""
+
+    class Estados(models.TextChoices):
+        PENDIENTE = "PENDIENTE", "Pendiente"
+        ENVIADO = "ENVIADO", "Enviado"
+        DESCARTADO = "DESCARTADO", "Descartado"
+
+    estado = models.CharField(
+        max_length=20, choices=Estados.choices, default=Estados.PENDIENTE
+    )
+    intentos = models.PositiveIntegerField(default=0)
+    proximo_intento = models.DateTimeField()
+    ultimo_error = models.TextField(blank=True)
+    enviado_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+        ordering = ("proximo_intento", "id")
+
+
+class WebhookSaliente(EnvioPendiente):
+    """Outbox transaccional de webhooks pendientes de entrega."""
+
+    evento = models.CharField(max_length=50)
+    url = models.URLField(max_length=500)
+    payload = models.JSONField(default=dict, blank=True)
+
+    class Meta(EnvioPendiente.Meta):
+        indexes = [
+            models.Index(
+                fields=("estado", "proximo_intento"), name="webhook_estado_prox_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.evento} -> {self.url} ({self.estado})"
+
+
+class CorreoSaliente(EnvioPendiente):
+    """Cola de notificaciones por email, una fila por destinatario."""
+
+    destinatario = models.EmailField()
+    asunto = models.CharField(max_length=255)
+    mensaje = models.TextField()
+    html_mensaje = models.TextField(blank=True)
+
+    class Meta(EnvioPendiente.Meta):
+        indexes = [
+            models.Index(
+                fields=("estado", "proximo_intento"), name="correo_estado_prox_idx"
+            ),
+            models.Index(fields=("destinatario",), name="correo_destinatario_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.asunto} -> {self.destinatario} ({self.estado})"
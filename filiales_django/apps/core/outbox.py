@@ -0,0 +1,39 @@
+"""Utilidades compartidas por las colas de envío (webhooks y correos)."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TypeVar
+
+from apps.core.models import EnvioPendiente
+from django.db import transaction
+from django.utils import timezone
+
+T = TypeVar("T", bound=EnvioPendiente)
+
+
+def reclamar_lote(
+    model: type[T], batch_size: int, *, reserva_por_item: float
+) -> list[T]:
+    """Toma un lote de pendientes vencidos y lo reserva para este worker.
+
+    La reserva posterga ``proximo_intento`` para que otro worker no tome las
+    mismas filas; si el proceso muere, vuelven a quedar disponibles al vencer.
+    """
+    ahora = timezone.now()
+    with transaction.atomic():
+        lote = list(
+            model.objects.select_for_update(skip_locked=True)
+            .filter(estado=model.Estados.PENDIENTE, proximo_intento__lte=ahora)
+            .order_by("proximo_intento", "id")[:batch_size]
+        )
+        if lote:
+            reserva = ahora + timedelta(seconds=reserva_por_item * len(lote) + 30)
+            model.objects.filter(pk__in=[item.pk for item in lote]).update(
+                proximo_intento=reserva
+            )
+    return lote
+
+
+def calcular_backoff(intentos: int, *, base: int, maximo: int) -> timedelta:
+    return timedelta(seconds=min(maximo, base * 2 ** max(intentos - 1, 0)))
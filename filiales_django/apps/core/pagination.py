@@ -1,13 +1,278 @@
-from rest_framework.pagination import PageNumberPagination
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import BooleanField, F, Func, Q, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def estimar_conteo(queryset) -> int:
+    """Filas estimadas por el planificador de PostgreSQL, sin recorrer la tabla.
+
+    En otros motores se hace el ``COUNT(*)`` exacto.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class PaginadorSinConteo(Paginator):
+    """Paginador que no ejecuta ``COUNT(*)``.
+
+    Trae un registro extra para saber si existe la página siguiente; ``count``
+    queda en ``None`` (o con la estimación del planificador si ``estimar``).
+    """
+
+    estimar = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._paginas = 1
+
+    @property
+    def count(self):  # type: ignore[override]
+        if not self.estimar:
+            return None
+        if not hasattr(self, "_estimado"):
+            self._estimado = estimar_conteo(self.object_list)
+        return self._estimado
+
+    @property
+    def num_pages(self):  # type: ignore[override]
+        return self._paginas
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("La página no es un número entero.")
+        if number < 1:
+            raise EmptyPage("La página es menor que 1.")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        inicio = (number - 1) * self.per_page
+        filas = list(self.object_list[inicio : inicio + self.per_page + 1])
+        if not filas and number > 1:
+            raise EmptyPage("La página no contiene resultados.")
+        self._paginas = number + 1 if len(filas) > self.per_page else number
+        return Page(filas[: self.per_page], number, self)
+
+
+class PaginadorEstimado(PaginadorSinConteo):
+    estimar = True
+
+
+class ComparacionDeFilas(Func):
+    """``(a, b) < (x, y)``: comparación de filas que recorre el índice compuesto.
+
+    La forma expandida ``a < x OR (a = x AND b < y)`` no es un rango para el
+    planificador de PostgreSQL; la comparación de filas sí (y SQLite la admite).
+    """
+
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, campos: list[str], valores: list, operador: str, fields):
+        self.operador = operador
+        super().__init__(
+            *[F(campo) for campo in campos],
+            *[
+                Value(valor, output_field=fields[campo])
+                for campo, valor in zip(campos, valores)
+            ],
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        partes, params = [], []
+        for expresion in self.get_source_expressions():
+            sql, parametros = compiler.compile(expresion)
+            partes.append(sql)
+            params.extend(parametros)
+        mitad = len(partes) // 2
+        izquierda = ", ".join(partes[:mitad])
+        derecha = ", ".join(partes[mitad:])
+        return f"({izquierda}) {self.operador} ({derecha})", params
+
+
+class CursorKeysetPagination(BasePagination):
+    """Paginación por keyset sobre los campos de ``cursor_ordering`` de la vista.
+
+    El cursor guarda los valores de la última fila entregada y cada página se
+    obtiene con ``WHERE (created_at, id) < (...)`` (``>`` en orden ascendente
+    o al retroceder), por lo que una página profunda cuesta lo mismo que la
+    primera. Si los campos mezclan direcciones no hay comparación de filas: se
+    usa la forma expandida con una cota sobre el primer campo para que el
+    índice siga acotando el recorrido. Los campos de orden no deben ser nulos y
+    el último debe ser único (``id``).
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-created_at", "-id")
+
+    def get_ordering(self, view) -> tuple[str, ...]:
+        return tuple(getattr(view, "cursor_ordering", None) or self.ordering)
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request) -> tuple[list[str] | None, bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            return [str(valor) for valor in data["v"]], bool(data.get("r"))
+        except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+            raise NotFound("Cursor inválido.")
+
+    def encode_cursor(self, instance, reverso: bool) -> str:
+        valores = [
+            self._fields[campo].value_to_string(instance) for campo, _ in self._orden
+        ]
+        data = json.dumps({"v": valores, "r": int(reverso)}, separators=(",", ":"))
+        url = self.request.build_absolute_uri()
+        cursor = base64.urlsafe_b64encode(data.encode("ascii")).decode("ascii")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def _filtro(self, orden: list[tuple[str, bool]], posicion: list[str]):
+        campos = [campo for campo, _ in orden]
+        valores = [
+            self._fields[campo].to_python(valor)
+            for campo, valor in zip(campos, posicion)
+        ]
+        direcciones = {descendente for _, descendente in orden}
+        if len(direcciones) == 1:
+            operador = "<" if direcciones.pop() else ">"
+            return ComparacionDeFilas(campos, valores, operador, self._fields)
+        filtro = Q()
+        iguales: dict[str, object] = {}
+        for (campo, descendente), valor in zip(orden, valores):
+            lookup = "lt" if descendente else "gt"
+            filtro |= Q(**iguales, **{f"{campo}__{lookup}": valor})
+            iguales[campo] = valor
+        primero, descendente = orden[0]
+        cota = "lte" if descendente else "gte"
+        return Q(**{f"{primero}__{cota}": valores[0]}) & filtro
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        model = queryset.model
+        self._orden = [
+            (campo.lstrip("-"), campo.startswith("-"))
+            for campo in self.get_ordering(view)
+        ]
+        self._fields = {
+            campo: model._meta.pk if campo == "pk" else model._meta.get_field(campo)
+            for campo, _ in self._orden
+        }
+        posicion, self.reverso = self.decode_cursor(request)
+        if posicion is not None and len(posicion) != len(self._orden):
+            raise NotFound("Cursor inválido.")
+        orden = [
+            (campo, descendente != self.reverso) for campo, descendente in self._orden
+        ]
+        queryset = queryset.order_by(
+            *[f"-{campo}" if descendente else campo for campo, descendente in orden]
+        )
+        if posicion is not None:
+            try:
+                queryset = queryset.filter(self._filtro(orden, posicion))
+            except ValidationError:
+                raise NotFound("Cursor inválido.")
+        filas = list(queryset[: self.page_size + 1])
+        hay_mas = len(filas) > self.page_size
+        filas = filas[: self.page_size]
+        if self.reverso:
+            filas.reverse()
+        self.page = filas
+        self.has_next = hay_mas if not self.reverso else posicion is not None
+        self.has_previous = posicion is not None if not self.reverso else hay_mas
+        return filas
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverso=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return replace_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param, ""
+            )
+        return self.encode_cursor(self.page[0], reverso=True)
+
+    def get_paginated_response(self, data):  # type: ignore[override]
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
 
 
 class DefaultPageNumberPagination(PageNumberPagination):
+    """Paginación por número de página con dos modos opcionales.
+
+    ``?cursor=`` (vacío para la primera página) cambia a paginación por keyset
+    y ``?conteo=estimado|ninguno`` evita el ``COUNT(*)`` exacto.
+    """
+
     page_size = 50
     page_size_query_param = "page_size"
     max_page_size = 200
+    conteo_query_param = "conteo"
+    paginadores = {
+        "estimado": PaginadorEstimado,
+        "ninguno": PaginadorSinConteo,
+    }
+
+    def sin_conteo(self, request) -> bool:
+        """Si el request pide una paginación que no recorre todo el queryset."""
+        return (
+            CursorKeysetPagination.cursor_query_param in request.query_params
+            or request.query_params.get(self.conteo_query_param) in self.paginadores
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor = None
+        if CursorKeysetPagination.cursor_query_param in request.query_params:
+            self.cursor = CursorKeysetPagination()
+            return self.cursor.paginate_queryset(queryset, request, view)
+        conteo = request.query_params.get(self.conteo_query_param)
+        self.django_paginator_class = self.paginadores.get(conteo, Paginator)
+        return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):  # type: ignore[override]
+        if self.cursor is not None:
+            return self.cursor.get_paginated_response(data)
         return Response(
             {
                 "count": self.page.paginator.count,
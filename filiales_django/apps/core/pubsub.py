@@ -0,0 +1,214 @@
+"""Publicación y suscripción de eventos para las respuestas en streaming.
+
+Las señales publican con ``publicar(canales, evento)`` desde el hilo del request
+y las vistas ASGI se suscriben a uno o más canales y reciben los eventos en su
+event loop. El broker se elige con ``PUBSUB_URL``:
+
+- ``local://`` reparte en memoria dentro del proceso. Alcanza con un único
+  proceso ASGI.
+- ``redis://host:6379/0`` usa el pub/sub de Redis, de modo que un evento
+  publicado en un proceso llega a los suscriptores de todos.
+
+Otros brokers se agregan en ``BROKERS`` con su esquema. La entrega es de mejor
+esfuerzo: un suscriptor que no consume a tiempo se descarta y debe reconectar.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Iterable
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Evento:
+    tipo: str
+    datos: dict[str, Any] = field(default_factory=dict)
+    # Id para reanudar (``Last-Event-ID``); solo lo llevan los eventos reanudables.
+    id: str | None = None
+
+    @cached_property
+    def contenido(self) -> str:
+        """Cuerpo serializado una sola vez y compartido por los suscriptores."""
+        return json.dumps(
+            {"tipo": self.tipo, "datos": self.datos, "id": self.id},
+            default=str,
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def desde_json(cls, contenido: str | bytes) -> "Evento":
+        valores = json.loads(contenido)
+        return cls(valores["tipo"], valores["datos"], valores.get("id"))
+
+
+class SuscripcionDesbordada(Exception):
+    """El suscriptor acumuló más eventos de los que admite su cola."""
+
+
+class Suscripcion(abc.ABC):
+    @abc.abstractmethod
+    async def recibir(self, timeout: float) -> Evento | None:
+        """El próximo evento o ``None`` si no llegó ninguno en ``timeout``."""
+
+    @abc.abstractmethod
+    async def cerrar(self) -> None: ...
+
+
+class Broker(abc.ABC):
+    @abc.abstractmethod
+    def publicar(self, canal: str, evento: Evento) -> None: ...
+
+    @abc.abstractmethod
+    async def suscribir(self, canales: Iterable[str]) -> Suscripcion: ...
+
+
+class _SuscripcionLocal(Suscripcion):
+    def __init__(self, broker: "BrokerLocal", canales: list[str], maximo: int):
+        self._broker = broker
+        self.canales = canales
+        self.loop = asyncio.get_running_loop()
+        self._cola: asyncio.Queue = asyncio.Queue(maximo)
+        self._desbordada = False
+
+    def entregar(self, evento: Evento) -> None:
+        # Corre en el loop del suscriptor, vía ``call_soon_threadsafe``.
+        try:
+            self._cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            self._desbordada = True
+
+    async def recibir(self, timeout: float) -> Evento | None:
+        if self._desbordada:
+            raise SuscripcionDesbordada
+        try:
+            return await asyncio.wait_for(self._cola.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def cerrar(self) -> None:
+        self._broker.quitar(self)
+
+
+class BrokerLocal(Broker):
+    """Reparto en memoria entre los suscriptores del proceso."""
+
+    def __init__(self, url: str = "", maximo: int | None = None):
+        self._maximo = maximo or getattr(settings, "PUBSUB_COLA_MAXIMA", 1000)
+        self._suscripciones: dict[str, set[_SuscripcionLocal]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publicar(self, canal: str, evento: Evento) -> None:
+        with self._lock:
+            destinatarios = list(self._suscripciones.get(canal, ()))
+        for suscripcion in destinatarios:
+            try:
+                suscripcion.loop.call_soon_threadsafe(suscripcion.entregar, evento)
+            except RuntimeError:
+                # El loop ya cerró: la suscripción se quita al terminar el stream.
+                pass
+
+    async def suscribir(self, canales: Iterable[str]) -> Suscripcion:
+        suscripcion = _SuscripcionLocal(self, list(canales), self._maximo)
+        with self._lock:
+            for canal in suscripcion.canales:
+                self._suscripciones[canal].add(suscripcion)
+        return suscripcion
+
+    def quitar(self, suscripcion: _SuscripcionLocal) -> None:
+        with self._lock:
+            for canal in suscripcion.canales:
+                suscriptores = self._suscripciones.get(canal)
+                if suscriptores is None:
+                    continue
+                suscriptores.discard(suscripcion)
+                if not suscriptores:
+                    del self._suscripciones[canal]
+
+
+class _SuscripcionRedis(Suscripcion):
+    def __init__(self, cliente, pubsub):
+        self._cliente = cliente
+        self._pubsub = pubsub
+
+    async def recibir(self, timeout: float) -> Evento | None:
+        mensaje = await self._pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=timeout
+        )
+        if mensaje is None:
+            return None
+        return Evento.desde_json(mensaje["data"])
+
+    async def cerrar(self) -> None:
+        await self._pubsub.unsubscribe()
+        await self._pubsub.aclose()
+        await self._cliente.aclose()
+
+
+class BrokerRedis(Broker):
+    """Pub/sub de Redis; cada suscripción abre su propia conexión."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self._url = url
+        self._cliente = redis.Redis.from_url(url)
+
+    def publicar(self, canal: str, evento: Evento) -> None:
+        self._cliente.publish(canal, evento.contenido)
+
+    async def suscribir(self, canales: Iterable[str]) -> Suscripcion:
+        from redis import asyncio as aioredis
+
+        cliente = aioredis.Redis.from_url(self._url)
+        pubsub = cliente.pubsub()
+        await pubsub.subscribe(*canales)
+        return _SuscripcionRedis(cliente, pubsub)
+
+
+BROKERS: dict[str, type[Broker]] = {
+    "local": BrokerLocal,
+    "redis": BrokerRedis,
+    "rediss": BrokerRedis,
+}
+
+_broker: Broker | None = None
+
+
+def broker() -> Broker:
+    global _broker
+    if _broker is None:
+        url = getattr(settings, "PUBSUB_URL", "local://")
+        esquema = url.partition("://")[0]
+        try:
+            clase = BROKERS[esquema]
+        except KeyError:
+            raise ValueError(f"PUBSUB_URL no soportada: {url}") from None
+        _broker = clase(url)
+    return _broker
+
+
+def limpiar() -> None:
+    """Descarta el broker para que se vuelva a crear con la configuración actual."""
+    global _broker
+    _broker = None
+
+
+def publicar(canales: Iterable[str], evento: Evento) -> None:
+    """Publica ``evento`` en ``canales`` sin propagar fallas del broker."""
+    try:
+        destino = broker()
+        for canal in canales:
+            destino.publicar(canal, evento)
+    except Exception:
+        logger.exception("No se pudo publicar el evento %s", evento.tipo)
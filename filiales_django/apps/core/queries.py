@@ -0,0 +1,77 @@
+"""Registro de consultas SQL por request, presupuesto y detección de N+1."""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s|\?")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+class PresupuestoConsultasExcedido(Exception):
+    """Un request superó su presupuesto de consultas o repitió un patrón N+1."""
+
+
+def normalizar_sql(sql: str) -> str:
+    """Reemplaza literales y listas ``IN`` para agrupar consultas equivalentes."""
+    sql = _LITERALES.sub("?", sql)
+    sql = _LISTAS.sub("(...)", sql)
+    return " ".join(sql.split())
+
+
+@dataclass
+class RegistroConsultas:
+    consultas: list[tuple[str, float]] = field(default_factory=list)
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append((sql, time.perf_counter() - inicio))
+
+    @property
+    def total(self) -> int:
+        return len(self.consultas)
+
+    @property
+    def duracion(self) -> float:
+        return sum(duracion for _, duracion in self.consultas)
+
+    def agrupadas(self) -> Counter:
+        return Counter(normalizar_sql(sql) for sql, _ in self.consultas)
+
+    def repetidas(self, umbral: int) -> dict[str, int]:
+        """Patrones ``SELECT`` ejecutados ``umbral`` veces o más (sospecha de N+1)."""
+        return {
+            patron: veces
+            for patron, veces in self.agrupadas().most_common()
+            if veces >= umbral and patron.upper().startswith("SELECT")
+        }
+
+    def problemas(self, presupuesto: int | None, umbral: int) -> list[str]:
+        problemas = []
+        if presupuesto is not None and self.total > presupuesto:
+            problemas.append(
+                f"{self.total} consultas superan el presupuesto de {presupuesto}"
+            )
+        for patron, veces in self.repetidas(umbral).items():
+            problemas.append(f"N+1: {veces}x {patron[:300]}")
+        return problemas
+
+
+@contextmanager
+def registrar_consultas(using: str = "default") -> Iterator[RegistroConsultas]:
+    registro = RegistroConsultas()
+    with connections[using].execute_wrapper(registro):
+        yield registro
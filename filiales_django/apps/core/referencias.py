@@ -0,0 +1,103 @@
+"""Caché de datos de referencia: filiales, partidos y productos.
+
+Son tablas chicas que cambian poco pero se resuelven en cada alta (las FK de
+los serializers) y en el mapa de filiales. Se leen a través de
+``apps.core.cache`` con un tag por fila y otro por tabla, que las señales de
+``save``/``delete`` invalidan. Los ``queryset.update()`` no disparan señales:
+quien los use sobre estas tablas debe llamar a ``invalidar``.
+
+Las instancias cacheadas son copias: sirven para validar y asignar FKs, pero
+los contadores que se actualizan con ``UPDATE`` (por ejemplo
+``Partido.cupo_disponible``) pueden estar desactualizados.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Iterable
+
+from apps.core import cache
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework import serializers
+
+
+def _timeout() -> int:
+    return getattr(settings, "REFERENCIAS_CACHE_TIMEOUT", 3600)
+
+
+def _tag_tabla(label: str) -> str:
+    return f"ref:{label}"
+
+
+def _tag_fila(label: str, pk) -> str:
+    return f"ref:{label}:{pk}"
+
+
+def obtener(model, pk):
+    """Instancia de ``model`` con ``pk`` o ``None`` si no existe."""
+    label = model._meta.label
+    clave = _tag_fila(label, pk)
+    instancia = cache.obtener(clave)
+    if instancia is None:
+        instancia = model._default_manager.filter(pk=pk).first()
+        if instancia is None:
+            return None
+        cache.guardar(clave, instancia, _timeout(), tags=[clave, _tag_tabla(label)])
+    return copy.copy(instancia)
+
+
+def filiales_activas() -> list[dict]:
+    """Filiales activas serializadas como las devuelve el mapa."""
+    from apps.filiales.models import Filial
+    from apps.filiales.serializers import FilialSerializer
+
+    def _calcular() -> list[dict]:
+        queryset = Filial.objects.filter(activa=True)
+        return [dict(fila) for fila in FilialSerializer(queryset, many=True).data]
+
+    label = Filial._meta.label
+    return cache.obtener_o_calcular(
+        "ref:filiales_activas", _calcular, _timeout(), tags=[_tag_tabla(label)]
+    )
+
+
+def invalidar(model, pks: Iterable = ()) -> None:
+    label = model._meta.label
+    cache.invalidar_tags(_tag_tabla(label), *(_tag_fila(label, pk) for pk in pks))
+
+
+class ReferenciaField(serializers.PrimaryKeyRelatedField):
+    """``PrimaryKeyRelatedField`` que resuelve el pk a través de la caché."""
+
+    def __init__(self, model, **kwargs):
+        self.model = model
+        if not kwargs.get("read_only"):
+            kwargs.setdefault("queryset", model._default_manager.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = self.model._meta.pk.to_python(data)
+        except (TypeError, ValueError, ValidationError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        instancia = obtener(self.model, pk)
+        if instancia is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instancia
+
+
+@receiver(post_save, sender="filiales.Filial")
+@receiver(post_delete, sender="filiales.Filial")
+@receiver(post_save, sender="partidos.Partido")
+@receiver(post_delete, sender="partidos.Partido")
+@receiver(post_save, sender="pedidos.Producto")
+@receiver(post_delete, sender="pedidos.Producto")
+def _invalidar_por_senal(sender, instance, **kwargs):
+    invalidar(sender, [instance.pk])
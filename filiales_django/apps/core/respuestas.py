@@ -0,0 +1,152 @@
+"""Caché de respuestas HTTP por alcance del usuario.
+
+``cachear_respuesta`` guarda el cuerpo ya renderizado de una vista de lectura
+con clave (vista, formato, query params, rol, filial) tomada del
+``PerfilUsuario``, de modo que un acierto no consulta la base ni serializa.
+Usuarios distintos con el mismo rol y filial comparten la entrada; las vistas
+que dependen de quién pide usan ``por_usuario=True``.
+Las entradas llevan un tag por modelo involucrado; las señales ``save`` y
+``delete`` de esos modelos las invalidan. Quien los modifique con
+``queryset.update()`` debe llamar a ``invalidar``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from apps.core import cache
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+CABECERAS = ("ETag", "Last-Modified", "Cache-Control")
+
+_conectados: set[str] = set()
+
+
+class _NoCachear(Exception):
+    """La respuesta no es un 200 de DRF: se devuelve sin guardarla."""
+
+
+def _timeout(timeout: int | None) -> int:
+    if timeout is not None:
+        return timeout
+    return getattr(settings, "RESPUESTAS_CACHE_TIMEOUT", 300)
+
+
+def _tag(label: str) -> str:
+    return f"respuestas:{label}"
+
+
+def invalidar(*labels: str) -> None:
+    """Invalida las respuestas que dependen de los modelos ``app.Modelo``."""
+    cache.invalidar_tags(*(_tag(label) for label in labels))
+
+
+def _invalidar_por_senal(sender, **kwargs):
+    invalidar(sender._meta.label)
+
+
+def _conectar(label: str) -> None:
+    if label in _conectados:
+        return
+    for senal in (post_save, post_delete):
+        senal.connect(
+            _invalidar_por_senal,
+            sender=label,
+            weak=False,
+            dispatch_uid=f"respuestas:{senal is post_save}:{label}",
+        )
+    _conectados.add(label)
+
+
+def _clave(vista: str, request, por_usuario: bool = False) -> str | None:
+    perfil = getattr(getattr(request, "user", None), "perfil", None)
+    if perfil is None:
+        return None
+    formato = getattr(getattr(request, "accepted_renderer", None), "format", "")
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    resumen = hashlib.sha1(query.encode()).hexdigest()
+    alcance = f"{perfil.rol}:{perfil.filial_id}"
+    if por_usuario:
+        alcance += f":{perfil.user_id}"
+    return f"respuesta:{vista}:{formato}:{alcance}:{resumen}"
+
+
+def _desde_cache(request, guardada: dict) -> HttpResponse:
+    etag = guardada["cabeceras"].get("ETag")
+    if etag:
+        respuesta = get_conditional_response(request, etag=etag)
+        if respuesta is not None:
+            respuesta.headers["ETag"] = etag
+            return respuesta
+    respuesta = HttpResponse(guardada["contenido"], content_type=guardada["tipo"])
+    for nombre, valor in guardada["cabeceras"].items():
+        respuesta.headers[nombre] = valor
+    return respuesta
+
+
+def cachear_respuesta(
+    *labels: str, timeout: int | None = None, por_usuario: bool = False
+):
+    """Decora ``get``/``list`` de una vista DRF para cachear sus respuestas 200.
+
+    ``labels`` son los modelos (``"app.Modelo"``) de los que depende la
+    respuesta. ``timeout`` por defecto es ``RESPUESTAS_CACHE_TIMEOUT``.
+
+    Sin ``por_usuario`` la entrada se comparte entre todos los usuarios con el
+    mismo rol y filial: no usar en vistas cuya respuesta dependa de quién la
+    pide más allá de ese alcance.
+    """
+    for label in labels:
+        _conectar(label)
+    tags = [_tag(label) for label in labels]
+
+    def decorador(metodo):
+        vista = f"{metodo.__module__}.{metodo.__qualname__}"
+
+        @wraps(metodo)
+        def envoltura(self, request, *args, **kwargs):
+            clave = _clave(vista, request, por_usuario)
+            if clave is None:
+                return metodo(self, request, *args, **kwargs)
+            respuesta = None
+
+            def _calcular() -> dict:
+                nonlocal respuesta
+                respuesta = metodo(self, request, *args, **kwargs)
+                if not (
+                    isinstance(respuesta, Response) and respuesta.status_code == 200
+                ):
+                    raise _NoCachear
+                respuesta.accepted_renderer = request.accepted_renderer
+                respuesta.accepted_media_type = request.accepted_media_type
+                respuesta.renderer_context = self.get_renderer_context()
+                respuesta.render()
+                return {
+                    "contenido": respuesta.content,
+                    "tipo": respuesta["Content-Type"],
+                    "cabeceras": {
+                        nombre: respuesta[nombre]
+                        for nombre in CABECERAS
+                        if respuesta.has_header(nombre)
+                    },
+                }
+
+            try:
+                guardada = cache.obtener_o_calcular(
+                    clave, _calcular, _timeout(timeout), tags=tags
+                )
+            except _NoCachear:
+                return respuesta
+            if respuesta is not None:
+                return respuesta
+            return _desde_cache(request, guardada)
+
+        return envoltura
+
+    return decorador
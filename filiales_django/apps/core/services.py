@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Iterable
+from typing import Iterable, Sequence
 
 import requests
 from django.conf import settings
@@ -24,6 +24,11 @@ def send_notification_email(
     recipients = [email for email in recipients if email]
     if not recipients:
         return
+    if getattr(settings, "EMAILS_ASYNC", True):
+        from apps.core.emails import encolar_correos
+
+        encolar_correos(subject, message, recipients, html_mensaje=html_message)
+        return
     try:
         send_mail(
             subject,
@@ -36,23 +41,56 @@ def send_notification_email(
         logger.exception("Error sending email: %%s", exc)
 
 
+def _webhook_url(event: str) -> str:
+    return {
+        "auditoria": getattr(settings, "WEBHOOK_URL_AUDITORIA", ""),
+        "eventos": getattr(settings, "WEBHOOK_URL_EVENTOS", ""),
+    }.get(event, "")
+
+
 def dispatch_webhook(event: str, payload: dict[str, object]) -> None:
     if not getattr(settings, "WEBHOOKS_ENABLED", False):
         logger.debug("Webhooks disabled, skipping %s", event)
         return
-    url = {
-        "auditoria": getattr(settings, "WEBHOOK_URL_AUDITORIA", ""),
-        "eventos": getattr(settings, "WEBHOOK_URL_EVENTOS", ""),
-    }.get(event)
+    url = _webhook_url(event)
     if not url:
         logger.debug("No webhook URL configured for %s", event)
         return
+    if getattr(settings, "WEBHOOKS_ASYNC", True):
+        from apps.core.webhooks import encolar_webhook
+
+        encolar_webhook(event, url, payload)
+        return
+    _post_webhook(event, url, payload)
+
+
+def dispatch_webhooks(event: str, payloads: Sequence[dict[str, object]]) -> None:
+    """Variante de ``dispatch_webhook`` que encola varios eventos en un INSERT."""
+    if not payloads:
+        return
+    if not getattr(settings, "WEBHOOKS_ENABLED", False):
+        logger.debug("Webhooks disabled, skipping %s", event)
+        return
+    url = _webhook_url(event)
+    if not url:
+        logger.debug("No webhook URL configured for %s", event)
+        return
+    if getattr(settings, "WEBHOOKS_ASYNC", True):
+        from apps.core.webhooks import encolar_webhooks
+
+        encolar_webhooks(event, url, payloads)
+        return
+    for payload in payloads:
+        _post_webhook(event, url, payload)
+
+
+def _post_webhook(event: str, url: str, payload: dict[str, object]) -> None:
     try:
         requests.post(
             url,
             data=json.dumps(payload),
             headers={"Content-Type": "application/json"},
-            timeout=5,
+            timeout=getattr(settings, "WEBHOOK_TIMEOUT", 5),
         )
     except Exception as exc:  # pragma: no cover - network failures
         logger.exception("Error dispatching webhook %s: %%s", event, exc)
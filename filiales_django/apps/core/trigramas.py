@@ -0,0 +1,121 @@
+"""Búsqueda difusa por trigramas (typeahead con errores de tipeo).
+
+Se compara el texto en minúsculas y sin acentos. En PostgreSQL usa
+``pg_trgm`` sobre ``f_unaccent(lower(campo))``: filtra con ``%`` (similitud
+sobre ``pg_trgm.similarity_threshold``) o ``LIKE '%texto%'``, ambos resueltos
+con los índices GIN ``gin_trgm_ops`` de las migraciones, y ordena por
+``TrigramSimilarity``. En otros motores arma un ``IndiceTrigramas`` en memoria
+con las filas del queryset y calcula la misma similitud que ``pg_trgm``.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Iterable, Sequence
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import CharField, Func, Q
+from django.db.models.functions import Greatest, Lower
+
+# Umbral por defecto de ``pg_trgm.similarity_threshold``.
+UMBRAL = 0.3
+
+_PALABRA = re.compile(r"\w+")
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas y sin acentos, como ``f_unaccent(lower(texto))``."""
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(letra for letra in descompuesto if not unicodedata.combining(letra))
+
+
+def _normalizado(campo: str) -> Func:
+    return Func(Lower(campo), function="f_unaccent", output_field=CharField())
+
+
+def trigramas(texto: str) -> set[str]:
+    """Trigramas de ``texto`` normalizado, como los calcula ``pg_trgm``."""
+    resultado: set[str] = set()
+    for palabra in _PALABRA.findall(normalizar(texto)):
+        relleno = f"  {palabra} "
+        resultado.update(relleno[i : i + 3] for i in range(len(relleno) - 2))
+    return resultado
+
+
+def similitud(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class IndiceTrigramas:
+    """Índice invertido trigrama -> filas, para motores sin ``pg_trgm``."""
+
+    def __init__(self, filas: Iterable[Sequence]):
+        self._textos: dict = {}
+        self._invertido: dict[str, set] = defaultdict(set)
+        for pk, *textos in filas:
+            valores = [normalizar(texto or "") for texto in textos]
+            conjuntos = [trigramas(texto) for texto in valores]
+            self._textos[pk] = list(zip(valores, conjuntos))
+            for conjunto in conjuntos:
+                for trigrama in conjunto:
+                    self._invertido[trigrama].add(pk)
+
+    def buscar(
+        self, texto: str, limite: int, umbral: float = UMBRAL
+    ) -> list[tuple[object, float]]:
+        consulta = trigramas(texto)
+        buscado = normalizar(texto)
+        candidatos: set = set()
+        for trigrama in consulta:
+            candidatos |= self._invertido.get(trigrama, set())
+        resultados = []
+        for pk in candidatos:
+            campos = self._textos[pk]
+            puntaje = max(similitud(consulta, conjunto) for _, conjunto in campos)
+            if puntaje >= umbral or any(buscado in valor for valor, _ in campos):
+                resultados.append((pk, puntaje))
+        resultados.sort(key=lambda item: (-item[1], item[0]))
+        return resultados[:limite]
+
+
+def buscar(queryset, campos: Sequence[str], texto: str, limite: int) -> list:
+    """Hasta ``limite`` objetos de ``queryset`` parecidos a ``texto``.
+
+    Cada objeto lleva el atributo ``similitud`` (0 a 1).
+    """
+    texto = texto.strip()
+    if not texto:
+        return []
+    if connections[queryset.db].vendor == "postgresql":
+        buscado = normalizar(texto)
+        alias = {f"trgm_{campo}": _normalizado(campo) for campo in campos}
+        expresiones = [TrigramSimilarity(expr, buscado) for expr in alias.values()]
+        filtro = Q()
+        for nombre in alias:
+            filtro |= Q(**{f"{nombre}__trigram_similar": buscado})
+            filtro |= Q(**{f"{nombre}__contains": buscado})
+        return list(
+            queryset.alias(**alias)
+            .filter(filtro)
+            .annotate(
+                similitud=(
+                    Greatest(*expresiones) if len(expresiones) > 1 else expresiones[0]
+                )
+            )
+            .order_by("-similitud", "pk")[:limite]
+        )
+
+    indice = IndiceTrigramas(queryset.order_by().values_list("pk", *campos))
+    encontrados = indice.buscar(texto, limite)
+    objetos = queryset.in_bulk([pk for pk, _ in encontrados])
+    resultado = []
+    for pk, puntaje in encontrados:
+        objeto = objetos[pk]
+        objeto.similitud = puntaje
+        resultado.append(objeto)
+    return resultado
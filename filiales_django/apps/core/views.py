@@ -1,13 +1,25 @@
 from __future__ import annotations
 
-from apps.acciones.models import AccionSolidaria
-from apps.entradas.models import SolicitudEntrada
-from apps.filiales.models import Autoridad, Filial
-from django.db.models import Count
+from apps.core import condicional, dashboard
+from apps.core.permissions import IsAdminAllAccess
+from apps.filiales import estadisticas
 from rest_framework import permissions, response
 from rest_framework.views import APIView
 
 
+def _filial_alcance(perfil) -> int | None:
+    if perfil.es_usuario_filial and perfil.filial_id:
+        return perfil.filial_id
+    return None
+
+
+def _responder(request, datos: dict):
+    """Respuesta con ETag de los datos; 304 si el cliente ya los tiene."""
+    return condicional.responder(
+        request, condicional.firma_de_datos(datos), lambda: response.Response(datos)
+    )
+
+
 class DashboardView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -16,30 +28,15 @@ class DashboardView(APIView):
         if not perfil:
             return response.Response({})
 
-        # Filtrar por filial si es usuario de filial
-        queryset_filiales = Filial.objects.all()
-        queryset_autoridades = Autoridad.objects.filter(activo=True)
-        queryset_acciones = AccionSolidaria.objects.all()
-        queryset_entradas = SolicitudEntrada.objects.all()
-
-        if perfil.es_usuario_filial and perfil.filial_id:
-            queryset_filiales = queryset_filiales.filter(id=perfil.filial_id)
-            queryset_autoridades = queryset_autoridades.filter(filial_id=perfil.filial_id)
-            queryset_acciones = queryset_acciones.filter(filial_id=perfil.filial_id)
-            queryset_entradas = queryset_entradas.filter(filial_id=perfil.filial_id)
-
-        total_filiales = queryset_filiales.count()
-        total_autoridades = queryset_autoridades.count()
-        total_acciones = queryset_acciones.count()
-        total_entradas = queryset_entradas.count()
-
-        return response.Response(
+        resumen = dashboard.obtener_resumen(_filial_alcance(perfil))
+        return _responder(
+            request,
             {
-                "total_filiales": total_filiales,
-                "total_integrantes": total_autoridades,
-                "total_acciones": total_acciones,
-                "total_entradas": total_entradas,
-            }
+                "total_filiales": resumen["total_filiales"],
+                "total_integrantes": resumen["total_integrantes"],
+                "total_acciones": resumen["total_acciones"],
+                "total_entradas": resumen["total_entradas"],
+            },
         )
 
 
@@ -51,24 +48,23 @@ class DashboardResumenView(APIView):
         if not perfil:
             return response.Response({})
 
-        queryset_filiales = Filial.objects.filter(activa=True)
-        queryset_solicitudes = SolicitudEntrada.objects.filter(
-            estado=SolicitudEntrada.Estados.PENDIENTE
+        resumen = dashboard.obtener_resumen(_filial_alcance(perfil))
+        return _responder(
+            request,
+            {
+                "filiales_activas": resumen["filiales_activas"],
+                "solicitudes_pendientes": resumen["solicitudes_pendientes"],
+            },
         )
 
-        if perfil.es_usuario_filial and perfil.filial_id:
-            queryset_filiales = queryset_filiales.filter(id=perfil.filial_id)
-            queryset_solicitudes = queryset_solicitudes.filter(filial_id=perfil.filial_id)
 
-        filiales_activas = queryset_filiales.count()
-        solicitudes_pendientes = queryset_solicitudes.count()
+class DashboardCacheMetricasView(APIView):
+    """Aciertos y fallos de la caché del dashboard en este proceso."""
 
-        return response.Response(
-            {
-                "filiales_activas": filiales_activas,
-                "solicitudes_pendientes": solicitudes_pendientes,
-            }
-        )
+    permission_classes = [permissions.IsAuthenticated, IsAdminAllAccess]
+
+    def get(self, request):
+        return response.Response(dashboard.metricas_cache())
 
 
 class DashboardAccionesEstadisticasView(APIView):
@@ -79,22 +75,11 @@ class DashboardAccionesEstadisticasView(APIView):
         if not perfil:
             return response.Response({})
 
-        acciones_queryset = AccionSolidaria.objects.all()
-        if perfil.es_usuario_filial and perfil.filial_id:
-            acciones_queryset = acciones_queryset.filter(filial_id=perfil.filial_id)
-
-        estadisticas = (
-            acciones_queryset.values("estado")
-            .annotate(total=Count("id"))
-            .order_by("-total")
+        return _responder(
+            request,
+            estadisticas.totales_por_estado("acciones", _filial_alcance(perfil)),
         )
 
-        result = {}
-        for stat in estadisticas:
-            result[stat["estado"].lower()] = stat["total"]
-
-        return response.Response(result)
-
 
 class DashboardEntradasEstadisticasView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -104,18 +89,7 @@ class DashboardEntradasEstadisticasView(APIView):
         if not perfil:
             return response.Response({})
 
-        solicitudes_queryset = SolicitudEntrada.objects.all()
-        if perfil.es_usuario_filial and perfil.filial_id:
-            solicitudes_queryset = solicitudes_queryset.filter(filial_id=perfil.filial_id)
-
-        estadisticas = (
-            solicitudes_queryset.values("estado")
-            .annotate(total=Count("id"))
-            .order_by("-total")
+        return _responder(
+            request,
+            estadisticas.totales_por_estado("solicitudes", _filial_alcance(perfil)),
         )
-
-        result = {}
-        for stat in estadisticas:
-            result[stat["estado"].lower()] = stat["total"]
-
-        return response.Response(result)
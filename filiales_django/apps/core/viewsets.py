@@ -3,20 +3,73 @@ from __future__ import annotations
 from typing import Any
 
 from apps.auditoria.models import Accion
+from apps.core import condicional
 from apps.core.audit import log_action
+from apps.core.busqueda import BusquedaTextoFilter
 from apps.core.pagination import DefaultPageNumberPagination
 from apps.core.permissions import RoleBasedPermission
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework import response, viewsets
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 
 
 class BaseModelViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     pagination_class = DefaultPageNumberPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, BusquedaTextoFilter, OrderingFilter]
     audit_recurso: str | None = None
+    # Orden de la paginación por cursor (``?cursor=``); el último campo debe ser único.
+    cursor_ordering: tuple[str, ...] = ("-created_at", "-id")
+    # Máximo de consultas SQL por request (entero o dict por acción); ver QueryBudgetMiddleware.
+    query_budget: int | dict[str, int] | None = None
+    # GET condicional (ETag/Last-Modified) en list y retrieve; ver apps.core.condicional.
+    conditional_get = True
+    # Relaciones serializadas junto al modelo que también invalidan el ETag.
+    conditional_related: tuple[str, ...] = ()
+    # ``?search=`` sobre la columna tsvector ``busqueda`` en PostgreSQL; ver apps.core.busqueda.
+    full_text_search = False
+
+    def get_conditional_signature(self, queryset, con_fecha: bool = False):
+        if not self.conditional_get:
+            return None
+        partes = (type(self).__name__, self.action, self.request.user.pk)
+        return condicional.firma(
+            queryset, self.conditional_related, partes, con_fecha=con_fecha
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        sin_conteo = getattr(self.paginator, "sin_conteo", None)
+        if sin_conteo is not None and sin_conteo(request):
+            # La firma haría el COUNT que esa paginación evita.
+            return self.listar(queryset)
+        # Sin Last-Modified: una baja no lo movería y daría un 304 viejo.
+        firma = self.get_conditional_signature(queryset)
+        return condicional.responder(request, firma, lambda: self.listar(queryset))
+
+    def listar(self, queryset):
+        """``ListModelMixin.list`` sobre un queryset ya filtrado."""
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return response.Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        # El objeto y sus permisos se resuelven antes del condicional: un 304
+        # no debe confirmar nada sobre un objeto que el usuario ya no puede ver.
+        instance = self.get_object()
+        firma = self.get_conditional_signature(
+            type(instance)._default_manager.filter(pk=instance.pk),
+            con_fecha=not self.conditional_related,
+        )
+        return condicional.responder(
+            request,
+            firma,
+            lambda: response.Response(self.get_serializer(instance).data),
+        )
 
     def get_audit_recurso(self) -> str:
         if self.audit_recurso:
@@ -0,0 +1,163 @@
+"""Entrega asíncrona de webhooks a partir del outbox ``WebhookSaliente``."""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Sequence
+
+import requests
+from apps.core import outbox
+from apps.core.models import WebhookSaliente
+from django.conf import settings
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_ENTREGA = [
+    "estado",
+    "intentos",
+    "proximo_intento",
+    "ultimo_error",
+    "enviado_at",
+    "updated_at",
+]
+ESTADOS_REINTENTABLES = {408, 429}
+
+
+@dataclass
+class ResultadoEntrega:
+    enviados: int = 0
+    reintentos: int = 0
+    descartados: int = 0
+
+    @property
+    def procesados(self) -> int:
+        return self.enviados + self.reintentos + self.descartados
+
+
+def encolar_webhook(evento: str, url: str, payload: dict[str, Any]) -> WebhookSaliente:
+    """Registra el webhook en el outbox dentro de la transacción en curso."""
+    return WebhookSaliente.objects.create(
+        evento=evento,
+        url=url,
+        payload=payload,
+        proximo_intento=timezone.now(),
+    )
+
+
+def encolar_webhooks(
+    evento: str, url: str, payloads: Sequence[dict[str, Any]]
+) -> list[WebhookSaliente]:
+    ahora = timezone.now()
+    return WebhookSaliente.objects.bulk_create(
+        [
+            WebhookSaliente(
+                evento=evento, url=url, payload=payload, proximo_intento=ahora
+            )
+            for payload in payloads
+        ]
+    )
+
+
+def crear_sesion(pool_size: int | None = None) -> requests.Session:
+    pool_size = pool_size or getattr(settings, "WEBHOOK_POOL_SIZE", 10)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Content-Type"] = "application/json"
+    return session
+
+
+def calcular_backoff(intentos: int) -> timedelta:
+    return outbox.calcular_backoff(
+        intentos,
+        base=getattr(settings, "WEBHOOK_BACKOFF_BASE", 30),
+        maximo=getattr(settings, "WEBHOOK_BACKOFF_MAX", 3600),
+    )
+
+
+def _registrar_fallo(
+    webhook: WebhookSaliente,
+    error: str,
+    resultado: ResultadoEntrega,
+    *,
+    definitivo: bool,
+) -> None:
+    ahora = timezone.now()
+    webhook.ultimo_error = error[:2000]
+    max_intentos = getattr(settings, "WEBHOOK_MAX_INTENTOS", 8)
+    if definitivo or webhook.intentos >= max_intentos:
+        webhook.estado = WebhookSaliente.Estados.DESCARTADO
+        webhook.proximo_intento = ahora
+        resultado.descartados += 1
+        logger.warning(
+            "Webhook %s descartado tras %s intentos: %s",
+            webhook.pk,
+            webhook.intentos,
+            webhook.ultimo_error,
+        )
+        return
+    webhook.proximo_intento = ahora + calcular_backoff(webhook.intentos)
+    resultado.reintentos += 1
+
+
+def _entregar(
+    session: requests.Session, webhook: WebhookSaliente, resultado: ResultadoEntrega
+) -> None:
+    webhook.intentos += 1
+    webhook.updated_at = timezone.now()
+    try:
+        respuesta = session.post(
+            webhook.url,
+            data=json.dumps(webhook.payload),
+            timeout=getattr(settings, "WEBHOOK_TIMEOUT", 5),
+        )
+    except requests.RequestException as exc:
+        _registrar_fallo(webhook, str(exc), resultado, definitivo=False)
+        return
+    if respuesta.status_code < 300:
+        webhook.estado = WebhookSaliente.Estados.ENVIADO
+        webhook.enviado_at = webhook.updated_at
+        webhook.ultimo_error = ""
+        resultado.enviados += 1
+        return
+    definitivo = (
+        400 <= respuesta.status_code < 500
+        and respuesta.status_code not in ESTADOS_REINTENTABLES
+    )
+    _registrar_fallo(
+        webhook,
+        f"HTTP {respuesta.status_code}: {respuesta.text[:500]}",
+        resultado,
+        definitivo=definitivo,
+    )
+
+
+def entregar_pendientes(
+    *, batch_size: int | None = None, session: requests.Session | None = None
+) -> ResultadoEntrega:
+    """Entrega un lote de webhooks pendientes y actualiza su estado."""
+    batch_size = batch_size or getattr(settings, "WEBHOOK_BATCH_SIZE", 100)
+    resultado = ResultadoEntrega()
+    lote = outbox.reclamar_lote(
+        WebhookSaliente,
+        batch_size,
+        reserva_por_item=getattr(settings, "WEBHOOK_TIMEOUT", 5),
+    )
+    if not lote:
+        return resultado
+    sesion_propia = session is None
+    session = session or crear_sesion()
+    try:
+        for webhook in lote:
+            _entregar(session, webhook, resultado)
+    finally:
+        if sesion_propia:
+            session.close()
+        WebhookSaliente.objects.bulk_update(lote, CAMPOS_ENTREGA)
+    return resultado
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EntradasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.entradas"
+
+    def ready(self):
+        from apps.entradas import cupos  # noqa: F401
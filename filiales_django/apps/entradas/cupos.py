@@ -0,0 +1,309 @@
+"""Motor de cupos de entradas por partido.
+
+``Partido.cupo_disponible`` es la única fuente de verdad del cupo restante:
+cada asignación lo descuenta con un ``UPDATE ... SET cupo_disponible =
+cupo_disponible - n WHERE cupo_disponible >= n``, que la base resuelve de forma
+atómica. Dos aprobaciones concurrentes no pueden sobrevender y aprobar no
+depende de cuántas asignaciones tenga el partido. ``reconciliar`` recalcula el
+cupo desde ``AsignacionEntrada`` para corregir desvíos.
+
+Del mismo modo se mantiene ``SolicitudEntrada.total_asignado``, verificable
+con ``recalcular_totales``.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Collection, Iterable
+
+from apps.core import respuestas
+from apps.core.dashboard import invalidar_resumen
+from apps.entradas.models import AsignacionEntrada, SolicitudEntrada
+from apps.filiales import estadisticas
+from apps.partidos.models import Partido
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework import exceptions
+
+
+class CupoInsuficienteError(exceptions.ValidationError):
+    default_detail = "No hay cupos suficientes para aprobar la solicitud."
+    default_code = "cupo_insuficiente"
+
+
+def _restante():
+    # Partidos creados por inserción masiva pueden tener el disponible en NULL.
+    return Coalesce(F("cupo_disponible"), F("cupo_total"))
+
+
+def reservar(partido_id: int, cantidad: int) -> None:
+    """Descuenta ``cantidad`` del cupo del partido o lanza ``CupoInsuficienteError``.
+
+    Los partidos sin ``cupo_total`` no tienen límite.
+    """
+    actualizados = (
+        Partido.objects.filter(pk=partido_id, cupo_total__isnull=False)
+        .filter(
+            Q(cupo_disponible__gte=cantidad)
+            | Q(cupo_disponible__isnull=True, cupo_total__gte=cantidad)
+        )
+        .update(cupo_disponible=_restante() - cantidad, updated_at=timezone.now())
+    )
+    if actualizados:
+        respuestas.invalidar(Partido._meta.label)
+        return
+    if Partido.objects.filter(pk=partido_id, cupo_total__isnull=True).exists():
+        return
+    raise CupoInsuficienteError()
+
+
+def liberar(partido_id: int, cantidad: int) -> None:
+    """Devuelve ``cantidad`` al cupo del partido sin superar ``cupo_total``."""
+    Partido.objects.filter(pk=partido_id, cupo_total__isnull=False).update(
+        cupo_disponible=Least(_restante() + cantidad, F("cupo_total")),
+        updated_at=timezone.now(),
+    )
+    respuestas.invalidar(Partido._meta.label)
+
+
+def asignar(
+    solicitud: SolicitudEntrada, cantidad: int, usuario, comentario: str = ""
+) -> AsignacionEntrada:
+    """Asigna entradas a ``solicitud`` descontando el cupo en la misma transacción.
+
+    La solicitud se vuelve a leer con ``SELECT ... FOR UPDATE`` para que dos
+    administradores no la aprueben a la vez sobre un estado viejo; si el cupo
+    no alcanza no se persiste nada. La asignación devuelta referencia a la
+    solicitud actualizada.
+    """
+    with transaction.atomic():
+        solicitud = (
+            SolicitudEntrada.objects.select_related("filial", "partido")
+            .select_for_update(of=("self",))
+            .get(pk=solicitud.pk)
+        )
+        reservar(solicitud.partido_id, cantidad)
+        asignacion = AsignacionEntrada.objects.create(
+            solicitud=solicitud, cantidad_asignada=cantidad, asignado_por=usuario
+        )
+        # La señal de alta ya sumó en la base; la fila está bloqueada.
+        solicitud.total_asignado += cantidad
+        solicitud.estado = _estado_asignado(solicitud, cantidad)
+        solicitud.observaciones = comentario or solicitud.observaciones
+        solicitud.save(update_fields=["estado", "observaciones", "updated_at"])
+    return asignacion
+
+
+@dataclass
+class ResultadoLote:
+    asignaciones: list[AsignacionEntrada] = field(default_factory=list)
+    errores: list[dict[str, object]] = field(default_factory=list)
+    cupo_disponible: int | None = None
+
+
+def _estado_asignado(solicitud: SolicitudEntrada, cantidad: int) -> str:
+    if cantidad < solicitud.cantidad_solicitada:
+        return SolicitudEntrada.Estados.PARCIAL
+    return SolicitudEntrada.Estados.APROBADA
+
+
+def asignar_lote(
+    partido: Partido,
+    items: Iterable[tuple[int, int]],
+    usuario,
+    comentario: str = "",
+    *,
+    parcial: bool = True,
+    estados: Collection[str] | None = None,
+    en_transaccion: Callable[[list[AsignacionEntrada]], None] | None = None,
+) -> ResultadoLote:
+    """Asigna entradas a varias solicitudes de ``partido`` en una transacción.
+
+    ``items`` son pares ``(solicitud_id, cantidad)``. Las solicitudes y el
+    partido se bloquean una sola vez; los pares inválidos o que ya no entran en
+    el cupo (en el orden recibido) se informan en ``errores``. Con
+    ``parcial=False`` cualquier error cancela el lote completo y con
+    ``estados`` solo se aceptan solicitudes en esos estados. Las filas se
+    escriben con ``bulk_create``/``bulk_update``, por lo que las estadísticas
+    por filial se ajustan acá. ``en_transaccion`` recibe las asignaciones
+    creadas dentro de la misma transacción (auditoría, notificaciones con
+    ``on_commit``): si falla, el lote completo se revierte.
+    """
+    items = list(items)
+    resultado = ResultadoLote()
+    with transaction.atomic():
+        bloqueado = Partido.objects.select_for_update().get(pk=partido.pk)
+        solicitudes = (
+            SolicitudEntrada.objects.select_related("filial")
+            .select_for_update(of=("self",))
+            .filter(partido=bloqueado, pk__in=[pk for pk, _ in items])
+            .in_bulk()
+        )
+        limitado = bloqueado.cupo_total is not None
+        disponible = bloqueado.cupo_disponible
+        if limitado and disponible is None:
+            disponible = bloqueado.cupo_total
+        aceptados: list[tuple[SolicitudEntrada, int]] = []
+        vistos: set[int] = set()
+        for solicitud_id, cantidad in items:
+            solicitud = solicitudes.get(solicitud_id)
+            if solicitud is None:
+                error = "La solicitud no existe o no corresponde al partido."
+            elif solicitud_id in vistos:
+                error = "La solicitud ya fue asignada en este lote."
+            elif estados is not None and solicitud.estado not in estados:
+                error = "La solicitud cambió de estado."
+            elif cantidad > solicitud.cantidad_solicitada:
+                error = "No se puede asignar más de lo solicitado."
+            elif limitado and cantidad > disponible:
+                error = CupoInsuficienteError.default_detail
+            else:
+                error = None
+            if error:
+                resultado.errores.append(
+                    {"solicitud": solicitud_id, "cantidad": cantidad, "error": error}
+                )
+                continue
+            if limitado:
+                disponible -= cantidad
+            vistos.add(solicitud_id)
+            aceptados.append((solicitud, cantidad))
+        resultado.cupo_disponible = disponible
+        if not aceptados or (resultado.errores and not parcial):
+            return resultado
+
+        if limitado:
+            Partido.objects.filter(pk=bloqueado.pk).update(
+                cupo_disponible=disponible, updated_at=timezone.now()
+            )
+            respuestas.invalidar(Partido._meta.label)
+        resultado.asignaciones = AsignacionEntrada.objects.bulk_create(
+            [
+                AsignacionEntrada(
+                    solicitud=solicitud,
+                    cantidad_asignada=cantidad,
+                    asignado_por=usuario,
+                )
+                for solicitud, cantidad in aceptados
+            ]
+        )
+        deltas: dict[int, Counter] = defaultdict(Counter)
+        ahora = timezone.now()
+        for solicitud, cantidad in aceptados:
+            estado = _estado_asignado(solicitud, cantidad)
+            deltas[solicitud.filial_id][f"solicitudes_{solicitud.estado.lower()}"] -= 1
+            deltas[solicitud.filial_id][f"solicitudes_{estado.lower()}"] += 1
+            solicitud.estado = estado
+            solicitud.observaciones = comentario or solicitud.observaciones
+            solicitud.total_asignado += cantidad
+            solicitud.updated_at = ahora
+        SolicitudEntrada.objects.bulk_update(
+            [solicitud for solicitud, _ in aceptados],
+            ["estado", "observaciones", "total_asignado", "updated_at"],
+        )
+        for filial_id, cambios in deltas.items():
+            estadisticas.ajustar(filial_id, **cambios)
+        invalidar_resumen(deltas)
+        if en_transaccion is not None:
+            en_transaccion(resultado.asignaciones)
+    return resultado
+
+
+def _asignado():
+    return Coalesce(
+        Subquery(
+            AsignacionEntrada.objects.filter(solicitud__partido=OuterRef("pk"))
+            .order_by()
+            .values("solicitud__partido")
+            .annotate(total=Sum("cantidad_asignada"))
+            .values("total")
+        ),
+        Value(0),
+    )
+
+
+def reconciliar(
+    partido_ids: Iterable[int] | None = None, *, corregir: bool = True
+) -> dict[int, tuple[int | None, int]]:
+    """Recalcula ``cupo_disponible`` como ``cupo_total - SUM(asignaciones)``.
+
+    Devuelve ``{partido_id: (guardado, real)}`` de los partidos desviados y,
+    con ``corregir``, los actualiza.
+    """
+    partidos = Partido.objects.filter(cupo_total__isnull=False)
+    if partido_ids is not None:
+        partidos = partidos.filter(pk__in=list(partido_ids))
+    filas = partidos.annotate(
+        real=Greatest(F("cupo_total") - _asignado(), Value(0))
+    ).values_list("pk", "cupo_disponible", "real")
+    desvios = {
+        partido_id: (guardado, real)
+        for partido_id, guardado, real in filas
+        if guardado != real
+    }
+    if corregir:
+        ahora = timezone.now()
+        with transaction.atomic():
+            for partido_id, (_, real) in desvios.items():
+                Partido.objects.filter(pk=partido_id).update(
+                    cupo_disponible=real, updated_at=ahora
+                )
+        respuestas.invalidar(Partido._meta.label)
+    return desvios
+
+
+def recalcular_totales(
+    solicitud_ids: Iterable[int] | None = None, *, corregir: bool = True
+) -> dict[int, tuple[int, int]]:
+    """Compara ``SolicitudEntrada.total_asignado`` con la suma de asignaciones.
+
+    Devuelve ``{solicitud_id: (guardado, real)}`` de las desviadas y, con
+    ``corregir``, las actualiza.
+    """
+    solicitudes = SolicitudEntrada.objects.order_by()
+    if solicitud_ids is not None:
+        solicitudes = solicitudes.filter(pk__in=list(solicitud_ids))
+    filas = (
+        solicitudes.con_total_calculado()
+        .exclude(total_asignado=F("total_calculado"))
+        .values_list("pk", "total_asignado", "total_calculado")
+    )
+    desvios = {pk: (guardado, real) for pk, guardado, real in filas}
+    if corregir:
+        with transaction.atomic():
+            for pk, (_, real) in desvios.items():
+                SolicitudEntrada.objects.filter(pk=pk).update(
+                    total_asignado=real, updated_at=timezone.now()
+                )
+    return desvios
+
+
+@receiver(post_save, sender=AsignacionEntrada)
+def _asignacion_creada(sender, instance, created, **kwargs):
+    if created:
+        SolicitudEntrada.objects.filter(pk=instance.solicitud_id).update(
+            total_asignado=F("total_asignado") + instance.cantidad_asignada,
+            updated_at=timezone.now(),
+        )
+
+
+@receiver(post_delete, sender=AsignacionEntrada)
+def _asignacion_borrada(sender, instance, **kwargs):
+    SolicitudEntrada.objects.filter(pk=instance.solicitud_id).update(
+        total_asignado=Greatest(
+            F("total_asignado") - instance.cantidad_asignada, Value(0)
+        ),
+        updated_at=timezone.now(),
+    )
+    partido_id = (
+        SolicitudEntrada.objects.filter(pk=instance.solicitud_id)
+        .values_list("partido_id", flat=True)
+        .first()
+    )
+    if partido_id:
+        liberar(partido_id, instance.cantidad_asignada)
@@ -0,0 +1,171 @@
+"""Reparto automático del cupo de un partido entre sus solicitudes pendientes.
+
+El cálculo trabaja sobre tuplas ``(solicitud_id, cantidad)`` leídas con una
+única consulta y no toca la base: ``planificar`` devuelve el plan para
+previsualizarlo y ``aplicar`` lo confirma en bloque con
+``cupos.asignar_lote``. Los métodos disponibles son:
+
+- ``proporcional``: cada solicitud recibe una parte del cupo proporcional a lo
+  pedido; las unidades sobrantes del redondeo van a los mayores restos.
+- ``maxmin``: reparto max-min justo (*water filling*): nadie recibe más que
+  otro que pidió más, y las solicitudes chicas se cubren completas primero.
+
+Con ``prioridad_socios`` primero se reparte entre las solicitudes creadas por
+socios (``PerfilUsuario.es_socio``) y el sobrante entre el resto.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+
+from apps.entradas import cupos
+from apps.entradas.models import SolicitudEntrada
+from apps.partidos.models import Partido
+from django.db.models import F
+
+Demanda = tuple[int, int]
+
+
+def proporcional(demandas: Sequence[Demanda], cupo: int) -> dict[int, int]:
+    total = sum(cantidad for _, cantidad in demandas)
+    if total <= cupo:
+        return dict(demandas)
+    asignado = {}
+    restos = []
+    for indice, (solicitud_id, cantidad) in enumerate(demandas):
+        entero, resto = divmod(cantidad * cupo, total)
+        asignado[solicitud_id] = entero
+        # A igual resto gana la solicitud más antigua (menor índice).
+        restos.append((-resto, indice, solicitud_id))
+    sobrante = cupo - sum(asignado.values())
+    restos.sort()
+    for _, _, solicitud_id in restos[:sobrante]:
+        asignado[solicitud_id] += 1
+    return asignado
+
+
+def maxmin(demandas: Sequence[Demanda], cupo: int) -> dict[int, int]:
+    total = sum(cantidad for _, cantidad in demandas)
+    if total <= cupo:
+        return dict(demandas)
+    orden = sorted(range(len(demandas)), key=lambda indice: demandas[indice][1])
+    asignado = {}
+    restante = cupo
+    for posicion, indice in enumerate(orden):
+        solicitud_id, cantidad = demandas[indice]
+        pendientes = len(orden) - posicion
+        if cantidad * pendientes <= restante:
+            asignado[solicitud_id] = cantidad
+            restante -= cantidad
+            continue
+        # Desde acá nadie se cubre completo: todos reciben el mismo nivel y el
+        # resto de la división va, de a una, a las solicitudes más antiguas.
+        nivel, sobrante = divmod(restante, pendientes)
+        for indice in sorted(orden[posicion:]):
+            solicitud_id = demandas[indice][0]
+            asignado[solicitud_id] = nivel + (1 if sobrante else 0)
+            sobrante = max(0, sobrante - 1)
+        break
+    return asignado
+
+
+METODOS: dict[str, Callable[[Sequence[Demanda], int], dict[int, int]]] = {
+    "proporcional": proporcional,
+    "maxmin": maxmin,
+}
+
+
+@dataclass
+class Plan:
+    partido_id: int
+    metodo: str
+    cupo: int | None
+    asignaciones: dict[int, int] = field(default_factory=dict)
+    solicitudes: list[dict[str, object]] = field(default_factory=list)
+
+    @property
+    def total_solicitado(self) -> int:
+        return sum(fila["cantidad_solicitada"] for fila in self.solicitudes)
+
+    @property
+    def total_asignado(self) -> int:
+        return sum(self.asignaciones.values())
+
+
+def repartir(
+    socios: Sequence[Demanda],
+    resto: Sequence[Demanda],
+    cupo: int | None,
+    metodo: str = "maxmin",
+) -> dict[int, int]:
+    """Reparte ``cupo`` primero entre ``socios`` y el sobrante entre ``resto``."""
+    if cupo is None:
+        return {**dict(socios), **dict(resto)}
+    funcion = METODOS[metodo]
+    asignado = funcion(socios, cupo)
+    asignado.update(funcion(resto, cupo - sum(asignado.values())))
+    return asignado
+
+
+def planificar(
+    partido: Partido, metodo: str = "maxmin", *, prioridad_socios: bool = True
+) -> Plan:
+    """Calcula el reparto del cupo disponible sin escribir en la base."""
+    if metodo not in METODOS:
+        raise ValueError(f"Método de distribución desconocido: {metodo}")
+    filas = list(
+        SolicitudEntrada.objects.filter(
+            partido=partido, estado=SolicitudEntrada.Estados.PENDIENTE
+        )
+        .order_by("created_at", "id")
+        .values(
+            "id",
+            "filial_id",
+            "cantidad_solicitada",
+            socio=F("created_by__perfil__es_socio"),
+        )
+    )
+    for fila in filas:
+        fila["socio"] = bool(fila["socio"])
+    cupo = None
+    if partido.cupo_total is not None:
+        cupo = partido.cupo_disponible
+        if cupo is None:
+            cupo = partido.cupo_total
+    demandas = [(fila["id"], fila["cantidad_solicitada"]) for fila in filas]
+    if prioridad_socios:
+        socios = [d for d, fila in zip(demandas, filas) if fila["socio"]]
+        resto = [d for d, fila in zip(demandas, filas) if not fila["socio"]]
+    else:
+        socios, resto = [], demandas
+    asignado = repartir(socios, resto, cupo, metodo)
+    for fila in filas:
+        fila["cantidad_asignada"] = asignado.get(fila["id"], 0)
+    return Plan(
+        partido_id=partido.pk,
+        metodo=metodo,
+        cupo=cupo,
+        asignaciones={pk: cantidad for pk, cantidad in asignado.items() if cantidad},
+        solicitudes=filas,
+    )
+
+
+def aplicar(
+    plan: Plan, usuario, comentario: str = "", en_transaccion=None
+) -> cupos.ResultadoLote:
+    """Confirma ``plan`` en una transacción.
+
+    Las solicitudes que dejaron de estar pendientes o ya no entran en el cupo
+    se informan como errores del lote. ``en_transaccion`` se pasa a
+    ``cupos.asignar_lote``.
+    """
+    partido = Partido.objects.get(pk=plan.partido_id)
+    return cupos.asignar_lote(
+        partido,
+        list(plan.asignaciones.items()),
+        usuario,
+        comentario,
+        estados=[SolicitudEntrada.Estados.PENDIENTE],
+        en_transaccion=en_transaccion,
+    )
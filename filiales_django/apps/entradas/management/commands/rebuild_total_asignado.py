@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from apps.entradas.cupos import recalcular_totales
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Recalcula el total asignado de cada solicitud desde sus asignaciones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--solicitud",
+            type=int,
+            action="append",
+            dest="solicitudes",
+            help="Limita el proceso a la solicitud indicada (repetible).",
+        )
+        parser.add_argument(
+            "--verificar",
+            action="store_true",
+            help="Solo informa los totales desviados; falla si encuentra alguno.",
+        )
+
+    def handle(self, *args, **options):
+        verificar = options["verificar"]
+        desvios = recalcular_totales(options["solicitudes"], corregir=not verificar)
+        for solicitud_id, (guardado, real) in desvios.items():
+            self.stdout.write(
+                f"Solicitud {solicitud_id} - total_asignado: {guardado} != {real}"
+            )
+        if not verificar:
+            self.stdout.write(
+                self.style.SUCCESS(f"Totales corregidos: {len(desvios)} solicitudes")
+            )
+            return
+        if desvios:
+            raise CommandError(
+                f"{len(desvios)} solicitudes con total desviado; "
+                "ejecute rebuild_total_asignado para corregirlas."
+            )
+        self.stdout.write(self.style.SUCCESS("Totales sin desvíos"))
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from apps.entradas.cupos import reconciliar
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Recalcula el cupo disponible de los partidos desde las asignaciones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--partido",
+            type=int,
+            action="append",
+            dest="partidos",
+            help="Limita el proceso al partido indicado (repetible).",
+        )
+        parser.add_argument(
+            "--verificar",
+            action="store_true",
+            help="Solo informa los cupos desviados; falla si encuentra alguno.",
+        )
+
+    def handle(self, *args, **options):
+        verificar = options["verificar"]
+        desvios = reconciliar(options["partidos"], corregir=not verificar)
+        for partido_id, (guardado, real) in desvios.items():
+            self.stdout.write(
+                f"Partido {partido_id} - cupo_disponible: {guardado} != {real}"
+            )
+        if not verificar:
+            self.stdout.write(
+                self.style.SUCCESS(f"Cupos corregidos: {len(desvios)} partidos")
+            )
+            return
+        if desvios:
+            raise CommandError(
+                f"{len(desvios)} partidos con cupo desviado; "
+                "ejecute reconciliar_cupos para corregirlos."
+            )
+        self.stdout.write(self.style.SUCCESS("Cupos sin desvíos"))
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:35
+
+from django.db import migrations, models
+
+
+def poblar_total_asignado(apps, schema_editor):
+    SolicitudEntrada = apps.get_model("entradas", "SolicitudEntrada")
+    AsignacionEntrada = apps.get_model("entradas", "AsignacionEntrada")
+    asignado = (
+        AsignacionEntrada.objects.filter(solicitud=models.OuterRef("pk"))
+        .order_by()
+        .values("solicitud")
+        .annotate(total=models.Sum("cantidad_asignada"))
+        .values("total")
+    )
+    SolicitudEntrada.objects.filter(asignaciones__isnull=False).update(
+        total_asignado=models.Subquery(asignado)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("entradas", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="solicitudentrada",
+            name="total_asignado",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(poblar_total_asignado, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="solicitudentrada",
+            index=models.Index(
+                fields=["total_asignado"], name="solicitud_total_asig_idx"
+            ),
+        ),
+    ]
@@ -3,6 +3,24 @@ from __future__ import annotations
 from apps.core.models import TimeStampedModel
 from django.conf import settings
 from django.db import models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+class SolicitudEntradaQuerySet(models.QuerySet):
+    def con_total_calculado(self):
+        """Anota ``total_calculado`` sumando las asignaciones en la misma consulta.
+
+        Sirve para verificar el contador persistido ``total_asignado``.
+        """
+        asignado = (
+            AsignacionEntrada.objects.filter(solicitud=OuterRef("pk"))
+            .order_by()
+            .values("solicitud")
+            .annotate(total=Sum("cantidad_asignada"))
+            .values("total")
+        )
+        return self.annotate(total_calculado=Coalesce(Subquery(asignado), Value(0)))
 
 
 class SolicitudEntrada(TimeStampedModel):
@@ -24,12 +42,16 @@ class SolicitudEntrada(TimeStampedModel):
         max_length=20, choices=Estados.choices, default=Estados.PENDIENTE, db_index=True
     )
     observaciones = models.TextField(blank=True)
+    # Mantenido por ``apps.entradas.cupos`` al crear o borrar asignaciones.
+    total_asignado = models.PositiveIntegerField(default=0, editable=False)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.PROTECT,
         related_name="solicitudes_entradas",
     )
 
+    objects = SolicitudEntradaQuerySet.as_manager()
+
     class Meta:
         ordering = ("-created_at",)
         indexes = [
@@ -38,15 +60,12 @@ class SolicitudEntrada(TimeStampedModel):
             models.Index(
                 fields=("filial", "partido"), name="solicitud_filial_partido_idx"
             ),
+            models.Index(fields=("total_asignado",), name="solicitud_total_asig_idx"),
         ]
 
     def __str__(self) -> str:
         return f"Solicitud {self.pk} - {self.filial}"
 
-    @property
-    def total_asignado(self) -> int:
-        return sum(self.asignaciones.values_list("cantidad_asignada", flat=True))
-
 
 class AsignacionEntrada(TimeStampedModel):
     solicitud = models.ForeignKey(
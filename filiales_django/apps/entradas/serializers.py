@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+from apps.core.referencias import ReferenciaField
 from apps.entradas.models import AsignacionEntrada, SolicitudEntrada
 from apps.filiales.models import Filial
 from apps.partidos.models import Partido
 from rest_framework import serializers
 
+MAX_ASIGNACIONES_LOTE = 1000
+
 
 class SolicitudEntradaSerializer(serializers.ModelSerializer):
-    filial = serializers.PrimaryKeyRelatedField(queryset=Filial.objects.all(), required=False)
+    filial = ReferenciaField(Filial, required=False)
+    partido = ReferenciaField(Partido)
     filial_nombre = serializers.CharField(source="filial.nombre", read_only=True)
     partido_titulo = serializers.CharField(source="partido.titulo", read_only=True)
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -25,12 +29,19 @@ class SolicitudEntradaSerializer(serializers.ModelSerializer):
             "motivo",
             "estado",
             "observaciones",
+            "total_asignado",
             "created_by",
             "created_by_nombre",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["estado", "created_by", "created_at", "updated_at"]
+        read_only_fields = [
+            "estado",
+            "total_asignado",
+            "created_by",
+            "created_at",
+            "updated_at",
+        ]
 
     def get_created_by_nombre(self, obj):
         if not obj.created_by:
@@ -72,3 +83,30 @@ class AsignacionEntradaSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["asignado_por", "created_at", "updated_at"]
+
+
+class AsignacionLoteItemSerializer(serializers.Serializer):
+    solicitud = serializers.IntegerField()
+    cantidad = serializers.IntegerField(min_value=1)
+
+
+class AsignacionLoteSerializer(serializers.Serializer):
+    asignaciones = AsignacionLoteItemSerializer(many=True, allow_empty=False)
+    comentario = serializers.CharField(required=False, allow_blank=True, default="")
+    parcial = serializers.BooleanField(required=False, default=True)
+
+    def validate_asignaciones(self, value):
+        if len(value) > MAX_ASIGNACIONES_LOTE:
+            raise serializers.ValidationError(
+                f"El lote no puede superar {MAX_ASIGNACIONES_LOTE} asignaciones."
+            )
+        return value
+
+
+class DistribucionSerializer(serializers.Serializer):
+    metodo = serializers.ChoiceField(
+        choices=["maxmin", "proporcional"], required=False, default="maxmin"
+    )
+    prioridad_socios = serializers.BooleanField(required=False, default=True)
+    confirmar = serializers.BooleanField(required=False, default=False)
+    comentario = serializers.CharField(required=False, allow_blank=True, default="")
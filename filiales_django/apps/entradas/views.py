@@ -6,12 +6,12 @@ from apps.core.mixins import FilialScopedQuerysetMixin
 from apps.core.permissions import IsAdminAllAccess
 from apps.core.services import dispatch_webhook, send_notification_email
 from apps.core.viewsets import BaseModelViewSet
+from apps.entradas import cupos
 from apps.entradas.models import AsignacionEntrada, SolicitudEntrada
 from apps.entradas.serializers import (
     AsignacionEntradaSerializer,
     SolicitudEntradaSerializer,
 )
-from django.db.models import Sum
 from rest_framework import decorators, exceptions, response, status
 from rest_framework.permissions import IsAuthenticated
 
@@ -27,9 +27,18 @@ class SolicitudEntradaViewSet(FilialScopedQuerysetMixin, BaseModelViewSet):
         "estado": ["exact"],
         "created_at": ["date", "date__gte", "date__lte"],
         "filial": ["exact"],
+        "total_asignado": ["exact", "gte", "lte"],
     }
     search_fields = ["motivo", "observaciones", "partido__titulo", "filial__nombre"]
-    ordering_fields = ["created_at", "estado", "cantidad_solicitada"]
+    full_text_search = True
+    ordering_fields = [
+        "created_at",
+        "estado",
+        "cantidad_solicitada",
+        "total_asignado",
+    ]
+    query_budget = {"list": 5, "retrieve": 4}
+    conditional_related = ("filial", "partido")
 
     def get_serializer_save_kwargs(self, *, action: str):
         kwargs = super().get_serializer_save_kwargs(action=action)
@@ -42,24 +51,6 @@ class SolicitudEntradaViewSet(FilialScopedQuerysetMixin, BaseModelViewSet):
                     kwargs["filial_id"] = filial_id
         return kwargs
 
-    def _validate_cupo(
-        self, solicitud: SolicitudEntrada, cantidad_asignada: int
-    ) -> None:
-        partido = solicitud.partido
-        if partido.cupo_total is None:
-            return
-        total_asignado = (
-            AsignacionEntrada.objects.filter(solicitud__partido=partido)
-            .aggregate(total=Sum("cantidad_asignada"))
-            .get("total")
-            or 0
-        )
-        disponible = partido.cupo_total - total_asignado
-        if cantidad_asignada > disponible:
-            raise exceptions.ValidationError(
-                "No hay cupos suficientes para aprobar la solicitud."
-            )
-
     @decorators.action(
         detail=True,
         methods=["post", "patch"],
@@ -82,21 +73,10 @@ class SolicitudEntradaViewSet(FilialScopedQuerysetMixin, BaseModelViewSet):
             raise exceptions.ValidationError(
                 "No se puede asignar más de lo solicitado."
             )
-        self._validate_cupo(solicitud, cantidad_asignada)
-        asignacion = AsignacionEntrada.objects.create(
-            solicitud=solicitud,
-            cantidad_asignada=cantidad_asignada,
-            asignado_por=request.user,
+        asignacion = cupos.asignar(
+            solicitud, cantidad_asignada, request.user, comentario
         )
-        partido = solicitud.partido
-        if partido.cupo_total is not None:
-            partido.actualizar_cupo_disponible(cantidad_asignada)
-        if cantidad_asignada < solicitud.cantidad_solicitada:
-            solicitud.estado = SolicitudEntrada.Estados.PARCIAL
-        else:
-            solicitud.estado = SolicitudEntrada.Estados.APROBADA
-        solicitud.observaciones = comentario or solicitud.observaciones
-        solicitud.save(update_fields=["estado", "observaciones", "updated_at"])
+        solicitud = asignacion.solicitud
         self.log_action(
             solicitud,
             Accion.Tipos.APROBAR,
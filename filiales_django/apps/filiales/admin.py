@@ -1,5 +1,8 @@
+from apps.core import referencias, respuestas
+from apps.core.dashboard import invalidar_resumen
 from apps.filiales.models import Autoridad, Filial
 from django.contrib import admin
+from django.utils import timezone
 
 
 @admin.register(Filial)
@@ -11,11 +14,19 @@ class FilialAdmin(admin.ModelAdmin):
 
     @admin.action(description="Habilitar filiales seleccionadas")
     def habilitar(self, request, queryset):
-        queryset.update(activa=True)
+        queryset.update(activa=True, updated_at=timezone.now())
+        ids = list(queryset.values_list("id", flat=True))
+        invalidar_resumen(ids)
+        referencias.invalidar(Filial, ids)
+        respuestas.invalidar(Filial._meta.label)
 
     @admin.action(description="Deshabilitar filiales seleccionadas")
     def deshabilitar(self, request, queryset):
-        queryset.update(activa=False)
+        queryset.update(activa=False, updated_at=timezone.now())
+        ids = list(queryset.values_list("id", flat=True))
+        invalidar_resumen(ids)
+        referencias.invalidar(Filial, ids)
+        respuestas.invalidar(Filial._meta.label)
 
 
 @admin.register(Autoridad)
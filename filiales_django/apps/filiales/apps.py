@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FilialesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.filiales"
+
+    def ready(self):
+        from apps.filiales import estadisticas  # noqa: F401
@@ -0,0 +1,195 @@
+"""Mantenimiento incremental de ``FilialEstadisticas``.
+
+Cada instancia seguida recuerda al cargarse a qué contador aporta (filial y
+columna); al guardarla o borrarla se ajustan solo los contadores que cambian
+con un ``UPDATE ... SET col = col + n`` en la misma transacción.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from apps.filiales.models import Filial, FilialEstadisticas
+from django.apps import apps
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+PREFIJOS = {
+    "acciones.AccionSolidaria": "acciones",
+    "entradas.SolicitudEntrada": "solicitudes",
+    "pedidos.Pedido": "pedidos",
+}
+AUTORIDADES = "filiales.Autoridad"
+CAMPOS = [
+    field.name
+    for field in FilialEstadisticas._meta.concrete_fields
+    if field.name not in ("filial", "updated_at")
+]
+
+
+def _columna(instance) -> str | None:
+    valores = instance.__dict__
+    if instance._meta.label == AUTORIDADES:
+        return "autoridades_activas" if valores.get("activo") else None
+    estado = valores.get("estado")
+    if not estado:
+        return None
+    return f"{PREFIJOS[instance._meta.label]}_{estado.lower()}"
+
+
+def _clave(instance) -> tuple[int | None, str | None] | None:
+    # Solo se leen valores ya cargados: nunca se dispara una consulta extra.
+    campo = "activo" if instance._meta.label == AUTORIDADES else "estado"
+    if "filial_id" not in instance.__dict__ or campo not in instance.__dict__:
+        return None
+    return instance.__dict__["filial_id"], _columna(instance)
+
+
+def ajustar(filial_id: int | None, **deltas: int) -> None:
+    """Suma ``deltas`` a los contadores de una filial."""
+    deltas = {campo: delta for campo, delta in deltas.items() if delta}
+    if not filial_id or not deltas:
+        return
+    actualizadas = FilialEstadisticas.objects.filter(filial_id=filial_id).update(
+        updated_at=timezone.now(),
+        **{campo: F(campo) + delta for campo, delta in deltas.items()},
+    )
+    if not actualizadas and any(delta > 0 for delta in deltas.values()):
+        # La filial todavía no tiene fila: se calcula completa, ya incluye el cambio.
+        recalcular([filial_id])
+
+
+def _aplicar(anterior, nueva) -> None:
+    deltas: dict[int, Counter] = defaultdict(Counter)
+    if anterior and anterior[1]:
+        deltas[anterior[0]][anterior[1]] -= 1
+    if nueva and nueva[1]:
+        deltas[nueva[0]][nueva[1]] += 1
+    for filial_id, cambios in deltas.items():
+        ajustar(filial_id, **cambios)
+
+
+def calcular(filial_ids: Iterable[int] | None = None) -> dict[int, dict[str, int]]:
+    """Cuenta desde las tablas de origen los valores esperados por filial."""
+    filiales = Filial.objects.order_by()
+    if filial_ids is not None:
+        filial_ids = list(filial_ids)
+        filiales = filiales.filter(id__in=filial_ids)
+    valores = {
+        filial_id: dict.fromkeys(CAMPOS, 0)
+        for filial_id in filiales.values_list("id", flat=True)
+    }
+
+    def _filtrar(queryset):
+        if filial_ids is not None:
+            return queryset.filter(filial_id__in=filial_ids)
+        return queryset
+
+    for label, prefijo in PREFIJOS.items():
+        model = apps.get_model(label)
+        filas = _filtrar(model.objects.order_by()).values("filial_id", "estado")
+        for fila in filas.annotate(total=Count("pk")):
+            campo = f"{prefijo}_{fila['estado'].lower()}"
+            if fila["filial_id"] in valores and campo in CAMPOS:
+                valores[fila["filial_id"]][campo] = fila["total"]
+    autoridades = _filtrar(
+        apps.get_model(AUTORIDADES).objects.order_by().filter(activo=True)
+    )
+    for fila in autoridades.values("filial_id").annotate(total=Count("pk")):
+        if fila["filial_id"] in valores:
+            valores[fila["filial_id"]]["autoridades_activas"] = fila["total"]
+    return valores
+
+
+def recalcular(filial_ids: Iterable[int] | None = None) -> int:
+    """Reescribe las estadísticas desde cero; devuelve las filiales procesadas."""
+    valores = calcular(filial_ids)
+    existentes = FilialEstadisticas.objects.in_bulk(list(valores))
+    nuevas = []
+    ahora = timezone.now()
+    for filial_id, contadores in valores.items():
+        estadisticas = existentes.get(filial_id)
+        if estadisticas is None:
+            nuevas.append(FilialEstadisticas(filial_id=filial_id, **contadores))
+            continue
+        for campo, total in contadores.items():
+            setattr(estadisticas, campo, total)
+        estadisticas.updated_at = ahora
+    FilialEstadisticas.objects.bulk_create(nuevas, ignore_conflicts=True)
+    FilialEstadisticas.objects.bulk_update(
+        list(existentes.values()), [*CAMPOS, "updated_at"]
+    )
+    return len(valores)
+
+
+def verificar(
+    filial_ids: Iterable[int] | None = None,
+) -> dict[int, dict[str, tuple[int, int]]]:
+    """Devuelve ``{filial_id: {campo: (guardado, real)}}`` de los contadores desviados."""
+    valores = calcular(filial_ids)
+    existentes = FilialEstadisticas.objects.in_bulk(list(valores))
+    desvios: dict[int, dict[str, tuple[int, int]]] = {}
+    for filial_id, contadores in valores.items():
+        estadisticas = existentes.get(filial_id)
+        diferencias = {
+            campo: (getattr(estadisticas, campo) if estadisticas else 0, total)
+            for campo, total in contadores.items()
+            if estadisticas is None or getattr(estadisticas, campo) != total
+        }
+        if diferencias:
+            desvios[filial_id] = diferencias
+    return desvios
+
+
+def totales_por_estado(prefijo: str, filial_id: int | None = None) -> dict[str, int]:
+    """Totales ``{estado: n}`` de un grupo, ordenados de mayor a menor y sin ceros."""
+    campos = [campo for campo in CAMPOS if campo.startswith(f"{prefijo}_")]
+    queryset = FilialEstadisticas.objects.all()
+    if filial_id:
+        queryset = queryset.filter(filial_id=filial_id)
+    totales = queryset.aggregate(**{campo: Sum(campo) for campo in campos})
+    resultado = {
+        campo[len(prefijo) + 1 :]: total for campo, total in totales.items() if total
+    }
+    return dict(sorted(resultado.items(), key=lambda item: -item[1]))
+
+
+def _al_iniciar(sender, instance, **kwargs):
+    instance._estadisticas_original = _clave(instance) if instance.pk else None
+
+
+def _al_guardar(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    nueva = _clave(instance)
+    anterior = None if created else getattr(instance, "_estadisticas_original", None)
+    if created or (anterior is not None and nueva is not None):
+        _aplicar(anterior, nueva)
+    instance._estadisticas_original = nueva
+
+
+def _al_borrar(sender, instance, **kwargs):
+    _aplicar(
+        getattr(instance, "_estadisticas_original", None) or _clave(instance), None
+    )
+
+
+for _label in (*PREFIJOS, AUTORIDADES):
+    post_init.connect(
+        _al_iniciar, sender=_label, dispatch_uid=f"estadisticas_init_{_label}"
+    )
+    post_save.connect(
+        _al_guardar, sender=_label, dispatch_uid=f"estadisticas_save_{_label}"
+    )
+    post_delete.connect(
+        _al_borrar, sender=_label, dispatch_uid=f"estadisticas_delete_{_label}"
+    )
+
+
+@receiver(post_save, sender=Filial, dispatch_uid="estadisticas_filial_creada")
+def _crear_estadisticas(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        FilialEstadisticas.objects.get_or_create(filial=instance)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from apps.filiales.estadisticas import recalcular, verificar
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Recalcula desde cero las estadísticas por filial o verifica sus desvíos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--filial",
+            type=int,
+            action="append",
+            dest="filiales",
+            help="Limita el proceso a la filial indicada (repetible).",
+        )
+        parser.add_argument(
+            "--verificar",
+            action="store_true",
+            help="Solo informa los contadores desviados; falla si encuentra alguno.",
+        )
+
+    def handle(self, *args, **options):
+        filiales = options["filiales"]
+        if not options["verificar"]:
+            total = recalcular(filiales)
+            self.stdout.write(
+                self.style.SUCCESS(f"Estadísticas recalculadas: {total} filiales")
+            )
+            return
+        desvios = verificar(filiales)
+        for filial_id, diferencias in desvios.items():
+            detalle = ", ".join(
+                f"{campo}: {guardado} != {real}"
+                for campo, (guardado, real) in diferencias.items()
+            )
+            self.stdout.write(f"Filial {filial_id} - {detalle}")
+        if desvios:
+            raise CommandError(
+                f"{len(desvios)} filiales con estadísticas desviadas; "
+                "ejecute rebuild_estadisticas para corregirlas."
+            )
+        self.stdout.write(self.style.SUCCESS("Estadísticas sin desvíos"))
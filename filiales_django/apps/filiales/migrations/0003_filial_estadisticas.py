@@ -0,0 +1,82 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def poblar_estadisticas(apps, schema_editor):
+    Filial = apps.get_model("filiales", "Filial")
+    FilialEstadisticas = apps.get_model("filiales", "FilialEstadisticas")
+    fuentes = [
+        (apps.get_model("acciones", "AccionSolidaria"), "acciones"),
+        (apps.get_model("entradas", "SolicitudEntrada"), "solicitudes"),
+        (apps.get_model("pedidos", "Pedido"), "pedidos"),
+    ]
+    campos = {field.name for field in FilialEstadisticas._meta.concrete_fields}
+    valores = {
+        filial_id: {} for filial_id in Filial.objects.values_list("id", flat=True)
+    }
+    for model, prefijo in fuentes:
+        filas = model.objects.order_by().values("filial_id", "estado")
+        for fila in filas.annotate(total=models.Count("pk")):
+            campo = f"{prefijo}_{fila['estado'].lower()}"
+            if campo in campos:
+                valores[fila["filial_id"]][campo] = fila["total"]
+    Autoridad = apps.get_model("filiales", "Autoridad")
+    activas = Autoridad.objects.order_by().filter(activo=True).values("filial_id")
+    for fila in activas.annotate(total=models.Count("pk")):
+        valores[fila["filial_id"]]["autoridades_activas"] = fila["total"]
+    FilialEstadisticas.objects.bulk_create(
+        [
+            FilialEstadisticas(filial_id=filial_id, **contadores)
+            for filial_id, contadores in valores.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("filiales", "0002_add_socio_fields"),
+        ("acciones", "0001_initial"),
+        ("entradas", "0001_initial"),
+        ("pedidos", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FilialEstadisticas",
+            fields=[
+                (
+                    "filial",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="estadisticas",
+                        serialize=False,
+                        to="filiales.filial",
+                    ),
+                ),
+                ("acciones_programada", models.IntegerField(default=0)),
+                ("acciones_en_curso", models.IntegerField(default=0)),
+                ("acciones_finalizada", models.IntegerField(default=0)),
+                ("solicitudes_pendiente", models.IntegerField(default=0)),
+                ("solicitudes_aprobada", models.IntegerField(default=0)),
+                ("solicitudes_rechazada", models.IntegerField(default=0)),
+                ("solicitudes_parcial", models.IntegerField(default=0)),
+                ("pedidos_pendiente", models.IntegerField(default=0)),
+                ("pedidos_aprobado", models.IntegerField(default=0)),
+                ("pedidos_rechazado", models.IntegerField(default=0)),
+                ("pedidos_entregado", models.IntegerField(default=0)),
+                ("pedidos_cancelado", models.IntegerField(default=0)),
+                ("autoridades_activas", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Estadísticas de filial",
+                "verbose_name_plural": "Estadísticas de filiales",
+            },
+        ),
+        migrations.RunPython(poblar_estadisticas, migrations.RunPython.noop),
+    ]
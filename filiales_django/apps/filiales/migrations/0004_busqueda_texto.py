@@ -0,0 +1,40 @@
+from django.db import migrations
+
+TABLA = "filiales_autoridad"
+
+CREAR = f"""
+ALTER TABLE {TABLA} ADD COLUMN busqueda tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('es_unaccent', coalesce(persona_nombre, '')), 'A')
+    || setweight(to_tsvector('es_unaccent', coalesce(persona_documento, '')), 'A')
+    || setweight(to_tsvector('es_unaccent', coalesce(email, '')), 'B')
+) STORED;
+CREATE INDEX {TABLA}_busqueda_gin ON {TABLA} USING gin (busqueda);
+"""
+
+BORRAR = f"""
+DROP INDEX IF EXISTS {TABLA}_busqueda_gin;
+ALTER TABLE {TABLA} DROP COLUMN IF EXISTS busqueda;
+"""
+
+
+def crear_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREAR)
+
+
+def borrar_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(BORRAR)
+
+
+class Migration(migrations.Migration):
+    """Columna tsvector de búsqueda con índice GIN (solo PostgreSQL)."""
+
+    dependencies = [
+        ("core", "0003_busqueda_configuracion"),
+        ("filiales", "0003_filial_estadisticas"),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_busqueda, borrar_busqueda),
+    ]
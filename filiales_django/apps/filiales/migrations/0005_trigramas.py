@@ -0,0 +1,49 @@
+from django.db import migrations
+
+INDICES = {
+    "filial_nombre_trgm": ("filiales_filial", "nombre"),
+    "filial_ciudad_trgm": ("filiales_filial", "ciudad"),
+    "autoridad_nombre_trgm": ("filiales_autoridad", "persona_nombre"),
+    "autoridad_documento_trgm": ("filiales_autoridad", "persona_documento"),
+}
+
+
+# ``unaccent`` no es IMMUTABLE: el envoltorio permite usarlo en índices.
+FUNCION = """
+CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent', $1) $$;
+"""
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    schema_editor.execute(FUNCION)
+    for nombre, (tabla, columna) in INDICES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} "
+            f"USING gin (f_unaccent(lower({columna})) gin_trgm_ops);"
+        )
+
+
+def borrar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for nombre in INDICES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {nombre};")
+    schema_editor.execute("DROP FUNCTION IF EXISTS f_unaccent(text);")
+
+
+class Migration(migrations.Migration):
+    """Índices de trigramas para la búsqueda difusa (solo PostgreSQL)."""
+
+    dependencies = [
+        ("core", "0003_busqueda_configuracion"),
+        ("filiales", "0004_busqueda_texto"),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, borrar_indices),
+    ]
@@ -59,3 +59,48 @@ class Autoridad(TimeStampedModel):
 
     def __str__(self) -> str:
         return f"{self.persona_nombre} - {self.get_cargo_display()}"
+
+
+class FilialEstadisticas(models.Model):
+    """Contadores por estado de cada filial, mantenidos de forma incremental.
+
+    Se actualizan desde ``apps.filiales.estadisticas``; ``manage.py
+    rebuild_estadisticas`` los recalcula desde cero y detecta desvíos.
+    """
+
+    filial = models.OneToOneField(
+        Filial,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="estadisticas",
+    )
+    acciones_programada = models.IntegerField(default=0)
+    acciones_en_curso = models.IntegerField(default=0)
+    acciones_finalizada = models.IntegerField(default=0)
+    solicitudes_pendiente = models.IntegerField(default=0)
+    solicitudes_aprobada = models.IntegerField(default=0)
+    solicitudes_rechazada = models.IntegerField(default=0)
+    solicitudes_parcial = models.IntegerField(default=0)
+    pedidos_pendiente = models.IntegerField(default=0)
+    pedidos_aprobado = models.IntegerField(default=0)
+    pedidos_rechazado = models.IntegerField(default=0)
+    pedidos_entregado = models.IntegerField(default=0)
+    pedidos_cancelado = models.IntegerField(default=0)
+    autoridades_activas = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Estadísticas de filial"
+        verbose_name_plural = "Estadísticas de filiales"
+
+    def __str__(self) -> str:
+        return f"Estadísticas de {self.filial_id}"
+
+    def por_estado(self, prefijo: str) -> dict[str, int]:
+        """Devuelve ``{estado_en_minusculas: total}`` para un grupo de contadores."""
+        inicio = f"{prefijo}_"
+        return {
+            field.name[len(inicio) :]: getattr(self, field.name)
+            for field in self._meta.concrete_fields
+            if field.name.startswith(inicio)
+        }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from apps.core.referencias import ReferenciaField
 from apps.filiales.models import Autoridad, Filial
 from rest_framework import serializers
 
@@ -28,6 +29,7 @@ class FilialSerializer(serializers.ModelSerializer):
 
 
 class AutoridadSerializer(serializers.ModelSerializer):
+    filial = ReferenciaField(Filial)
     estado = serializers.SerializerMethodField()
 
     class Meta:
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from apps.auditoria.models import Accion
-from apps.core.mixins import FilialScopedQuerysetMixin
+from apps.core import condicional, referencias
+from apps.core.dashboard import invalidar_resumen
+from apps.core.mixins import BusquedaDifusaMixin, FilialScopedQuerysetMixin
 from apps.core.permissions import IsAdminAllAccess, RoleBasedPermission
+from apps.core.respuestas import cachear_respuesta
 from apps.core.services import dispatch_webhook, send_notification_email
 from apps.core.viewsets import BaseModelViewSet
+from apps.filiales import estadisticas
 from apps.filiales.models import Autoridad, Filial
 from apps.filiales.serializers import AutoridadSerializer, FilialSerializer
 from django.db.models import Count, Q
@@ -18,16 +22,20 @@ class FilialMapaView(APIView):
     """Devuelve las filiales activas para el mapa."""
     permission_classes = [permissions.IsAuthenticated]
 
+    @cachear_respuesta("filiales.Filial")
     def get(self, request):
-        queryset = Filial.objects.filter(activa=True)
+        filiales = referencias.filiales_activas()
         perfil = getattr(request.user, "perfil", None)
         if perfil and perfil.es_usuario_filial and perfil.filial_id:
-            queryset = queryset.filter(id=perfil.filial_id)
-        serializer = FilialSerializer(queryset, many=True)
-        return response.Response(serializer.data)
+            filiales = [fila for fila in filiales if fila["id"] == perfil.filial_id]
+        return condicional.responder(
+            request,
+            condicional.firma_de_datos(filiales),
+            lambda: response.Response(filiales),
+        )
 
 
-class FilialViewSet(BaseModelViewSet):
+class FilialViewSet(BusquedaDifusaMixin, BaseModelViewSet):
     queryset = Filial.objects.all()
     serializer_class = FilialSerializer
     filterset_fields = {
@@ -37,6 +45,7 @@ class FilialViewSet(BaseModelViewSet):
         "provincia": ["exact"],
     }
     search_fields = ["nombre", "codigo", "ciudad", "provincia"]
+    fuzzy_search_fields = ("nombre", "ciudad")
     ordering_fields = ["nombre", "codigo", "ciudad", "provincia", "created_at"]
     allow_filial_user_writes = False
 
@@ -122,7 +131,11 @@ class FilialViewSet(BaseModelViewSet):
         if not isinstance(autoridades_data, list):
             raise exceptions.ValidationError("Se espera una lista de autoridades")
         hoy = timezone.now().date()
-        filial.autoridades.filter(activo=True).update(activo=False, hasta=hoy)
+        desactivadas = filial.autoridades.filter(activo=True).update(
+            activo=False, hasta=hoy
+        )
+        estadisticas.ajustar(filial.id, autoridades_activas=-desactivadas)
+        invalidar_resumen([filial.id])
         nuevas = []
         for autoridad in autoridades_data:
             autoridad_payload = {
@@ -156,7 +169,9 @@ class FilialViewSet(BaseModelViewSet):
         return response.Response(nuevas, status=status.HTTP_200_OK)
 
 
-class AutoridadViewSet(FilialScopedQuerysetMixin, BaseModelViewSet):
+class AutoridadViewSet(
+    BusquedaDifusaMixin, FilialScopedQuerysetMixin, BaseModelViewSet
+):
     queryset = Autoridad.objects.select_related("filial")
     serializer_class = AutoridadSerializer
     filterset_fields = {
@@ -165,6 +180,8 @@ class AutoridadViewSet(FilialScopedQuerysetMixin, BaseModelViewSet):
         "cargo": ["exact"],
     }
     search_fields = ["persona_nombre", "persona_documento", "email"]
+    full_text_search = True
+    fuzzy_search_fields = ("persona_nombre", "persona_documento")
     ordering_fields = ["persona_nombre", "cargo", "desde"]
     scope_field = "filial"
     permission_classes = [IsAuthenticated, RoleBasedPermission]
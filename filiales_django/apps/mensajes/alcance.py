@@ -0,0 +1,76 @@
+"""Qué conversaciones y mensajes ve cada usuario.
+
+Administradores y coordinadores ven todo; los usuarios de filial, las
+conversaciones globales y las de su filial. Lo usan los viewsets y el stream
+de ``apps.mensajes.tiempo_real``, que traduce las mismas reglas a canales.
+"""
+
+from __future__ import annotations
+
+from apps.mensajes.models import Conversacion
+from django.db.models import Q
+
+TODOS = "mensajes:todos"
+GLOBAL = "mensajes:global"
+
+
+def canal_filial(filial_id: int) -> str:
+    return f"mensajes:filial:{filial_id}"
+
+
+def _ve_todo(perfil) -> bool:
+    return perfil.es_admin or perfil.es_coordinador
+
+
+def _de_filial(perfil) -> bool:
+    return perfil.es_usuario_filial and bool(perfil.filial_id)
+
+
+def _global_o_filial(perfil, prefijo: str = "") -> Q:
+    return Q(**{f"{prefijo}visibilidad": Conversacion.Visibilidad.GLOBAL}) | Q(
+        **{f"{prefijo}filial_id": perfil.filial_id}
+    )
+
+
+def conversaciones_visibles(queryset, user):
+    perfil = getattr(user, "perfil", None)
+    if not perfil:
+        return queryset.none()
+    if _ve_todo(perfil):
+        return queryset
+    if _de_filial(perfil):
+        return queryset.filter(_global_o_filial(perfil))
+    return queryset.filter(visibilidad=Conversacion.Visibilidad.GLOBAL)
+
+
+def mensajes_visibles(queryset, user):
+    perfil = getattr(user, "perfil", None)
+    if not perfil:
+        return queryset.none()
+    if _ve_todo(perfil):
+        return queryset
+    if _de_filial(perfil):
+        return queryset.filter(_global_o_filial(perfil, "conversacion__"))
+    return queryset.none()
+
+
+def canales(user) -> list[str]:
+    """Canales de eventos que corresponden a lo que ``user`` puede ver."""
+    perfil = getattr(user, "perfil", None)
+    if not perfil:
+        return []
+    if _ve_todo(perfil):
+        return [TODOS]
+    if _de_filial(perfil):
+        return [GLOBAL, canal_filial(perfil.filial_id)]
+    return []
+
+
+def canales_de(conversacion) -> list[str]:
+    """Canales en los que se publican los eventos de ``conversacion``."""
+    destino = [TODOS]
+    if conversacion.visibilidad == Conversacion.Visibilidad.GLOBAL:
+        destino.append(GLOBAL)
+    elif conversacion.filial_id:
+        destino.append(canal_filial(conversacion.filial_id))
+    return destino
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MensajesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.mensajes"
+
+    def ready(self):
+        from apps.mensajes import resumen, tiempo_real  # noqa: F401
@@ -0,0 +1,53 @@
+"""Cursores de lectura por usuario y conversación.
+
+En lugar de registrar cada par mensaje-lector, ``LecturaConversacion`` guarda
+el id del último mensaje que el usuario leyó en cada conversación. Un mensaje
+está leído si su id no supera ese cursor o si lo envió el propio usuario, así
+que el tamaño de los listados y el costo de contar no leídos no dependen de
+cuántos lectores tenga cada mensaje. El cursor solo avanza.
+"""
+
+from __future__ import annotations
+
+from apps.mensajes.models import LecturaConversacion, Mensaje
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def marcar_leido_hasta(usuario, mensaje) -> int:
+    """Avanza el cursor de ``usuario`` hasta ``mensaje`` y lo devuelve."""
+    lectura, creada = LecturaConversacion.objects.get_or_create(
+        usuario_id=usuario.pk,
+        conversacion_id=mensaje.conversacion_id,
+        defaults={"ultimo_leido": mensaje.pk},
+    )
+    if creada or lectura.ultimo_leido >= mensaje.pk:
+        return lectura.ultimo_leido
+    # El filtro evita retroceder el cursor si otro request lo movió antes.
+    LecturaConversacion.objects.filter(
+        pk=lectura.pk, ultimo_leido__lt=mensaje.pk
+    ).update(ultimo_leido=mensaje.pk, updated_at=timezone.now())
+    return mensaje.pk
+
+
+def no_leidos(usuario, conversaciones) -> dict[int, int]:
+    """Mensajes sin leer de ``usuario`` por conversación, en una consulta.
+
+    ``conversaciones`` es el queryset de conversaciones visibles; se usa como
+    subconsulta. Las conversaciones sin pendientes no aparecen.
+    """
+    cursor = LecturaConversacion.objects.filter(
+        usuario_id=usuario.pk, conversacion=OuterRef("conversacion")
+    ).values("ultimo_leido")[:1]
+    filas = (
+        Mensaje.objects.filter(conversacion__in=conversaciones.values("pk"))
+        .exclude(emisor_id=usuario.pk)
+        .alias(cursor=Coalesce(Subquery(cursor), Value(0)))
+        .filter(pk__gt=F("cursor"))
+        .order_by()
+        .values("conversacion_id")
+        .annotate(total=Count("pk"))
+        .values_list("conversacion_id", "total")
+    )
+    return dict(filas)
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mensajes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="mensaje",
+            index=models.Index(
+                fields=["conversacion", "created_at", "id"],
+                name="mensaje_conv_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mensaje",
+            index=models.Index(
+                fields=["created_at", "id"], name="mensaje_created_id_idx"
+            ),
+        ),
+    ]
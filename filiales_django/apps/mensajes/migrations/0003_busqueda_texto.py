@@ -0,0 +1,38 @@
+from django.db import migrations
+
+TABLA = "mensajes_mensaje"
+
+CREAR = f"""
+ALTER TABLE {TABLA} ADD COLUMN busqueda tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('es_unaccent', coalesce(texto, '')), 'A')
+) STORED;
+CREATE INDEX {TABLA}_busqueda_gin ON {TABLA} USING gin (busqueda);
+"""
+
+BORRAR = f"""
+DROP INDEX IF EXISTS {TABLA}_busqueda_gin;
+ALTER TABLE {TABLA} DROP COLUMN IF EXISTS busqueda;
+"""
+
+
+def crear_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREAR)
+
+
+def borrar_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(BORRAR)
+
+
+class Migration(migrations.Migration):
+    """Columna tsvector de búsqueda con índice GIN (solo PostgreSQL)."""
+
+    dependencies = [
+        ("core", "0003_busqueda_configuracion"),
+        ("mensajes", "0002_indices_paginacion_cursor"),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_busqueda, borrar_busqueda),
+    ]
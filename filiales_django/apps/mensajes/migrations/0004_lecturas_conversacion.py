@@ -0,0 +1,91 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def copiar_lecturas(apps, schema_editor):
+    """Convierte las marcas de ``leido_por`` en cursores por conversación."""
+    Mensaje = apps.get_model("mensajes", "Mensaje")
+    LecturaConversacion = apps.get_model("mensajes", "LecturaConversacion")
+    filas = (
+        Mensaje.leido_por.through.objects.values("user_id", "mensaje__conversacion_id")
+        .annotate(ultimo=Max("mensaje_id"))
+        .order_by()
+    )
+    LecturaConversacion.objects.bulk_create(
+        LecturaConversacion(
+            usuario_id=fila["user_id"],
+            conversacion_id=fila["mensaje__conversacion_id"],
+            ultimo_leido=fila["ultimo"],
+        )
+        for fila in filas.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("mensajes", "0003_busqueda_texto"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LecturaConversacion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("ultimo_leido", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ("conversacion", "usuario"),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="mensaje",
+            index=models.Index(
+                fields=["conversacion", "id"], name="mensaje_conv_id_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="lecturaconversacion",
+            name="conversacion",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="lecturas",
+                to="mensajes.conversacion",
+            ),
+        ),
+        migrations.AddField(
+            model_name="lecturaconversacion",
+            name="usuario",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="lecturas_conversacion",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="lecturaconversacion",
+            constraint=models.UniqueConstraint(
+                fields=("usuario", "conversacion"), name="lectura_usuario_conv_unica"
+            ),
+        ),
+        migrations.RunPython(copiar_lecturas, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="mensaje",
+            name="leido_por",
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.11 on 2026-10-18 17:06
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Substr
+
+
+def poblar_resumen(apps, schema_editor):
+    Conversacion = apps.get_model("mensajes", "Conversacion")
+    Mensaje = apps.get_model("mensajes", "Mensaje")
+    mensajes = Mensaje.objects.filter(conversacion=models.OuterRef("pk"))
+    total = (
+        mensajes.order_by()
+        .values("conversacion")
+        .annotate(total=models.Count("pk"))
+        .values("total")
+    )
+    ultimo = mensajes.order_by("-created_at", "-id")
+    Conversacion.objects.filter(pk__in=Mensaje.objects.values("conversacion")).update(
+        total_mensajes=models.Subquery(total),
+        ultimo_mensaje_at=models.Subquery(ultimo.values("created_at")[:1]),
+        ultimo_mensaje_preview=Coalesce(
+            Substr(models.Subquery(ultimo.values("texto")[:1]), 1, 140),
+            models.Value(""),
+        ),
+    )
+
+
+# SQLite no admite NULLS LAST en índices; ahí la bandeja se ordena sin índice.
+INDICE = """
+CREATE INDEX IF NOT EXISTS conversacion_actividad_idx ON mensajes_conversacion
+USING btree (ultimo_mensaje_at DESC NULLS LAST, id DESC);
+"""
+
+
+def crear_indice(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(INDICE)
+
+
+def borrar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS conversacion_actividad_idx;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mensajes", "0004_lecturas_conversacion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conversacion",
+            name="total_mensajes",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="conversacion",
+            name="ultimo_mensaje_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="conversacion",
+            name="ultimo_mensaje_preview",
+            field=models.CharField(blank=True, editable=False, max_length=140),
+        ),
+        migrations.RunPython(poblar_resumen, migrations.RunPython.noop),
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
@@ -4,6 +4,10 @@ from apps.core.models import TimeStampedModel
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import F
+
+# Caracteres del último mensaje que se guardan en la conversación.
+LARGO_VISTA_PREVIA = 140
 
 
 class Conversacion(TimeStampedModel):
@@ -27,6 +31,16 @@ class Conversacion(TimeStampedModel):
         blank=True,
         related_name="conversaciones",
     )
+    # Resumen de los mensajes, mantenido por apps.mensajes.resumen.
+    ultimo_mensaje_at = models.DateTimeField(null=True, blank=True, editable=False)
+    ultimo_mensaje_preview = models.CharField(
+        max_length=LARGO_VISTA_PREVIA, blank=True, editable=False
+    )
+    total_mensajes = models.PositiveIntegerField(default=0, editable=False)
+
+    # Bandeja por actividad reciente; las conversaciones sin mensajes van al
+    # final. En PostgreSQL la resuelve el índice ``conversacion_actividad_idx``.
+    ORDEN_ACTIVIDAD = (F("ultimo_mensaje_at").desc(nulls_last=True), F("id").desc())
 
     class Meta:
         ordering = ("-created_at",)
@@ -57,16 +71,47 @@ class Mensaje(TimeStampedModel):
         related_name="mensajes_enviados",
     )
     texto = models.TextField()
-    leido_por = models.ManyToManyField(
-        settings.AUTH_USER_MODEL, related_name="mensajes_leidos", blank=True
-    )
 
     class Meta:
         ordering = ("created_at",)
         indexes = [
             models.Index(fields=("conversacion",), name="mensaje_conversacion_idx"),
             models.Index(fields=("emisor",), name="mensaje_emisor_idx"),
+            models.Index(
+                fields=("conversacion", "created_at", "id"),
+                name="mensaje_conv_created_idx",
+            ),
+            models.Index(fields=("created_at", "id"), name="mensaje_created_id_idx"),
+            models.Index(fields=("conversacion", "id"), name="mensaje_conv_id_idx"),
         ]
 
     def __str__(self) -> str:
         return f"Mensaje {self.pk} en {self.conversacion_id}"
+
+
+class LecturaConversacion(TimeStampedModel):
+    """Hasta qué mensaje leyó cada usuario una conversación."""
+
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="lecturas_conversacion",
+    )
+    conversacion = models.ForeignKey(
+        Conversacion, on_delete=models.CASCADE, related_name="lecturas"
+    )
+    # Id del último mensaje leído: los de id mayor están sin leer.
+    ultimo_leido = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ("conversacion", "usuario")
+        constraints = [
+            models.UniqueConstraint(
+                fields=("usuario", "conversacion"), name="lectura_usuario_conv_unica"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.usuario_id} leyó {self.conversacion_id} hasta {self.ultimo_leido}"
+        )
@@ -0,0 +1,131 @@
+"""Resumen desnormalizado de los mensajes de cada conversación.
+
+``Conversacion`` guarda la fecha y el comienzo de su último mensaje y cuántos
+tiene, de modo que la bandeja se lista en una consulta ordenada por el índice
+``conversacion_actividad_idx`` sin leer ``Mensaje``. Cada alta, edición o
+baja de un mensaje ajusta el resumen con un único ``UPDATE`` atómico sobre la
+fila de la conversación; ``recalcular`` lo rehace desde los mensajes para las
+cargas masivas o para corregir desvíos.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from apps.mensajes.models import LARGO_VISTA_PREVIA, Conversacion, Mensaje
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    DateTimeField,
+    F,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Substr
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+
+def vista_previa(texto: str) -> str:
+    return texto[:LARGO_VISTA_PREVIA]
+
+
+def _mensajes():
+    return Mensaje.objects.filter(conversacion=OuterRef("pk"))
+
+
+def _ultimo(campo: str) -> Subquery:
+    return Subquery(_mensajes().order_by("-created_at", "-id").values(campo)[:1])
+
+
+def _vista_previa_ultimo():
+    return Coalesce(
+        Substr(_ultimo("texto"), 1, LARGO_VISTA_PREVIA),
+        Value(""),
+        output_field=CharField(),
+    )
+
+
+def recalcular(conversacion_ids: Iterable[int] | None = None) -> int:
+    """Rehace el resumen desde ``Mensaje``; devuelve las conversaciones tocadas."""
+    queryset = Conversacion.objects.all()
+    if conversacion_ids is not None:
+        queryset = queryset.filter(pk__in=list(conversacion_ids))
+    total = (
+        _mensajes()
+        .order_by()
+        .values("conversacion")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return queryset.update(
+        total_mensajes=Coalesce(Subquery(total), Value(0)),
+        ultimo_mensaje_at=_ultimo("created_at"),
+        ultimo_mensaje_preview=_vista_previa_ultimo(),
+        updated_at=timezone.now(),
+    )
+
+
+def _con_su_conversacion(origin) -> bool:
+    modelo = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return modelo is Conversacion
+
+
+@receiver(post_save, sender=Mensaje)
+def _mensaje_guardado(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    conversacion = Conversacion.objects.filter(pk=instance.conversacion_id)
+    if not created:
+        # Una edición solo cambia la vista previa si es el último mensaje.
+        conversacion.filter(ultimo_mensaje_at=instance.created_at).update(
+            ultimo_mensaje_preview=vista_previa(instance.texto),
+            updated_at=timezone.now(),
+        )
+        return
+    # Con altas concurrentes gana el mensaje más reciente, no el último UPDATE.
+    es_ultimo = Q(ultimo_mensaje_at__isnull=True) | Q(
+        ultimo_mensaje_at__lte=instance.created_at
+    )
+    conversacion.update(
+        total_mensajes=F("total_mensajes") + 1,
+        ultimo_mensaje_at=Case(
+            When(es_ultimo, then=Value(instance.created_at)),
+            default=F("ultimo_mensaje_at"),
+            output_field=DateTimeField(),
+        ),
+        ultimo_mensaje_preview=Case(
+            When(es_ultimo, then=Value(vista_previa(instance.texto))),
+            default=F("ultimo_mensaje_preview"),
+            output_field=CharField(),
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_delete, sender=Mensaje)
+def _mensaje_borrado(sender, instance, origin=None, **kwargs):
+    if _con_su_conversacion(origin):
+        return
+    # Si era el último, el reemplazo se busca en la misma sentencia.
+    era_ultimo = Q(ultimo_mensaje_at__lte=instance.created_at)
+    Conversacion.objects.filter(pk=instance.conversacion_id).update(
+        total_mensajes=Greatest(F("total_mensajes") - 1, Value(0)),
+        ultimo_mensaje_at=Case(
+            When(era_ultimo, then=_ultimo("created_at")),
+            default=F("ultimo_mensaje_at"),
+            output_field=DateTimeField(),
+        ),
+        ultimo_mensaje_preview=Case(
+            When(era_ultimo, then=_vista_previa_ultimo()),
+            default=F("ultimo_mensaje_preview"),
+            output_field=CharField(),
+        ),
+        updated_at=timezone.now(),
+    )
@@ -15,15 +15,24 @@ class ConversacionSerializer(serializers.ModelSerializer):
             "creada_por",
             "visibilidad",
             "filial",
+            "ultimo_mensaje_at",
+            "ultimo_mensaje_preview",
+            "total_mensajes",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "creada_por",
+            "ultimo_mensaje_at",
+            "ultimo_mensaje_preview",
+            "total_mensajes",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["creada_por", "created_at", "updated_at"]
 
 
 class MensajeSerializer(serializers.ModelSerializer):
     emisor = serializers.PrimaryKeyRelatedField(read_only=True)
-    leido_por = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
 
     class Meta:
         model = Mensaje
@@ -32,8 +41,7 @@ class MensajeSerializer(serializers.ModelSerializer):
             "conversacion",
             "emisor",
             "texto",
-            "leido_por",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["emisor", "leido_por", "created_at", "updated_at"]
+        read_only_fields = ["emisor", "created_at", "updated_at"]
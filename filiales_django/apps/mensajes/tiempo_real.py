@@ -0,0 +1,188 @@
+"""Entrega en tiempo real de mensajes y conversaciones por Server-Sent Events.
+
+Al confirmarse la transacción, las altas y bajas de ``Mensaje`` y
+``Conversacion`` se publican en ``apps.core.pubsub`` en los canales que
+define ``apps.mensajes.alcance``. ``GET /api/mensajes/stream/`` suscribe al
+usuario a sus canales y reenvía cada evento como ``event: <tipo>`` con el JSON
+en ``data``, así que el frontend deja de consultar los listados a intervalos.
+La API sigue en WSGI; el stream lo sirve un proceso ASGI aparte (ver README).
+
+Los eventos ``mensaje`` llevan el id del mensaje. Al reconectar, el navegador
+manda ``Last-Event-ID`` y el stream repite primero los mensajes visibles
+posteriores, leídos de la base; como la suscripción se abre antes, alguno
+puede llegar dos veces y el cliente lo descarta por id. Cada conexión dura a
+lo sumo ``MENSAJES_STREAM_DURACION`` segundos: al reconectar se vuelve a
+autenticar.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import AsyncIterator, Callable
+
+from apps.core import pubsub
+from apps.core.pubsub import Evento, SuscripcionDesbordada
+from apps.mensajes import alcance
+from apps.mensajes.models import Conversacion, Mensaje
+from apps.mensajes.serializers import ConversacionSerializer, MensajeSerializer
+from apps.usuarios.authentication import PerfilJWTAuthentication
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework import exceptions
+
+logger = logging.getLogger(__name__)
+
+# Mensajes que se reenvían como máximo al reanudar con ``Last-Event-ID``.
+PENDIENTES_MAXIMOS = 100
+# Milisegundos que el navegador espera antes de reconectar.
+REINTENTO_MS = 3000
+
+
+SAL_TICKET = "mensajes.stream"
+
+
+def emitir_ticket(user) -> str:
+    """Ticket firmado que solo sirve para abrir el stream de ``user``."""
+    return signing.dumps(user.pk, salt=SAL_TICKET)
+
+
+def usuario_del_ticket(ticket: str):
+    """Usuario activo del ``ticket`` o ``None`` si es inválido o venció."""
+    vigencia = getattr(settings, "MENSAJES_STREAM_TICKET_TTL", 30)
+    autenticacion = PerfilJWTAuthentication()
+    try:
+        user = autenticacion.cargar_usuario(
+            signing.loads(ticket, salt=SAL_TICKET, max_age=vigencia)
+        )
+    except (signing.BadSignature, exceptions.AuthenticationFailed):
+        return None
+    return user if user.is_active else None
+
+
+def autenticar(request):
+    """Usuario del header ``Authorization`` o del parámetro ``?ticket=``.
+
+    ``EventSource`` no permite enviar headers, así que el frontend pide un
+    ticket a ``POST /api/mensajes/stream-ticket/`` y lo pasa en la URL. El
+    token de acceso nunca va en la URL: el ticket no sirve para otra cosa y
+    vence a los ``MENSAJES_STREAM_TICKET_TTL`` segundos, así que lo que quede
+    en los logs de acceso no da acceso a la API.
+    """
+    ticket = request.GET.get("ticket")
+    if ticket:
+        return usuario_del_ticket(ticket)
+    autenticacion = PerfilJWTAuthentication()
+    try:
+        resultado = autenticacion.authenticate(request)
+    except exceptions.AuthenticationFailed:
+        return None
+    return resultado[0] if resultado else None
+
+
+def formatear(evento: Evento) -> str:
+    lineas = [f"event: {evento.tipo}"]
+    if evento.id is not None:
+        lineas.append(f"id: {evento.id}")
+    lineas.append(f"data: {evento.contenido}")
+    return "\n".join(lineas) + "\n\n"
+
+
+def evento_mensaje(mensaje: Mensaje) -> Evento:
+    return Evento("mensaje", MensajeSerializer(mensaje).data, id=str(mensaje.pk))
+
+
+def pendientes(user, ultimo_id: int) -> list[Evento]:
+    """Mensajes visibles para ``user`` posteriores a ``ultimo_id``."""
+    queryset = alcance.mensajes_visibles(
+        Mensaje.objects.select_related("conversacion"), user
+    )
+    mensajes = queryset.filter(pk__gt=ultimo_id).order_by("pk")[:PENDIENTES_MAXIMOS]
+    return [evento_mensaje(mensaje) for mensaje in mensajes]
+
+
+async def eventos(
+    user, canales: list[str], ultimo_id: int | None = None
+) -> AsyncIterator[str]:
+    """Cuerpo del stream SSE de ``user``: pendientes, eventos y keepalives."""
+    keepalive = getattr(settings, "MENSAJES_STREAM_KEEPALIVE", 15)
+    duracion = getattr(settings, "MENSAJES_STREAM_DURACION", 300)
+    suscripcion = await pubsub.broker().suscribir(canales)
+    try:
+        yield f"retry: {REINTENTO_MS}\n\n"
+        if ultimo_id is not None:
+            for evento in await sync_to_async(pendientes)(user, ultimo_id):
+                yield formatear(evento)
+        loop = asyncio.get_running_loop()
+        fin = loop.time() + duracion
+        while (restante := fin - loop.time()) > 0:
+            evento = await suscripcion.recibir(min(keepalive, restante))
+            yield formatear(evento) if evento else ": ping\n\n"
+    except SuscripcionDesbordada:
+        # El cliente reconecta con Last-Event-ID y recupera lo que se perdió.
+        return
+    finally:
+        await suscripcion.cerrar()
+
+
+def _publicar(conversacion, crear_evento: Callable[[], Evento]) -> None:
+    """Publica al confirmarse la transacción el evento que arma ``crear_evento``.
+
+    El evento se serializa recién en el ``on_commit``, fuera de la
+    transacción; si esta se revierte, no se serializa nada.
+    """
+    canales = alcance.canales_de(conversacion)
+
+    def publicar():
+        try:
+            evento = crear_evento()
+        except Exception:
+            logger.exception("No se pudo armar el evento de %r", conversacion)
+            return
+        pubsub.publicar(canales, evento)
+
+    transaction.on_commit(publicar)
+
+
+@receiver(post_save, sender=Mensaje)
+def _mensaje_guardado(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    def crear_evento():
+        evento = evento_mensaje(instance)
+        return evento if created else Evento("mensaje_editado", evento.datos)
+
+    _publicar(instance.conversacion, crear_evento)
+
+
+@receiver(post_delete, sender=Mensaje)
+def _mensaje_borrado(sender, instance, **kwargs):
+    try:
+        conversacion = instance.conversacion
+    except Conversacion.DoesNotExist:
+        # Se borró junto con la conversación; alcanza con el evento de esta.
+        return
+    # El borrado deja la pk en None, así que los datos se toman ahora.
+    datos = {"id": instance.pk, "conversacion": instance.conversacion_id}
+    _publicar(conversacion, lambda: Evento("mensaje_borrado", datos))
+
+
+@receiver(post_save, sender=Conversacion)
+def _conversacion_guardada(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _publicar(
+        instance,
+        lambda: Evento("conversacion", ConversacionSerializer(instance).data),
+    )
+
+
+@receiver(post_delete, sender=Conversacion)
+def _conversacion_borrada(sender, instance, **kwargs):
+    pk = instance.pk
+    _publicar(instance, lambda: Evento("conversacion_borrada", {"id": pk}))
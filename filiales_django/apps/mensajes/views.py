@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from apps.core.viewsets import BaseModelViewSet
+from apps.mensajes import alcance, lecturas, tiempo_real
 from apps.mensajes.models import Conversacion, Mensaje
 from apps.mensajes.serializers import ConversacionSerializer, MensajeSerializer
-from django.db.models import Q
-from rest_framework import decorators, exceptions, response, status
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from rest_framework import decorators, exceptions, permissions, response
+from rest_framework.views import APIView
 
 
 class ConversacionViewSet(BaseModelViewSet):
@@ -15,21 +19,13 @@ class ConversacionViewSet(BaseModelViewSet):
         "filial": ["exact"],
     }
     search_fields = ["asunto", "filial__nombre"]
-    ordering_fields = ["created_at", "visibilidad"]
+    ordering_fields = ["created_at", "visibilidad", "ultimo_mensaje_at"]
+    ordering = Conversacion.ORDEN_ACTIVIDAD
 
     def get_queryset(self):  # type: ignore[override]
-        queryset = super().get_queryset()
-        perfil = getattr(self.request.user, "perfil", None)
-        if not perfil:
-            return queryset.none()
-        if perfil.es_admin or perfil.es_coordinador:
-            return queryset
-        if perfil.es_usuario_filial and perfil.filial_id:
-            return queryset.filter(
-                Q(visibilidad=Conversacion.Visibilidad.GLOBAL)
-                | Q(filial_id=perfil.filial_id)
-            )
-        return queryset.filter(visibilidad=Conversacion.Visibilidad.GLOBAL)
+        return alcance.conversaciones_visibles(
+            super().get_queryset(), self.request.user
+        )
 
     def get_serializer_save_kwargs(self, *, action: str):
         kwargs = super().get_serializer_save_kwargs(action=action)
@@ -53,6 +49,19 @@ class ConversacionViewSet(BaseModelViewSet):
                     )
         return kwargs
 
+    @decorators.action(detail=False, methods=["get"], url_path="no-leidos")
+    def no_leidos(self, request):
+        pendientes = lecturas.no_leidos(request.user, self.get_queryset())
+        return response.Response(
+            {
+                "total": sum(pendientes.values()),
+                "conversaciones": [
+                    {"conversacion": conversacion, "no_leidos": total}
+                    for conversacion, total in sorted(pendientes.items())
+                ],
+            }
+        )
+
 
 class MensajeViewSet(BaseModelViewSet):
     queryset = Mensaje.objects.select_related(
@@ -61,21 +70,13 @@ class MensajeViewSet(BaseModelViewSet):
     serializer_class = MensajeSerializer
     filterset_fields = {"conversacion": ["exact"]}
     search_fields = ["texto", "conversacion__asunto"]
+    full_text_search = True
     ordering_fields = ["created_at"]
+    cursor_ordering = ("created_at", "id")
+    query_budget = {"list": 5, "retrieve": 4}
 
     def get_queryset(self):  # type: ignore[override]
-        queryset = super().get_queryset()
-        perfil = getattr(self.request.user, "perfil", None)
-        if not perfil:
-            return queryset.none()
-        if perfil.es_admin or perfil.es_coordinador:
-            return queryset
-        if perfil.es_usuario_filial and perfil.filial_id:
-            return queryset.filter(
-                Q(conversacion__visibilidad=Conversacion.Visibilidad.GLOBAL)
-                | Q(conversacion__filial_id=perfil.filial_id)
-            )
-        return queryset.none()
+        return alcance.mensajes_visibles(super().get_queryset(), self.request.user)
 
     def get_serializer_save_kwargs(self, *, action: str):
         kwargs = super().get_serializer_save_kwargs(action=action)
@@ -99,8 +100,56 @@ class MensajeViewSet(BaseModelViewSet):
                     )
         return kwargs
 
-    @decorators.action(detail=True, methods=["post"], url_path="marcar-leido")
-    def marcar_leido(self, request, pk=None):
+    @decorators.action(detail=True, methods=["post"], url_path="marcar-leido-hasta")
+    def marcar_leido_hasta(self, request, pk=None):
         mensaje = self.get_object()
-        mensaje.leido_por.add(request.user)
-        return response.Response(status=status.HTTP_204_NO_CONTENT)
+        ultimo_leido = lecturas.marcar_leido_hasta(request.user, mensaje)
+        return response.Response(
+            {"conversacion": mensaje.conversacion_id, "ultimo_leido": ultimo_leido}
+        )
+
+
+class TicketStreamView(APIView):
+    """Emite el ticket de corta duración para abrir ``/api/mensajes/stream/``."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        return response.Response(
+            {
+                "ticket": tiempo_real.emitir_ticket(request.user),
+                "vence_en": getattr(settings, "MENSAJES_STREAM_TICKET_TTL", 30),
+            }
+        )
+
+
+def _suscriptor(request):
+    user = tiempo_real.autenticar(request)
+    return user, alcance.canales(user) if user else []
+
+
+async def stream_mensajes(request):
+    """Stream SSE con los mensajes y conversaciones visibles para el usuario."""
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    user, canales = await sync_to_async(_suscriptor)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Las credenciales de autenticación no se proveyeron."},
+            status=401,
+        )
+    if not canales:
+        return JsonResponse(
+            {"detail": "No tiene permiso para realizar esta acción."}, status=403
+        )
+    ultimo_id = request.headers.get("Last-Event-ID", "")
+    respuesta = StreamingHttpResponse(
+        tiempo_real.eventos(
+            user, canales, int(ultimo_id) if ultimo_id.isdigit() else None
+        ),
+        content_type="text/event-stream",
+    )
+    respuesta["Cache-Control"] = "no-cache"
+    # Evita que un proxy nginx acumule el stream.
+    respuesta["X-Accel-Buffering"] = "no"
+    return respuesta
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from apps.core import respuestas
 from apps.core.models import TimeStampedModel
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 
 
 class Partido(TimeStampedModel):
@@ -36,12 +40,19 @@ class Partido(TimeStampedModel):
         return f"{self.titulo} - {self.fecha:%Y-%m-%d}" if self.fecha else self.titulo
 
     def actualizar_cupo_disponible(self, cantidad_asignada: int) -> None:
+        """Descuenta ``cantidad_asignada`` con un ``UPDATE`` atómico, sin bajar de 0.
+
+        Las aprobaciones usan ``apps.entradas.cupos``, que además valida el cupo.
+        """
         if self.cupo_total is None:
             return
-        if self.cupo_disponible is None:
-            self.cupo_disponible = self.cupo_total
-        self.cupo_disponible = max(0, self.cupo_disponible - cantidad_asignada)
-        self.save(update_fields=["cupo_disponible", "updated_at"])
+        restante = Coalesce(F("cupo_disponible"), F("cupo_total"))
+        Partido.objects.filter(pk=self.pk).update(
+            cupo_disponible=Greatest(restante - cantidad_asignada, Value(0)),
+            updated_at=timezone.now(),
+        )
+        respuestas.invalidar(Partido._meta.label)
+        self.refresh_from_db(fields=["cupo_disponible", "updated_at"])
 
     def save(self, *args, **kwargs):  # type: ignore[override]
         if self.cupo_total is not None and self.cupo_disponible is None:
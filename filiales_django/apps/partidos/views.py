@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+from collections import defaultdict
+
 from apps.auditoria.models import Accion
+from apps.core.audit import nueva_accion, registrar
 from apps.core.permissions import IsAdminAllAccess
-from apps.core.services import dispatch_webhook
+from apps.core.respuestas import cachear_respuesta
+from apps.core.services import (
+    dispatch_webhook,
+    dispatch_webhooks,
+    send_notification_email,
+)
 from apps.core.viewsets import BaseModelViewSet
+from apps.entradas import cupos, distribucion
+from apps.entradas.serializers import AsignacionLoteSerializer, DistribucionSerializer
 from apps.partidos.models import Partido
 from apps.partidos.serializers import PartidoSerializer
-from rest_framework import decorators, response
+from django.db import transaction
+from rest_framework import decorators, response, status
 from rest_framework.permissions import IsAuthenticated
 
 
@@ -26,6 +37,10 @@ class PartidoViewSet(BaseModelViewSet):
     def get_queryset(self):  # type: ignore[override]
         return super().get_queryset().select_related()
 
+    @cachear_respuesta("partidos.Partido")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @decorators.action(
         detail=True,
         methods=["post"],
@@ -61,3 +76,166 @@ class PartidoViewSet(BaseModelViewSet):
             {"evento": "partido_cancelado", "partido_id": partido.id},
         )
         return response.Response(self.get_serializer(partido).data)
+
+    @decorators.action(
+        detail=True,
+        methods=["post"],
+        url_path="asignar-lote",
+        permission_classes=[IsAuthenticated, IsAdminAllAccess],
+    )
+    def asignar_lote(self, request, pk=None):
+        partido = self.get_object()
+        serializer = AsignacionLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        datos = serializer.validated_data
+        comentario = datos["comentario"]
+        resultado = cupos.asignar_lote(
+            partido,
+            [(item["solicitud"], item["cantidad"]) for item in datos["asignaciones"]],
+            request.user,
+            comentario,
+            parcial=datos["parcial"],
+            en_transaccion=lambda asignaciones: self._registrar_lote(
+                request, asignaciones, comentario
+            ),
+        )
+        cuerpo = {
+            "partido": partido.id,
+            "asignadas": [
+                {
+                    "solicitud": asignacion.solicitud_id,
+                    "asignacion": asignacion.id,
+                    "cantidad": asignacion.cantidad_asignada,
+                    "estado": asignacion.solicitud.estado,
+                }
+                for asignacion in resultado.asignaciones
+            ],
+            "errores": resultado.errores,
+            "cupo_disponible": resultado.cupo_disponible,
+        }
+        if not resultado.asignaciones:
+            return response.Response(cuerpo, status=status.HTTP_400_BAD_REQUEST)
+        codigo = (
+            status.HTTP_207_MULTI_STATUS if resultado.errores else status.HTTP_200_OK
+        )
+        return response.Response(cuerpo, status=codigo)
+
+    @decorators.action(
+        detail=True,
+        methods=["post"],
+        url_path="distribuir",
+        permission_classes=[IsAuthenticated, IsAdminAllAccess],
+    )
+    def distribuir(self, request, pk=None):
+        """Reparte el cupo entre las solicitudes pendientes.
+
+        Por defecto solo devuelve la vista previa; con ``confirmar`` aplica el
+        plan como un lote de asignaciones.
+        """
+        partido = self.get_object()
+        serializer = DistribucionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        datos = serializer.validated_data
+        plan = distribucion.planificar(
+            partido, datos["metodo"], prioridad_socios=datos["prioridad_socios"]
+        )
+        cuerpo = {
+            "partido": partido.id,
+            "metodo": plan.metodo,
+            "cupo_disponible": plan.cupo,
+            "total_solicitado": plan.total_solicitado,
+            "total_asignado": plan.total_asignado,
+            "confirmado": False,
+            "solicitudes": plan.solicitudes,
+        }
+        if not datos["confirmar"] or not plan.asignaciones:
+            return response.Response(cuerpo)
+        resultado = distribucion.aplicar(
+            plan,
+            request.user,
+            datos["comentario"],
+            en_transaccion=lambda asignaciones: self._registrar_lote(
+                request, asignaciones, datos["comentario"]
+            ),
+        )
+        cuerpo.update(
+            confirmado=bool(resultado.asignaciones),
+            cupo_disponible=resultado.cupo_disponible,
+            errores=resultado.errores,
+        )
+        codigo = (
+            status.HTTP_207_MULTI_STATUS if resultado.errores else status.HTTP_200_OK
+        )
+        return response.Response(cuerpo, status=codigo)
+
+    def _registrar_lote(self, request, asignaciones, comentario: str) -> None:
+        """Audita el lote en su transacción y encola correos y webhooks al confirmar.
+
+        Corre dentro de la transacción de ``cupos.asignar_lote``: la auditoría
+        se escribe con un único INSERT y se revierte junto con las
+        asignaciones.
+        """
+        por_filial = defaultdict(list)
+        registros = []
+        for asignacion in asignaciones:
+            solicitud = asignacion.solicitud
+            por_filial[solicitud.filial_id].append(asignacion)
+            registros.append(
+                nueva_accion(
+                    usuario=request.user,
+                    recurso="apps.entradas.SolicitudEntrada",
+                    recurso_id=solicitud.id,
+                    accion=Accion.Tipos.APROBAR,
+                    payload={
+                        "cantidad_asignada": asignacion.cantidad_asignada,
+                        "comentario": comentario,
+                        "lote": True,
+                    },
+                    filial=solicitud.filial,
+                    request=request,
+                )
+            )
+            registros.append(
+                nueva_accion(
+                    usuario=request.user,
+                    recurso="apps.entradas.AsignacionEntrada",
+                    recurso_id=asignacion.id,
+                    accion=Accion.Tipos.ASIGNAR_ENTRADAS,
+                    payload={"cantidad_asignada": asignacion.cantidad_asignada},
+                    filial=solicitud.filial,
+                    request=request,
+                )
+            )
+        registrar(registros)
+        transaction.on_commit(lambda: self._notificar_lote(por_filial))
+
+    def _notificar_lote(self, por_filial) -> None:
+        """Un correo y un webhook por filial con sus solicitudes aprobadas."""
+        eventos = []
+        for filial_id, grupo in por_filial.items():
+            filial = grupo[0].solicitud.filial
+            detalle = {
+                asignacion.solicitud_id: asignacion.cantidad_asignada
+                for asignacion in grupo
+            }
+            if filial.contacto_email:
+                lineas = "\n".join(
+                    f"- Solicitud {solicitud_id}: {cantidad} entradas"
+                    for solicitud_id, cantidad in detalle.items()
+                )
+                send_notification_email(
+                    "Solicitudes de entradas aprobadas",
+                    f"Se aprobaron {len(grupo)} solicitudes:\n{lineas}",
+                    [filial.contacto_email],
+                )
+            eventos.append(
+                {
+                    "evento": "solicitudes_aprobadas",
+                    "filial_id": filial_id,
+                    "solicitudes": [
+                        {"solicitud_id": solicitud_id, "cantidad_asignada": cantidad}
+                        for solicitud_id, cantidad in detalle.items()
+                    ],
+                }
+            )
+        dispatch_webhooks("eventos", eventos)
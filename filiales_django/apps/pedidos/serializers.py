@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from apps.core.referencias import ReferenciaField
 from apps.pedidos.models import Pedido, PedidoItem, Producto
 from rest_framework import serializers
 
@@ -22,6 +23,8 @@ class ProductoSerializer(serializers.ModelSerializer):
 
 
 class PedidoItemSerializer(serializers.ModelSerializer):
+    producto = ReferenciaField(Producto)
+
     class Meta:
         model = PedidoItem
         fields = [
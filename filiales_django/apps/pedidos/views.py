@@ -25,7 +25,9 @@ class ProductoViewSet(BaseModelViewSet):
 
 
 class PedidoViewSet(FilialScopedQuerysetMixin, BaseModelViewSet):
-    queryset = Pedido.objects.select_related("filial", "created_by")
+    queryset = Pedido.objects.select_related("filial", "created_by").prefetch_related(
+        "items"
+    )
     serializer_class = PedidoSerializer
     scope_field = "filial"
     filterset_fields = {
@@ -35,6 +37,8 @@ class PedidoViewSet(FilialScopedQuerysetMixin, BaseModelViewSet):
     }
     search_fields = ["observaciones", "filial__nombre"]
     ordering_fields = ["created_at", "estado"]
+    query_budget = {"list": 6, "retrieve": 5}
+    conditional_related = ("items",)
 
     def get_serializer_save_kwargs(self, *, action: str):
         kwargs = super().get_serializer_save_kwargs(action=action)
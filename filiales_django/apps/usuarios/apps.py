@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class UsuariosConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.usuarios"
+
+    def ready(self):
+        from apps.usuarios import authentication
+
+        authentication.exigir_cache_compartida()
@@ -0,0 +1,205 @@
+"""Autenticación JWT que resuelve usuario, perfil y filial en una consulta.
+
+Los permisos y el alcance por filial leen ``request.user.perfil`` en cada
+request. ``PerfilJWTAuthentication`` carga el usuario con
+``select_related("perfil", "perfil__filial")`` y lo guarda en un LRU del
+proceso durante ``AUTH_USUARIO_CACHE_TTL`` segundos, de modo que los requests
+de un mismo usuario no consultan la base para identificarse. Guardar o borrar
+el usuario o su perfil lo descarta del LRU de este proceso; en los demás vive
+a lo sumo ese TTL.
+
+Con ``AUTH_STATELESS`` el request no consulta la base: usuario y perfil se
+arman con los claims ``rol``, ``filial_id`` y ``es_socio`` del token. Cada
+token lleva además la versión del usuario (``ver``), guardada en
+``PerfilUsuario.version_token``; guardar el usuario o su perfil la renueva y
+los tokens emitidos antes dejan de valer hasta el próximo refresh, que vuelve
+a leer el perfil. La caché compartida guarda una copia que se descarta al
+renovarla; si falta (desalojo, reinicio) se vuelve a leer de la base, así que
+perder la clave nunca revoca tokens. Como cada proceso debe ver el descarte,
+``AUTH_STATELESS`` exige una caché compartida (``exigir_cache_compartida``).
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+
+from apps.core.cache import LRULocal
+from apps.usuarios.models import PerfilUsuario
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+_usuarios: LRULocal | None = None
+
+
+def _cache() -> LRULocal:
+    global _usuarios
+    if _usuarios is None:
+        _usuarios = LRULocal(
+            getattr(settings, "AUTH_USUARIO_CACHE_MAX_ENTRADAS", 1000),
+            getattr(settings, "AUTH_USUARIO_CACHE_TTL", 30),
+        )
+    return _usuarios
+
+
+# Backends cuyo contenido no ven los demás procesos.
+CACHES_LOCALES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def exigir_cache_compartida() -> None:
+    """Rechaza ``AUTH_STATELESS`` si la caché no se comparte entre procesos."""
+    if not getattr(settings, "AUTH_STATELESS", False):
+        return
+    if settings.CACHES["default"]["BACKEND"] in CACHES_LOCALES:
+        raise ImproperlyConfigured(
+            "AUTH_STATELESS requiere una caché compartida: configurar CACHE_URL "
+            "con redis:// o file://."
+        )
+
+
+def _clave_version(user_id) -> str:
+    return f"auth:version:{user_id}"
+
+
+def version_token(user_id) -> int | None:
+    """Versión vigente de los tokens de ``user_id``; ``None`` si no tiene perfil."""
+    compartida = caches["default"]
+    version = compartida.get(_clave_version(user_id))
+    if version is None:
+        version = (
+            PerfilUsuario.objects.filter(user_id=user_id)
+            .values_list("version_token", flat=True)
+            .first()
+        )
+        if version is not None:
+            compartida.add(_clave_version(user_id), version, None)
+    return version
+
+
+def _renovar_version(user_id) -> None:
+    PerfilUsuario.objects.filter(user_id=user_id).update(
+        version_token=time.time_ns() // 1000
+    )
+    clave = _clave_version(user_id)
+    caches["default"].delete(clave)
+    # Otro proceso pudo volver a leer la versión anterior antes del commit.
+    transaction.on_commit(lambda: caches["default"].delete(clave))
+
+
+def aplicar_claims(token, user) -> None:
+    """Copia al token el rol, la filial y la versión vigente del usuario."""
+    perfil = getattr(user, "perfil", None)
+    if perfil:
+        token["rol"] = perfil.rol
+        token["filial_id"] = perfil.filial_id
+        token["es_socio"] = perfil.es_socio
+    token["ver"] = version_token(user.pk)
+
+
+def olvidar_usuario(user_id) -> None:
+    """Descarta el usuario del LRU y revoca sus tokens emitidos."""
+    _cache().delete(str(user_id))
+    _renovar_version(user_id)
+
+
+def limpiar_cache() -> None:
+    """Vacía el LRU de usuarios y vuelve a leer su configuración."""
+    global _usuarios
+    _usuarios = None
+
+
+class PerfilJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` con el perfil precargado y cache por proceso."""
+
+    def cargar_usuario(self, user_id):
+        try:
+            return self.user_model.objects.select_related(
+                "perfil", "perfil__filial"
+            ).get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    def usuario_desde_token(self, validated_token):
+        """Usuario con perfil armados con los claims, sin consultar la base."""
+        if validated_token.get("ver") != version_token(
+            validated_token[api_settings.USER_ID_CLAIM]
+        ):
+            raise AuthenticationFailed(
+                _("El token fue revocado."), code="token_revocado"
+            )
+        user = self.user_model(
+            **{api_settings.USER_ID_FIELD: validated_token[api_settings.USER_ID_CLAIM]},
+            is_active=True,
+        )
+        user._state.adding = False
+        user.desde_token = True
+        perfil = PerfilUsuario(
+            rol=validated_token["rol"],
+            filial_id=validated_token.get("filial_id"),
+            es_socio=validated_token.get("es_socio", False),
+        )
+        perfil._state.adding = False
+        user.perfil = perfil
+        return user
+
+    def get_user(self, validated_token):  # type: ignore[override]
+        if (
+            getattr(settings, "AUTH_STATELESS", False)
+            and api_settings.USER_ID_CLAIM in validated_token
+            and "rol" in validated_token
+        ):
+            return self.usuario_desde_token(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = _cache().get(str(user_id))
+        if not isinstance(user, self.user_model):
+            user = self.cargar_usuario(user_id)
+            _cache().set(str(user_id), user)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        # Cada request recibe su propia instancia; el perfil cacheado se comparte.
+        return copy.copy(user)
+
+
+def usuario_completo(user):
+    """El usuario leído de la base si ``user`` se armó con los claims del token."""
+    if not getattr(user, "desde_token", False):
+        return user
+    return PerfilJWTAuthentication().cargar_usuario(user.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def _olvidar_por_usuario(sender, instance, **kwargs):
+    olvidar_usuario(instance.pk)
+
+
+@receiver(post_save, sender="usuarios.PerfilUsuario")
+@receiver(post_delete, sender="usuarios.PerfilUsuario")
+def _olvidar_por_perfil(sender, instance, **kwargs):
+    olvidar_usuario(instance.user_id)
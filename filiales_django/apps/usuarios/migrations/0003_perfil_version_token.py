@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-18 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("usuarios", "0002_add_socio_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="perfilusuario",
+            name="version_token",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -27,6 +27,9 @@ class PerfilUsuario(TimeStampedModel):
     )
     es_socio = models.BooleanField(default=False, db_index=True)
     numero_socio = models.CharField(max_length=50, blank=True)
+    # Cambia con cada modificación del usuario o del perfil; los tokens con
+    # otra versión quedan revocados (ver apps.usuarios.authentication).
+    version_token = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Perfil de usuario"
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from apps.usuarios.authentication import PerfilJWTAuthentication, aplicar_claims
 from apps.usuarios.models import PerfilUsuario
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 
 User = get_user_model()
 
@@ -35,10 +41,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
-        perfil = getattr(user, "perfil", None)
-        if perfil:
-            token["rol"] = perfil.rol
-            token["filial_id"] = perfil.filial_id
+        aplicar_claims(token, user)
         return token
 
     def validate(self, attrs):  # type: ignore[override]
@@ -54,3 +57,19 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             data["filialId"] = None
             data["permisos"] = []
         return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Renueva el access token con el rol, la filial y la versión actuales."""
+
+    def validate(self, attrs):  # type: ignore[override]
+        data = super().validate(attrs)
+        access = AccessToken(data["access"])
+        user = PerfilJWTAuthentication().cargar_usuario(
+            access[api_settings.USER_ID_CLAIM]
+        )
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise serializers.ValidationError("El usuario está inactivo.")
+        aplicar_claims(access, user)
+        data["access"] = str(access)
+        return data
@@ -1,9 +1,8 @@
-from apps.usuarios.views import LoginView, LogoutView
+from apps.usuarios.views import LoginView, LogoutView, RefreshView
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     path("login/", LoginView.as_view(), name="login"),
-    path("refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("refresh/", RefreshView.as_view(), name="token_refresh"),
     path("logout/", LogoutView.as_view(), name="logout"),
 ]
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from apps.usuarios.serializers import CustomTokenObtainPairSerializer, MeSerializer
+from apps.usuarios.authentication import usuario_completo
+from apps.usuarios.serializers import (
+    CustomTokenObtainPairSerializer,
+    CustomTokenRefreshSerializer,
+    MeSerializer,
+)
 from rest_framework import permissions, response, status
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
@@ -11,7 +16,7 @@ class LoginView(TokenObtainPairView):
 
 
 class RefreshView(TokenRefreshView):
-    pass
+    serializer_class = CustomTokenRefreshSerializer
 
 
 class MeView(APIView):
@@ -23,7 +28,7 @@ class MeView(APIView):
             return response.Response(status=status.HTTP_404_NOT_FOUND)
         serializer = MeSerializer(
             {
-                "user": request.user,
+                "user": usuario_completo(request.user),
                 "rol": perfil.rol,
                 "filial_id": perfil.filial_id,
                 "permisos": perfil.permisos,
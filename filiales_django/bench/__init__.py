@@ -0,0 +1 @@
+"""Herramientas de benchmark: datos sintéticos a escala y medición de la API."""
@@ -0,0 +1,347 @@
+"""Generador de datos sintéticos a escala para los benchmarks.
+
+Las filas se construyen en memoria por lotes y se insertan con
+``apps.core.bulk.insertar`` (``COPY`` en PostgreSQL), de modo que la memoria
+usada no depende del tamaño total.
+Conviene correrlo contra una base dedicada: no hay limpieza automática.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Iterable
+
+from apps.acciones.models import AccionSolidaria
+from apps.auditoria.models import Accion
+from apps.core.bulk import Progreso, insertar
+from apps.core.dashboard import invalidar_resumen
+from apps.entradas.models import SolicitudEntrada
+from apps.filiales import estadisticas
+from apps.filiales.models import Autoridad, Filial
+from apps.mensajes import resumen
+from apps.mensajes.models import Conversacion, Mensaje
+from apps.partidos.models import Partido
+from apps.pedidos.models import Pedido, PedidoItem, Producto
+from apps.usuarios.models import PerfilUsuario
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+User = get_user_model()
+
+PREFIJO = "BENCH"
+USUARIO_ADMIN = "bench_admin"
+PASSWORD = "bench1234"
+
+
+@dataclass(frozen=True)
+class Escala:
+    filiales: int = 200
+    autoridades_por_filial: int = 5
+    usuarios_por_filial: int = 2
+    partidos: int = 50
+    productos: int = 100
+    solicitudes: int = 20_000
+    pedidos: int = 10_000
+    items_por_pedido: int = 3
+    acciones: int = 10_000
+    conversaciones: int = 2_000
+    mensajes: int = 100_000
+    auditoria: int = 500_000
+
+
+ESCALAS = {
+    "chica": Escala(
+        filiales=20,
+        autoridades_por_filial=3,
+        usuarios_por_filial=1,
+        partidos=10,
+        productos=20,
+        solicitudes=500,
+        pedidos=300,
+        items_por_pedido=2,
+        acciones=300,
+        conversaciones=50,
+        mensajes=2_000,
+        auditoria=5_000,
+    ),
+    "media": Escala(),
+    "grande": Escala(
+        filiales=2_000,
+        partidos=200,
+        productos=500,
+        solicitudes=200_000,
+        pedidos=100_000,
+        acciones=100_000,
+        conversaciones=20_000,
+        mensajes=1_000_000,
+        auditoria=5_000_000,
+    ),
+}
+
+
+class Generador:
+    def __init__(
+        self,
+        escala: Escala,
+        *,
+        batch_size: int = 5_000,
+        semilla: int = 1234,
+        progreso: Progreso | None = None,
+    ):
+        self.escala = escala
+        self.batch_size = batch_size
+        self.random = random.Random(semilla)
+        self.progreso = progreso or (lambda modelo, insertados, total: None)
+
+    def _insertar(
+        self, model, filas: Iterable, total: int, *, con_ids: bool = False
+    ) -> list[int]:
+        return insertar(
+            model,
+            filas,
+            batch_size=self.batch_size,
+            total=total,
+            con_ids=con_ids,
+            progreso=self.progreso,
+        )
+
+    def generar(self) -> dict[str, int]:
+        """Genera todos los datos y devuelve la cantidad de filas por modelo."""
+        if Filial.objects.filter(codigo__startswith=f"{PREFIJO}-").exists():
+            raise ValueError("La base ya contiene datos de benchmark.")
+        escala = self.escala
+        rnd = self.random
+        hoy = date.today()
+        ahora = timezone.now()
+
+        filiales = self._insertar(
+            Filial,
+            (
+                Filial(
+                    nombre=f"Filial Bench {numero:05d}",
+                    codigo=f"{PREFIJO}-{numero:05d}",
+                    activa=rnd.random() > 0.1,
+                    direccion=f"Calle {numero}",
+                    ciudad=f"Ciudad {numero % 300}",
+                    provincia=f"Provincia {numero % 24}",
+                    contacto_email=f"filial{numero}@bench.local",
+                )
+                for numero in range(escala.filiales)
+            ),
+            escala.filiales,
+            con_ids=True,
+        )
+        total_autoridades = escala.filiales * escala.autoridades_por_filial
+        cargos = list(Autoridad.Cargos.values)
+        self._insertar(
+            Autoridad,
+            (
+                Autoridad(
+                    filial_id=filial_id,
+                    cargo=cargos[indice % len(cargos)],
+                    persona_nombre=f"Autoridad {filial_id}-{indice}",
+                    persona_documento=str(20_000_000 + filial_id * 10 + indice),
+                    desde=hoy - timedelta(days=rnd.randint(30, 2_000)),
+                    activo=indice < 3,
+                    es_socio=rnd.random() > 0.5,
+                )
+                for filial_id in filiales
+                for indice in range(escala.autoridades_por_filial)
+            ),
+            total_autoridades,
+        )
+
+        password = make_password(PASSWORD)
+        usuarios_filial = [
+            (f"bench_{filial_id}_{indice}", filial_id)
+            for filial_id in filiales
+            for indice in range(escala.usuarios_por_filial)
+        ]
+        nombres = [USUARIO_ADMIN, *(nombre for nombre, _ in usuarios_filial)]
+        usuarios = self._insertar(
+            User,
+            (
+                User(username=nombre, email=f"{nombre}@bench.local", password=password)
+                for nombre in nombres
+            ),
+            len(nombres),
+            con_ids=True,
+        )
+        filial_de = dict(
+            zip(usuarios[1:], (filial_id for _, filial_id in usuarios_filial))
+        )
+        self._insertar(
+            PerfilUsuario,
+            [
+                PerfilUsuario(
+                    user_id=usuarios[0], rol=PerfilUsuario.Roles.ADMINISTRADOR
+                ),
+                *(
+                    PerfilUsuario(
+                        user_id=user_id,
+                        rol=PerfilUsuario.Roles.USUARIO_FILIAL,
+                        filial_id=filial_id,
+                        es_socio=rnd.random() > 0.5,
+                    )
+                    for user_id, filial_id in filial_de.items()
+                ),
+            ],
+            len(usuarios),
+        )
+        usuarios_filial_ids = list(filial_de)
+
+        partidos = self._insertar(
+            Partido,
+            (
+                Partido(
+                    titulo=f"Partido Bench {numero}",
+                    fecha=ahora + timedelta(days=numero - escala.partidos // 2),
+                    lugar="Estadio UNO",
+                    cupo_total=5_000,
+                    cupo_disponible=5_000,
+                    solo_socios=numero % 5 == 0,
+                )
+                for numero in range(escala.partidos)
+            ),
+            escala.partidos,
+            con_ids=True,
+        )
+        productos = self._insertar(
+            Producto,
+            (
+                Producto(
+                    nombre=f"Producto Bench {numero}",
+                    sku=f"{PREFIJO}-{numero:06d}",
+                    categoria=f"Categoria {numero % 12}",
+                    unidad="unidad",
+                )
+                for numero in range(escala.productos)
+            ),
+            escala.productos,
+            con_ids=True,
+        )
+
+        def _autor() -> tuple[int, int]:
+            user_id = rnd.choice(usuarios_filial_ids)
+            return user_id, filial_de[user_id]
+
+        estados_solicitud = list(SolicitudEntrada.Estados.values)
+
+        def _solicitudes():
+            for numero in range(escala.solicitudes):
+                user_id, filial_id = _autor()
+                yield SolicitudEntrada(
+                    filial_id=filial_id,
+                    partido_id=rnd.choice(partidos),
+                    cantidad_solicitada=rnd.randint(1, 80),
+                    motivo=f"Solicitud bench {numero}",
+                    estado=rnd.choice(estados_solicitud),
+                    created_by_id=user_id,
+                )
+
+        self._insertar(SolicitudEntrada, _solicitudes(), escala.solicitudes)
+
+        estados_pedido = list(Pedido.Estados.values)
+
+        def _pedidos():
+            for numero in range(escala.pedidos):
+                user_id, filial_id = _autor()
+                yield Pedido(
+                    filial_id=filial_id,
+                    estado=rnd.choice(estados_pedido),
+                    observaciones=f"Pedido bench {numero}",
+                    created_by_id=user_id,
+                )
+
+        pedidos = self._insertar(Pedido, _pedidos(), escala.pedidos, con_ids=True)
+        total_items = escala.pedidos * escala.items_por_pedido
+        self._insertar(
+            PedidoItem,
+            (
+                PedidoItem(
+                    pedido_id=pedido_id,
+                    producto_id=producto_id,
+                    cantidad=rnd.randint(1, 20),
+                )
+                for pedido_id in pedidos
+                for producto_id in rnd.sample(
+                    productos, min(escala.items_por_pedido, len(productos))
+                )
+            ),
+            total_items,
+        )
+
+        estados_accion = list(AccionSolidaria.Estados.values)
+        self._insertar(
+            AccionSolidaria,
+            (
+                AccionSolidaria(
+                    filial_id=rnd.choice(filiales),
+                    nombre=f"Accion bench {numero}",
+                    descripcion="Accion solidaria generada para benchmarks.",
+                    fecha=hoy - timedelta(days=rnd.randint(0, 720)),
+                    estado=rnd.choice(estados_accion),
+                    participantes=rnd.randint(0, 200),
+                )
+                for numero in range(escala.acciones)
+            ),
+            escala.acciones,
+        )
+
+        def _conversaciones():
+            for numero in range(escala.conversaciones):
+                user_id, filial_id = _autor()
+                es_global = numero % 10 == 0
+                yield Conversacion(
+                    asunto=f"Conversacion bench {numero}",
+                    creada_por_id=user_id,
+                    visibilidad=(
+                        Conversacion.Visibilidad.GLOBAL
+                        if es_global
+                        else Conversacion.Visibilidad.FILIAL
+                    ),
+                    filial_id=None if es_global else filial_id,
+                )
+
+        conversaciones = self._insertar(
+            Conversacion, _conversaciones(), escala.conversaciones, con_ids=True
+        )
+        self._insertar(
+            Mensaje,
+            (
+                Mensaje(
+                    conversacion_id=rnd.choice(conversaciones),
+                    emisor_id=rnd.choice(usuarios_filial_ids),
+                    texto=f"Mensaje bench {numero}",
+                )
+                for numero in range(escala.mensajes)
+            ),
+            escala.mensajes,
+        )
+
+        tipos = list(Accion.Tipos.values)
+
+        def _auditoria():
+            for numero in range(escala.auditoria):
+                user_id, filial_id = _autor()
+                yield Accion(
+                    usuario_id=user_id,
+                    filial_id=filial_id,
+                    recurso="bench.Registro",
+                    recurso_id=str(numero),
+                    accion=rnd.choice(tipos),
+                    payload={"numero": numero},
+                )
+
+        self._insertar(Accion, _auditoria(), escala.auditoria)
+
+        # bulk_create no dispara señales: se recalculan los derivados.
+        estadisticas.recalcular()
+        resumen.recalcular()
+        invalidar_resumen()
+        conteos = asdict(escala)
+        conteos["usuarios"] = len(usuarios)
+        return conteos
@@ -0,0 +1,221 @@
+"""Runner de benchmarks de la API sobre el cliente de tests de Django.
+
+Recorre todos los endpoints registrados en el router (listado, detalle,
+filtros, búsqueda, ordenamiento y acciones GET), mide latencia, cantidad de
+consultas y bytes de respuesta, y guarda el resultado en JSON para comparar
+corridas entre commits.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+RUTAS_EXTRA = [
+    ("dashboard", "/api/dashboard/"),
+    ("dashboard-resumen", "/api/dashboard/resumen/"),
+    ("dashboard-acciones", "/api/dashboard/acciones/estadisticas/"),
+    ("dashboard-entradas", "/api/dashboard/entradas/estadisticas/"),
+    ("filiales-mapa", "/api/filiales/mapa/"),
+]
+
+
+@dataclass
+class Caso:
+    nombre: str
+    url: str
+
+
+@dataclass
+class Resultado:
+    nombre: str
+    url: str
+    status: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    media_ms: float
+    consultas: int
+    bytes: int
+    muestras: int = field(default=0)
+
+
+def percentil(valores: list[float], porcentaje: float) -> float:
+    """Percentil por rango más cercano."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, math.ceil(porcentaje / 100 * len(ordenados)) - 1)
+    return ordenados[indice]
+
+
+def _muestra(model, filtros: Iterable[str]):
+    campos = ["pk", *filtros]
+    return model.objects.order_by("-pk").values(*campos).first()
+
+
+def casos_router(registry: Iterable[tuple[str, Any, str]]) -> list[Caso]:
+    """Arma los casos a medir a partir de ``router.registry``."""
+    casos: list[Caso] = []
+    for prefijo, viewset, basename in registry:
+        base = f"/api/{prefijo}/"
+        model = viewset.queryset.model
+        filtros = {
+            campo: lookups
+            for campo, lookups in (
+                getattr(viewset, "filterset_fields", None) or {}
+            ).items()
+            if "exact" in lookups and "__" not in campo
+        }
+        columnas = {campo: model._meta.get_field(campo).attname for campo in filtros}
+        muestra = _muestra(model, columnas.values())
+        casos.append(Caso(f"{basename}-list", base))
+        casos.append(Caso(f"{basename}-list-cursor", f"{base}?cursor="))
+        if muestra:
+            casos.append(Caso(f"{basename}-retrieve", f"{base}{muestra['pk']}/"))
+            for campo, columna in columnas.items():
+                valor = muestra[columna]
+                if valor is None:
+                    continue
+                if isinstance(valor, bool):
+                    valor = str(valor).lower()
+                casos.append(
+                    Caso(f"{basename}-filtro-{campo}", f"{base}?{campo}={valor}")
+                )
+        if getattr(viewset, "search_fields", None):
+            casos.append(Caso(f"{basename}-search", f"{base}?search=a"))
+        for campo in getattr(viewset, "ordering_fields", None) or []:
+            casos.append(
+                Caso(f"{basename}-ordering-{campo}", f"{base}?ordering=-{campo}")
+            )
+        for accion in viewset.get_extra_actions():
+            if "get" not in accion.mapping:
+                continue
+            if accion.detail:
+                if not muestra:
+                    continue
+                url = f"{base}{muestra['pk']}/{accion.url_path}/"
+            else:
+                url = f"{base}{accion.url_path}/"
+            casos.append(Caso(f"{basename}-{accion.url_path}", url))
+    return casos
+
+
+def _host() -> str:
+    hosts = [host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"]
+    return hosts[0] if hosts and "*" not in settings.ALLOWED_HOSTS else "testserver"
+
+
+def _tamano(respuesta) -> int:
+    if getattr(respuesta, "streaming", False):
+        return sum(len(parte) for parte in respuesta.streaming_content)
+    return len(respuesta.content)
+
+
+def medir(
+    casos: list[Caso],
+    usuario,
+    *,
+    iteraciones: int = 20,
+    calentamiento: int = 2,
+    aviso: Callable[[Resultado], None] | None = None,
+) -> list[Resultado]:
+    client = APIClient(HTTP_HOST=_host())
+    client.force_authenticate(usuario)
+    resultados = []
+    for caso in casos:
+        for _ in range(calentamiento):
+            _tamano(client.get(caso.url))
+        tiempos = []
+        for _ in range(iteraciones):
+            inicio = time.perf_counter()
+            respuesta = client.get(caso.url)
+            tamano = _tamano(respuesta)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        with CaptureQueriesContext(connection) as queries:
+            _tamano(client.get(caso.url))
+        resultado = Resultado(
+            nombre=caso.nombre,
+            url=caso.url,
+            status=respuesta.status_code,
+            p50_ms=round(percentil(tiempos, 50), 3),
+            p95_ms=round(percentil(tiempos, 95), 3),
+            p99_ms=round(percentil(tiempos, 99), 3),
+            media_ms=round(sum(tiempos) / len(tiempos), 3),
+            consultas=len(queries),
+            bytes=tamano,
+            muestras=len(tiempos),
+        )
+        resultados.append(resultado)
+        if aviso:
+            aviso(resultado)
+    return resultados
+
+
+def _commit() -> str | None:
+    try:
+        salida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return salida.stdout.strip() or None
+
+
+def guardar(resultados: list[Resultado], destino: Path, **meta: Any) -> dict:
+    informe = {
+        "meta": {
+            "commit": _commit(),
+            "fecha": datetime.now(timezone.utc).isoformat(),
+            "motor": connection.vendor,
+            "python": platform.python_version(),
+            **meta,
+        },
+        "resultados": [asdict(resultado) for resultado in resultados],
+    }
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    destino.write_text(json.dumps(informe, indent=2, ensure_ascii=False))
+    return informe
+
+
+def comparar(
+    base: dict, actual: dict, *, metrica: str = "p95_ms", umbral: float = 0.10
+) -> list[dict[str, Any]]:
+    """Compara dos informes y marca las regresiones mayores a ``umbral``."""
+    anteriores = {fila["nombre"]: fila for fila in base["resultados"]}
+    filas = []
+    for fila in actual["resultados"]:
+        anterior = anteriores.get(fila["nombre"])
+        if not anterior:
+            continue
+        previo, nuevo = anterior[metrica], fila[metrica]
+        variacion = (nuevo - previo) / previo if previo else 0.0
+        filas.append(
+            {
+                "nombre": fila["nombre"],
+                "antes": previo,
+                "despues": nuevo,
+                "variacion": round(variacion, 4),
+                "consultas_antes": anterior["consultas"],
+                "consultas_despues": fila["consultas"],
+                "regresion": variacion > umbral
+                or fila["consultas"] > anterior["consultas"],
+            }
+        )
+    return filas
@@ -46,6 +46,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.middleware.AuditBufferMiddleware",
+    "apps.core.middleware.QueryBudgetMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -90,6 +92,42 @@ else:
         }
     }
 
+
+def _cache_desde_url(url: str) -> dict[str, str]:
+    esquema, _, ubicacion = url.partition("://")
+    if esquema in ("redis", "rediss"):
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": url,
+        }
+    if esquema == "file":
+        return {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": ubicacion or "/tmp/filiales-cache",
+        }
+    if esquema == "locmem":
+        return {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": ubicacion or "filiales",
+        }
+    raise ValueError(f"CACHE_URL no soportada: {url}")
+
+
+# locmem:// (por proceso), file:///ruta o redis://host:6379/0 (compartida).
+CACHE_URL = os.getenv("CACHE_URL", "locmem://")
+CACHES = {
+    "default": {
+        **_cache_desde_url(CACHE_URL),
+        "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "filiales"),
+        # Incrementar CACHE_VERSION descarta todas las claves anteriores.
+        "VERSION": int(os.getenv("CACHE_VERSION", "1")),
+        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "300")),
+    }
+}
+# Nivel en memoria de cada proceso delante de CACHES (ver apps.core.cache).
+CACHE_LOCAL_MAX_ENTRADAS = int(os.getenv("CACHE_LOCAL_MAX_ENTRADAS", "1000"))
+CACHE_LOCAL_TTL = float(os.getenv("CACHE_LOCAL_TTL", "5"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"
@@ -113,13 +151,13 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.usuarios.authentication.PerfilJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.DefaultPageNumberPagination",
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
-        "rest_framework.filters.SearchFilter",
+        "apps.core.busqueda.BusquedaTextoFilter",
         "rest_framework.filters.OrderingFilter",
     ),
 }
@@ -132,6 +170,16 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Autoriza con los claims del token (rol, filial) sin leer usuario ni perfil de la base.
+# Requiere CACHE_URL compartida (redis:// o file://).
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() == "true"
+
+# Segundos que cada proceso reutiliza el usuario autenticado con su perfil (0 desactiva).
+AUTH_USUARIO_CACHE_TTL = float(os.getenv("AUTH_USUARIO_CACHE_TTL", "30"))
+AUTH_USUARIO_CACHE_MAX_ENTRADAS = int(
+    os.getenv("AUTH_USUARIO_CACHE_MAX_ENTRADAS", "1000")
+)
+
 SWAGGER_SETTINGS = {
     "USE_SESSION_AUTH": False,
     "SECURITY_DEFINITIONS": {
@@ -168,10 +216,52 @@ EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "false").lower() == "true"
 EMAIL_USE_SSL = os.getenv("EMAIL_USE_SSL", "false").lower() == "true"
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "notificaciones@filiales.com")
 EMAILS_ENABLED = os.getenv("EMAILS_ENABLED", "false").lower() == "true"
+# Las notificaciones se encolan y las envía `manage.py enviar_correos`.
+EMAILS_ASYNC = os.getenv("EMAILS_ASYNC", "true").lower() == "true"
+EMAIL_DIGEST = os.getenv("EMAIL_DIGEST", "true").lower() == "true"
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "200"))
+EMAIL_MAX_INTENTOS = int(os.getenv("EMAIL_MAX_INTENTOS", "5"))
+EMAIL_BACKOFF_BASE = int(os.getenv("EMAIL_BACKOFF_BASE", "60"))
+EMAIL_BACKOFF_MAX = int(os.getenv("EMAIL_BACKOFF_MAX", "3600"))
 
 WEBHOOKS_ENABLED = os.getenv("WEBHOOKS_ENABLED", "false").lower() == "true"
 WEBHOOK_URL_AUDITORIA = os.getenv("WEBHOOK_URL_AUDITORIA", "")
 WEBHOOK_URL_EVENTOS = os.getenv("WEBHOOK_URL_EVENTOS", "")
+# Los webhooks se encolan en el outbox y los entrega `manage.py enviar_webhooks`.
+WEBHOOKS_ASYNC = os.getenv("WEBHOOKS_ASYNC", "true").lower() == "true"
+WEBHOOK_TIMEOUT = int(os.getenv("WEBHOOK_TIMEOUT", "5"))
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "100"))
+WEBHOOK_POOL_SIZE = int(os.getenv("WEBHOOK_POOL_SIZE", "10"))
+WEBHOOK_MAX_INTENTOS = int(os.getenv("WEBHOOK_MAX_INTENTOS", "8"))
+WEBHOOK_BACKOFF_BASE = int(os.getenv("WEBHOOK_BACKOFF_BASE", "30"))
+WEBHOOK_BACKOFF_MAX = int(os.getenv("WEBHOOK_BACKOFF_MAX", "3600"))
+
+# Con AUDIT_SYNC cada acción se inserta al momento en lugar de agruparse por request.
+AUDIT_SYNC = os.getenv("AUDIT_SYNC", "false").lower() == "true"
+
+# Segundos que se cachean los contadores del dashboard (se invalidan por señales).
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv("DASHBOARD_CACHE_TIMEOUT", "300"))
+
+# Segundos que se cachean filiales, partidos y productos (se invalidan por señales).
+REFERENCIAS_CACHE_TIMEOUT = int(os.getenv("REFERENCIAS_CACHE_TIMEOUT", "3600"))
+
+# Segundos que se cachean las respuestas de @cachear_respuesta (mapa, partidos).
+RESPUESTAS_CACHE_TIMEOUT = int(os.getenv("RESPUESTAS_CACHE_TIMEOUT", "300"))
+
+# Broker de eventos en tiempo real: local:// (por proceso) o redis://host:6379/0.
+PUBSUB_URL = os.getenv("PUBSUB_URL", "local://")
+# Eventos que puede acumular un suscriptor lento antes de ser desconectado.
+PUBSUB_COLA_MAXIMA = int(os.getenv("PUBSUB_COLA_MAXIMA", "1000"))
+# Segundos entre keepalives y duración máxima de cada conexión al stream SSE.
+MENSAJES_STREAM_KEEPALIVE = float(os.getenv("MENSAJES_STREAM_KEEPALIVE", "15"))
+MENSAJES_STREAM_DURACION = float(os.getenv("MENSAJES_STREAM_DURACION", "300"))
+# Segundos de validez del ticket que abre el stream (POST /api/mensajes/stream-ticket/).
+MENSAJES_STREAM_TICKET_TTL = int(os.getenv("MENSAJES_STREAM_TICKET_TTL", "30"))
+
+# Fracción de requests en los que se controla el presupuesto de consultas SQL.
+QUERY_BUDGET_SAMPLE_RATE = float(os.getenv("QUERY_BUDGET_SAMPLE_RATE", "0.01"))
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "false").lower() == "true"
+QUERY_BUDGET_REPETICIONES = int(os.getenv("QUERY_BUDGET_REPETICIONES", "5"))
 
 LOGGING = {
     "version": 1,
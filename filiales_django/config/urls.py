@@ -4,11 +4,17 @@ from apps.auditoria.views import AccionViewSet
 from apps.acciones.views import AccionSolidariaViewSet
 from apps.entradas.views import AsignacionEntradaViewSet, SolicitudEntradaViewSet
 from apps.filiales.views import AutoridadViewSet, FilialMapaView, FilialViewSet
-from apps.mensajes.views import ConversacionViewSet, MensajeViewSet
+from apps.mensajes.views import (
+    ConversacionViewSet,
+    MensajeViewSet,
+    TicketStreamView,
+    stream_mensajes,
+)
 from apps.partidos.views import PartidoViewSet
 from apps.pedidos.views import PedidoItemViewSet, PedidoViewSet, ProductoViewSet
 from apps.core.views import (
     DashboardAccionesEstadisticasView,
+    DashboardCacheMetricasView,
     DashboardEntradasEstadisticasView,
     DashboardResumenView,
     DashboardView,
@@ -62,9 +68,12 @@ urlpatterns = [
     path("api/integrantes/me/", MeView.as_view(), name="integrantes-me"),  # Alias para compatibilidad
     path("api/dashboard/", DashboardView.as_view(), name="dashboard"),
     path("api/dashboard/resumen/", DashboardResumenView.as_view(), name="dashboard-resumen"),
+    path("api/dashboard/cache/", DashboardCacheMetricasView.as_view(), name="dashboard-cache"),
     path("api/dashboard/acciones/estadisticas/", DashboardAccionesEstadisticasView.as_view(), name="dashboard-acciones"),
     path("api/dashboard/entradas/estadisticas/", DashboardEntradasEstadisticasView.as_view(), name="dashboard-entradas"),
     path("api/filiales/mapa/", FilialMapaView.as_view(), name="filiales-mapa"),
+    path("api/mensajes/stream/", stream_mensajes, name="mensajes-stream"),
+    path("api/mensajes/stream-ticket/", TicketStreamView.as_view(), name="mensajes-stream-ticket"),
     # Endpoints de foro (stub - mapean a conversaciones y mensajes)
     path("api/foro/categorias/", CategoriaViewSet.as_view({"get": "list", "post": "create"}), name="foro-categorias"),
     path("api/foro/categorias/<slug:slug>/", CategoriaViewSet.as_view({"get": "retrieve", "put": "update", "patch": "partial_update", "delete": "destroy"}), name="foro-categoria-detail"),
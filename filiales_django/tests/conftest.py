@@ -4,12 +4,15 @@ import os
 from datetime import datetime, timedelta
 
 import pytest
+from apps.core.cache import limpiar_local
 from apps.entradas.models import SolicitudEntrada
 from apps.filiales.models import Filial
 from apps.partidos.models import Partido
 from apps.pedidos.models import Pedido, Producto
+from apps.usuarios import authentication
 from apps.usuarios.models import PerfilUsuario
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 os.environ.setdefault("USE_SQLITE", "true")
 os.environ.setdefault("EMAILS_ENABLED", "true")
@@ -18,6 +21,33 @@ os.environ.setdefault("WEBHOOKS_ENABLED", "true")
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def audit_sync(settings):
+    """Los tests corren dentro de una transacción: la auditoría se escribe al instante.
+
+    ``tests/test_audit.py`` lo desactiva para probar el buffer y el middleware.
+    """
+    settings.AUDIT_SYNC = True
+
+
+@pytest.fixture(autouse=True)
+def presupuesto_consultas(settings):
+    """Cada request de los tests respeta el ``query_budget`` de su vista y no repite N+1."""
+    settings.QUERY_BUDGET_STRICT = True
+
+
+@pytest.fixture(autouse=True)
+def limpiar_cache():
+    """El rollback de cada test no dispara señales: la caché no debe sobrevivirlo."""
+    cache.clear()
+    limpiar_local()
+    authentication.limpiar_cache()
+    yield
+    cache.clear()
+    limpiar_local()
+    authentication.limpiar_cache()
+
+
 @pytest.fixture
 def filial():
     return Filial.objects.create(
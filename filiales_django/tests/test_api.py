@@ -351,9 +351,10 @@ def test_conversacion_filial_y_mensajes(
     assert response.data["count"] == 1
 
     response = api_client.post(
-        f"/api/mensajes/{mensaje_id}/marcar-leido/", format="json"
+        f"/api/mensajes/{mensaje_id}/marcar-leido-hasta/", format="json"
     )
-    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["ultimo_leido"] == mensaje_id
 
     # usuario de otra filial no puede enviar mensaje en conversación privada
     otro_usuario = User.objects.create_user("otro", password="pass1234")
@@ -405,4 +406,4 @@ def test_auditoria_exportar_csv(api_client, admin_user, filial):
     response = api_client.get("/api/auditoria/exportar/")
     assert response.status_code == status.HTTP_200_OK
     assert response["Content-Type"] == "text/csv"
-    assert "Test" in response.content.decode()
+    assert "Test" in b"".join(response.streaming_content).decode()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import pytest
+from apps.auditoria.models import Accion
+from apps.core.audit import audit_buffer, log_action
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def buffered(settings):
+    settings.AUDIT_SYNC = False
+
+
+def _registrar(usuario, numero: int) -> None:
+    log_action(
+        usuario=usuario,
+        recurso="Test",
+        recurso_id=numero,
+        accion=Accion.Tipos.ACTUALIZAR,
+    )
+
+
+@pytest.mark.django_db
+def test_audit_buffer_inserta_una_sola_vez(
+    buffered, admin_user, django_capture_on_commit_callbacks
+):
+    with CaptureQueriesContext(connection) as queries:
+        with django_capture_on_commit_callbacks(execute=True):
+            with audit_buffer():
+                for numero in range(5):
+                    _registrar(admin_user, numero)
+            assert not Accion.objects.exists()
+    inserts = [q for q in queries if q["sql"].startswith("INSERT")]
+    assert len(inserts) == 1
+    assert Accion.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_audit_buffer_descarta_transacciones_revertidas(
+    buffered, admin_user, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        with audit_buffer():
+            _registrar(admin_user, 1)
+            try:
+                with transaction.atomic():
+                    _registrar(admin_user, 2)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+    assert list(Accion.objects.values_list("recurso_id", flat=True)) == ["1"]
+
+
+@pytest.mark.django_db
+def test_request_agrupa_auditoria(
+    buffered, admin_user, solicitud, django_capture_on_commit_callbacks
+):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            f"/api/solicitudes-entrada/{solicitud.id}/aprobar/",
+            {"cantidad_asignada": 5},
+            format="json",
+        )
+    assert response.status_code == 200
+    assert set(Accion.objects.values_list("accion", flat=True)) == {
+        Accion.Tipos.APROBAR,
+        Accion.Tipos.ASIGNAR_ENTRADAS,
+    }
+
+
+def _aprobar(client, solicitud, callbacks, cantidad: int = 5):
+    with CaptureQueriesContext(connection) as queries:
+        with callbacks(execute=True):
+            response = client.post(
+                f"/api/solicitudes-entrada/{solicitud.id}/aprobar/",
+                {"cantidad_asignada": cantidad},
+                format="json",
+            )
+    inserts = [
+        q for q in queries if q["sql"].startswith('INSERT INTO "auditoria_accion"')
+    ]
+    return response, inserts
+
+
+@pytest.mark.django_db
+def test_request_escribe_la_auditoria_en_un_insert_al_confirmar(
+    buffered, admin_user, solicitud, django_capture_on_commit_callbacks
+):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    response, inserts = _aprobar(client, solicitud, django_capture_on_commit_callbacks)
+    assert response.status_code == 200
+    assert len(inserts) == 1
+    assert Accion.objects.count() == 2
+
+    response, inserts = _aprobar(
+        client, solicitud, django_capture_on_commit_callbacks, cantidad=0
+    )
+    assert response.status_code == 400
+    assert inserts == []
+    assert Accion.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_request_fallido_no_deja_auditoria(
+    buffered,
+    admin_user,
+    solicitud,
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+):
+    monkeypatch.setitem(connection.settings_dict, "ATOMIC_REQUESTS", True)
+
+    def _falla(*args, **kwargs):
+        raise RuntimeError("webhook caído")
+
+    monkeypatch.setattr("apps.entradas.views.dispatch_webhook", _falla)
+    client = APIClient(raise_request_exception=False)
+    client.force_authenticate(admin_user)
+    response, inserts = _aprobar(client, solicitud, django_capture_on_commit_callbacks)
+    assert response.status_code == 500
+    assert inserts == []
+    assert not Accion.objects.exists()
+    solicitud.refresh_from_db()
+    assert solicitud.estado == solicitud.Estados.PENDIENTE
+
+
+@pytest.mark.django_db
+def test_falla_al_escribir_la_auditoria_no_anula_la_respuesta(
+    buffered,
+    admin_user,
+    solicitud,
+    monkeypatch,
+    caplog,
+    django_capture_on_commit_callbacks,
+):
+    def _falla(registros):
+        raise RuntimeError("tabla bloqueada")
+
+    monkeypatch.setattr("apps.core.audit._persistir", _falla)
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    response, _ = _aprobar(client, solicitud, django_capture_on_commit_callbacks)
+    assert response.status_code == 200
+    solicitud.refresh_from_db()
+    assert solicitud.estado != solicitud.Estados.PENDIENTE
+    assert "No se pudo escribir la auditoría de 2 acciones" in caplog.text
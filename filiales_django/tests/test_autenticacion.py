@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import pytest
+from apps.usuarios import authentication
+from apps.usuarios.models import PerfilUsuario
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def _cliente(usuario) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(usuario)}")
+    return client
+
+
+def _identidad(queries) -> list[str]:
+    return [
+        q["sql"]
+        for q in queries
+        if 'FROM "auth_user"' in q["sql"] or 'FROM "usuarios_perfilusuario"' in q["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_usuario_y_perfil_en_una_consulta_y_luego_cacheados(filial_user):
+    client = _cliente(filial_user)
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get("/api/dashboard/").status_code == 200
+    identidad = _identidad(queries)
+    assert len(identidad) == 1
+    assert "filiales_filial" in identidad[0]
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get("/api/dashboard/").status_code == 200
+    assert _identidad(queries) == []
+
+
+@pytest.mark.django_db
+def test_cambios_de_perfil_y_usuario_invalidan_la_cache(filial_user):
+    client = _cliente(filial_user)
+    assert client.get("/api/partidos/").status_code == 200
+    assert client.post("/api/partidos/", {}).status_code == 403
+
+    perfil = filial_user.perfil
+    perfil.rol = PerfilUsuario.Roles.ADMINISTRADOR
+    perfil.save()
+    assert client.post("/api/partidos/", {}).status_code == 400
+
+    filial_user.is_active = False
+    filial_user.save()
+    assert client.get("/api/partidos/").status_code == 401
+
+
+@pytest.mark.django_db
+def test_ttl_cero_desactiva_la_cache(settings, filial_user):
+    settings.AUTH_USUARIO_CACHE_TTL = 0
+    authentication.limpiar_cache()
+    client = _cliente(filial_user)
+    client.get("/api/dashboard/")
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/api/dashboard/")
+    assert len(_identidad(queries)) == 1
+
+
+@pytest.fixture
+def stateless(settings):
+    settings.AUTH_STATELESS = True
+
+
+def _login(client, username: str) -> dict:
+    respuesta = client.post(
+        "/api/auth/login/", {"username": username, "password": "pass1234"}
+    )
+    assert respuesta.status_code == 200
+    return respuesta.data
+
+
+@pytest.mark.django_db
+def test_stateless_autoriza_con_los_claims(stateless, filial_user, solicitud):
+    client = APIClient()
+    tokens = _login(client, filial_user.username)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    with CaptureQueriesContext(connection) as queries:
+        respuesta = client.get("/api/solicitudes-entrada/")
+    assert respuesta.status_code == 200
+    assert [fila["id"] for fila in respuesta.data["results"]] == [solicitud.id]
+    assert _identidad(queries) == []
+
+    creada = client.post(
+        "/api/solicitudes-entrada/",
+        {"partido": solicitud.partido_id, "cantidad_solicitada": 2},
+    )
+    assert creada.status_code == 201
+    assert creada.data["created_by"] == filial_user.id
+    assert creada.data["filial"] == solicitud.filial_id
+    assert client.get("/api/me/", follow=True).data["user"]["username"] == (
+        filial_user.username
+    )
+
+
+@pytest.mark.django_db
+def test_stateless_revoca_tokens_al_cambiar_el_perfil(stateless, filial_user):
+    client = APIClient()
+    tokens = _login(client, filial_user.username)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    assert client.post("/api/partidos/", {}).status_code == 403
+
+    perfil = filial_user.perfil
+    perfil.rol = PerfilUsuario.Roles.ADMINISTRADOR
+    perfil.save()
+    assert client.get("/api/partidos/").status_code == 401
+
+    client.credentials()
+    renovado = client.post("/api/auth/refresh/", {"refresh": tokens["refresh"]})
+    assert renovado.status_code == 200
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {renovado.data['access']}")
+    assert client.post("/api/partidos/", {}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_stateless_sobrevive_a_perder_la_version_en_cache(stateless, filial_user):
+    client = APIClient()
+    tokens = _login(client, filial_user.username)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get("/api/partidos/").status_code == 200
+    assert len(_identidad(queries)) == 1
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get("/api/partidos/").status_code == 200
+    assert _identidad(queries) == []
+
+
+def test_stateless_exige_cache_compartida(settings, tmp_path):
+    settings.AUTH_STATELESS = True
+    with pytest.raises(ImproperlyConfigured):
+        authentication.exigir_cache_compartida()
+
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        }
+    }
+    authentication.exigir_cache_compartida()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+
+import pytest
+from apps.auditoria.models import Accion
+from apps.filiales.models import Filial, FilialEstadisticas
+from apps.mensajes.models import Conversacion, Mensaje
+from bench.generador import ESCALAS, USUARIO_ADMIN, Generador
+from bench.runner import casos_router, comparar, medir, percentil
+from config.urls import router
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Sum
+
+ESCALA = replace(
+    ESCALAS["chica"],
+    filiales=4,
+    solicitudes=20,
+    pedidos=10,
+    acciones=10,
+    conversaciones=5,
+    mensajes=30,
+    auditoria=50,
+)
+
+
+@pytest.fixture
+def datos_bench():
+    return Generador(ESCALA, batch_size=7).generar()
+
+
+@pytest.mark.django_db
+def test_generador_inserta_por_lotes(datos_bench):
+    assert Filial.objects.count() == ESCALA.filiales
+    assert Mensaje.objects.count() == ESCALA.mensajes
+    assert Accion.objects.count() == ESCALA.auditoria
+    assert FilialEstadisticas.objects.count() == ESCALA.filiales
+    assert (
+        Conversacion.objects.aggregate(total=Sum("total_mensajes"))["total"]
+        == ESCALA.mensajes
+    )
+    assert not Conversacion.objects.filter(
+        total_mensajes__gt=0, ultimo_mensaje_at__isnull=True
+    ).exists()
+    with pytest.raises(ValueError):
+        Generador(ESCALA).generar()
+
+
+@pytest.mark.django_db
+def test_runner_mide_endpoints_del_router(datos_bench):
+    casos = casos_router(router.registry)
+    nombres = {caso.nombre for caso in casos}
+    assert {"filial-list", "filial-retrieve", "auditoria-exportar"} <= nombres
+    assert "pedido-filtro-estado" in nombres
+    usuario = get_user_model().objects.get(username=USUARIO_ADMIN)
+    seleccion = [caso for caso in casos if caso.nombre.startswith("mensaje-")]
+    resultados = medir(seleccion, usuario, iteraciones=3, calentamiento=0)
+    assert all(resultado.status == 200 for resultado in resultados)
+    assert all(
+        resultado.consultas > 0 and resultado.bytes > 0 for resultado in resultados
+    )
+
+    informe = {"resultados": [vars(resultado) for resultado in resultados]}
+    peor = {
+        "resultados": [
+            dict(fila, p95_ms=fila["p95_ms"] * 2 + 1) for fila in informe["resultados"]
+        ]
+    }
+    assert all(fila["regresion"] for fila in comparar(informe, peor))
+
+
+def test_percentil_rango_mas_cercano():
+    valores = [float(valor) for valor in range(1, 101)]
+    assert percentil(valores, 50) == 50
+    assert percentil(valores, 99) == 99
+    assert percentil([], 95) == 0.0
+
+
+@pytest.mark.django_db
+def test_comando_bench_api_guarda_json(datos_bench, tmp_path):
+    salida = tmp_path / "bench.json"
+    call_command(
+        "bench_api",
+        "--filtro",
+        "dashboard",
+        "--iteraciones",
+        "2",
+        "--salida",
+        str(salida),
+    )
+    informe = json.loads(salida.read_text())
+    assert informe["meta"]["iteraciones"] == 2
+    assert {fila["nombre"] for fila in informe["resultados"]} >= {"dashboard"}
+    call_command(
+        "bench_api",
+        "--filtro",
+        "dashboard",
+        "--iteraciones",
+        "2",
+        "--salida",
+        str(tmp_path / "otra.json"),
+        "--comparar",
+        str(salida),
+        "--umbral",
+        "1000",
+    )
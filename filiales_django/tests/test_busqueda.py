@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pytest
+from apps.core import busqueda
+from apps.mensajes.models import Conversacion, Mensaje
+from apps.mensajes.views import ConversacionViewSet, MensajeViewSet
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+
+@pytest.fixture
+def mensajes(admin_user, filial):
+    conversacion = Conversacion.objects.create(
+        asunto="Viaje a la final", creada_por=admin_user, filial=filial
+    )
+    return [
+        Mensaje.objects.create(
+            conversacion=conversacion, emisor=admin_user, texto=texto
+        )
+        for texto in ("Confirmamos el micro", "La cena es el viernes")
+    ]
+
+
+@pytest.mark.django_db
+def test_sqlite_recurre_al_search_filter(admin_user, mensajes):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    respuesta = client.get("/api/mensajes/", {"search": "micro"})
+    assert [fila["id"] for fila in respuesta.data["results"]] == [mensajes[0].id]
+    # Los campos relacionados siguen buscándose con ILIKE.
+    respuesta = client.get("/api/mensajes/", {"search": "final"})
+    assert respuesta.data["count"] == 2
+
+
+@pytest.mark.django_db
+def test_postgres_filtra_por_la_columna_indexada():
+    sql = str(busqueda.buscar(Mensaje.objects.all(), ["micro", "Riv"]).query)
+    select, _, condicion = sql.partition(" WHERE ")
+    assert '"busqueda"' not in select
+    assert '"mensajes_mensaje"."busqueda") @@ (to_tsquery' in condicion
+    assert "'micro':*" in condicion and "'Riv':*" in condicion
+    assert "es_unaccent" in condicion
+    assert "ORDER BY ts_rank(" in condicion
+
+
+@pytest.mark.django_db
+def test_consulta_prefijo_escapa_comillas():
+    sql = str(busqueda.buscar(Mensaje.objects.all(), ["O'Higgins"]).query)
+    assert "'O''Higgins':*" in sql
+
+
+@pytest.mark.django_db
+def test_postgres_combina_la_columna_con_los_campos_relacionados(
+    admin_user, monkeypatch
+):
+    monkeypatch.setattr(busqueda, "_es_postgres", lambda queryset: True)
+    request = APIRequestFactory().get("/api/mensajes/", {"search": "fin micro"})
+    request.user = admin_user
+    vista = MensajeViewSet(request=Request(request), format_kwarg=None)
+    queryset = busqueda.BusquedaTextoFilter().filter_queryset(
+        vista.request, Mensaje.objects.all(), vista
+    )
+    condicion = str(queryset.query).partition(" WHERE ")[2]
+    # Cada término: prefijo en la columna OR icontains en la conversación.
+    assert condicion.count("@@ (to_tsquery") == 2
+    assert condicion.count('"mensajes_conversacion"."asunto" LIKE') == 2
+    assert "%fin%" in condicion and "'fin':*" in condicion
+
+
+@pytest.mark.django_db
+def test_filtro_solo_usa_texto_completo_en_vistas_marcadas(monkeypatch):
+    filtro = busqueda.BusquedaTextoFilter()
+    queryset = Mensaje.objects.all()
+    assert not filtro.usa_texto_completo(queryset, MensajeViewSet())
+    monkeypatch.setattr(busqueda, "_es_postgres", lambda queryset: True)
+    assert filtro.usa_texto_completo(queryset, MensajeViewSet())
+    assert not filtro.usa_texto_completo(queryset, ConversacionViewSet())
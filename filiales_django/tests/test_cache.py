@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+from apps.core import cache as cache_api
+from apps.core.cache import LRULocal
+from django.core.cache import cache
+
+
+@pytest.fixture
+def metricas():
+    cache_api.reiniciar_metricas()
+    yield
+    cache_api.reiniciar_metricas()
+
+
+def test_lru_local_desaloja_y_vence(monkeypatch):
+    ahora = [100.0]
+    monkeypatch.setattr("apps.core.cache.time.monotonic", lambda: ahora[0])
+    lru = LRULocal(max_entradas=2, ttl=10)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    assert lru.get("b") is cache_api._AUSENTE
+    assert len(lru) == 2
+    lru.set("corta", 4, ttl=1)
+    ahora[0] += 2
+    assert lru.get("corta") is cache_api._AUSENTE
+    assert lru.get("c") == 3
+    ahora[0] += 10
+    assert lru.get("c") is cache_api._AUSENTE
+
+
+def test_lectura_pasa_por_el_nivel_local(metricas):
+    calculos = []
+    for _ in range(3):
+        valor = cache_api.obtener_o_calcular(
+            "prueba:valor", lambda: calculos.append(1) or {"x": 1}
+        )
+    assert valor == {"x": 1}
+    assert len(calculos) == 1
+    assert cache_api.metricas()["local"] == 2
+
+    cache_api.limpiar_local()
+    assert cache_api.obtener("prueba:valor") == {"x": 1}
+    assert cache_api.metricas()["compartida"] == 1
+
+
+def test_invalidar_tag_afecta_a_otros_procesos(metricas):
+    cache_api.guardar("prueba:a", 1, tags=["filial:1"])
+    cache_api.guardar("prueba:b", 2, tags=["filial:1", "global"])
+    cache_api.guardar("prueba:c", 3, tags=["filial:2"])
+    # Otro proceso tendría la entrada en su propio nivel local: la versión del
+    # tag se controla contra la caché compartida en cada lectura.
+    cache_api.invalidar_tags("filial:1")
+    assert cache_api.obtener("prueba:a") is None
+    assert cache_api.obtener("prueba:b") is None
+    assert cache_api.obtener("prueba:c") == 3
+
+
+def test_valor_calculado_durante_invalidacion_nace_obsoleto():
+    def calcular():
+        cache_api.invalidar_tags("carrera")
+        return "viejo"
+
+    assert cache_api.obtener_o_calcular("prueba:carrera", calcular, tags=["carrera"])
+    assert cache_api.obtener("prueba:carrera") is None
+
+
+def test_tag_desalojado_no_revive_entradas_viejas():
+    cache_api.guardar("prueba:tag", "v1", tags=["t"])
+    cache.delete("tag:t")
+    assert cache_api.obtener("prueba:tag") is None
+
+
+def test_borrar_y_claves_versionadas():
+    cache_api.guardar("prueba:borrar", "x")
+    cache_api.borrar("prueba:borrar")
+    assert cache_api.obtener("prueba:borrar", "nada") == "nada"
+
+    cache_api.guardar("prueba:version", "v1")
+    assert cache.make_key("prueba:version").startswith("filiales:1:")
+    cache_api.guardar("prueba:none", None)
+    assert cache_api.obtener("prueba:none", "default") is None
+
+
+def test_timeout_cero_no_queda_en_el_nivel_local():
+    cache_api.guardar("prueba:efimera", "x", timeout=0)
+    assert cache_api.obtener("prueba:efimera") is None
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from apps.core.permissions import RoleBasedPermission
+from apps.entradas.models import SolicitudEntrada
+from apps.pedidos.models import PedidoItem, Producto
+from apps.pedidos.views import ProductoViewSet
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def admin_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    return client
+
+
+@pytest.mark.django_db
+def test_listado_responde_304_sin_serializar(admin_client, producto):
+    respuesta = admin_client.get("/api/productos/")
+    etag = respuesta["ETag"]
+    assert etag.startswith('W/"')
+    assert "Last-Modified" not in respuesta
+    assert "no-cache" in respuesta["Cache-Control"]
+
+    with CaptureQueriesContext(connection) as queries:
+        no_modificado = admin_client.get("/api/productos/", HTTP_IF_NONE_MATCH=etag)
+    assert no_modificado.status_code == 304
+    assert no_modificado["ETag"] == etag
+    assert len([q for q in queries if "pedidos_producto" in q["sql"]]) == 1
+
+    producto.nombre = "Otro producto"
+    producto.save()
+    cambiado = admin_client.get("/api/productos/", HTTP_IF_NONE_MATCH=etag)
+    assert cambiado.status_code == 200
+    assert cambiado["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_baja_y_alcance_cambian_el_etag(admin_client, filial_user, solicitud):
+    etag = admin_client.get("/api/solicitudes-entrada/")["ETag"]
+
+    client = APIClient()
+    client.force_authenticate(filial_user)
+    assert client.get("/api/solicitudes-entrada/")["ETag"] != etag
+
+    SolicitudEntrada.objects.filter(pk=solicitud.pk).delete()
+    respuesta = admin_client.get("/api/solicitudes-entrada/", HTTP_IF_NONE_MATCH=etag)
+    assert respuesta.status_code == 200
+
+
+@pytest.mark.django_db
+def test_listado_ignora_if_modified_since_tras_una_baja(admin_client, producto):
+    otro = Producto.objects.create(
+        nombre="Gorra", sku="SKU-02", categoria="Merchandising", unidad="unidad"
+    )
+    desde = http_date(time.time() + 60)
+    otro.delete()
+    respuesta = admin_client.get("/api/productos/", HTTP_IF_MODIFIED_SINCE=desde)
+    assert respuesta.status_code == 200
+    assert [fila["id"] for fila in respuesta.data["results"]] == [producto.id]
+
+    detalle = admin_client.get(f"/api/productos/{producto.id}/")
+    assert detalle["Last-Modified"]
+    assert (
+        admin_client.get(
+            f"/api/productos/{producto.id}/",
+            HTTP_IF_MODIFIED_SINCE=detalle["Last-Modified"],
+        ).status_code
+        == 304
+    )
+
+
+@pytest.mark.django_db
+def test_listado_filtra_una_sola_vez(admin_client, producto, monkeypatch):
+    llamadas = []
+    original = ProductoViewSet.filter_queryset
+
+    def contar(self, queryset):
+        llamadas.append(self.action)
+        return original(self, queryset)
+
+    monkeypatch.setattr(ProductoViewSet, "filter_queryset", contar)
+    assert admin_client.get("/api/productos/").status_code == 200
+    assert llamadas == ["list"]
+
+
+@pytest.mark.django_db
+def test_detalle_condicional(admin_client, pedido, producto):
+    url = f"/api/pedidos/{pedido.id}/"
+    etag = admin_client.get(url)["ETag"]
+    assert admin_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # Los items se serializan dentro del pedido: un alta cambia el ETag.
+    PedidoItem.objects.create(pedido=pedido, producto=producto, cantidad=2)
+    assert admin_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+    assert admin_client.get("/api/pedidos/no-existe/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_detalle_verifica_permisos_antes_del_304(admin_client, pedido, monkeypatch):
+    url = f"/api/pedidos/{pedido.id}/"
+    etag = admin_client.get(url)["ETag"]
+    monkeypatch.setattr(
+        RoleBasedPermission, "has_object_permission", lambda *args: False
+    )
+    assert admin_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 403
+
+
+@pytest.mark.django_db
+def test_cupo_actualizado_invalida_el_etag(admin_client, partido, solicitud):
+    url = f"/api/partidos/{partido.id}/"
+    etag = admin_client.get(url)["ETag"]
+    admin_client.post(
+        f"/api/solicitudes-entrada/{solicitud.id}/aprobar/",
+        {"cantidad_asignada": 5},
+        format="json",
+    )
+    respuesta = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert respuesta.status_code == 200
+    assert respuesta.data["cupo_disponible"] == 195
+
+
+@pytest.mark.django_db
+def test_dashboard_condicional(admin_client, filial, filial_user, partido):
+    etag = admin_client.get("/api/dashboard/")["ETag"]
+    assert (
+        admin_client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    )
+
+    SolicitudEntrada.objects.create(
+        filial=filial, partido=partido, cantidad_solicitada=2, created_by=filial_user
+    )
+    assert (
+        admin_client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+    )
+
+
+@pytest.mark.django_db
+def test_paginacion_sin_conteo_no_calcula_etag(admin_client, partido):
+    respuesta = admin_client.get("/api/partidos/", {"cursor": ""})
+    assert respuesta.status_code == 200
+    assert "ETag" not in respuesta
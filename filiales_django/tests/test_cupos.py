@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import pytest
+from apps.auditoria.models import Accion
+from apps.entradas import cupos
+from apps.entradas.models import AsignacionEntrada, SolicitudEntrada
+from apps.filiales import estadisticas
+from apps.partidos.models import Partido
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+def _aprobar(api_client, solicitud, cantidad):
+    return api_client.post(
+        f"/api/solicitudes-entrada/{solicitud.id}/aprobar/",
+        {"cantidad_asignada": cantidad},
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+def test_aprobar_descuenta_cupo_atomicamente(api_client, admin_user, solicitud):
+    api_client.force_authenticate(admin_user)
+    response = _aprobar(api_client, solicitud, 20)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["estado"] == SolicitudEntrada.Estados.APROBADA
+    solicitud.partido.refresh_from_db()
+    assert solicitud.partido.cupo_disponible == 180
+    assert estadisticas.verificar() == {}
+
+
+@pytest.mark.django_db
+def test_aprobar_sin_cupo_no_persiste_nada(api_client, admin_user, solicitud):
+    Partido.objects.filter(pk=solicitud.partido_id).update(cupo_disponible=10)
+    api_client.force_authenticate(admin_user)
+    response = _aprobar(api_client, solicitud, 15)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not AsignacionEntrada.objects.exists()
+    solicitud.refresh_from_db()
+    assert solicitud.estado == SolicitudEntrada.Estados.PENDIENTE
+    solicitud.partido.refresh_from_db()
+    assert solicitud.partido.cupo_disponible == 10
+
+
+@pytest.mark.django_db
+def test_reservar_nunca_sobrevende(partido):
+    cupos.reservar(partido.id, 150)
+    with pytest.raises(cupos.CupoInsuficienteError):
+        cupos.reservar(partido.id, 51)
+    cupos.reservar(partido.id, 50)
+    partido.refresh_from_db()
+    assert partido.cupo_disponible == 0
+
+
+@pytest.mark.django_db
+def test_partido_sin_cupo_total_no_tiene_limite(partido):
+    Partido.objects.filter(pk=partido.pk).update(cupo_total=None, cupo_disponible=None)
+    cupos.reservar(partido.id, 10_000)
+    partido.refresh_from_db()
+    assert partido.cupo_disponible is None
+
+
+@pytest.mark.django_db
+def test_borrar_asignacion_libera_cupo(solicitud, admin_user):
+    asignacion = cupos.asignar(solicitud, 12, admin_user)
+    asignacion.delete()
+    solicitud.partido.refresh_from_db()
+    assert solicitud.partido.cupo_disponible == 200
+
+
+@pytest.mark.django_db
+def test_reconciliar_cupos(solicitud, admin_user):
+    cupos.asignar(solicitud, 12, admin_user)
+    Partido.objects.filter(pk=solicitud.partido_id).update(cupo_disponible=7)
+
+    with pytest.raises(CommandError):
+        call_command("reconciliar_cupos", "--verificar")
+    call_command("reconciliar_cupos")
+    call_command("reconciliar_cupos", "--verificar")
+    solicitud.partido.refresh_from_db()
+    assert solicitud.partido.cupo_disponible == 188
+
+
+def _solicitudes(filial, partido, usuario, *cantidades):
+    return [
+        SolicitudEntrada.objects.create(
+            filial=filial,
+            partido=partido,
+            cantidad_solicitada=cantidad,
+            created_by=usuario,
+        )
+        for cantidad in cantidades
+    ]
+
+
+def _asignar_lote(api_client, partido, a, b, c, d):
+    return api_client.post(
+        f"/api/partidos/{partido.id}/asignar-lote/",
+        {
+            "asignaciones": [
+                {"solicitud": a.id, "cantidad": 50},
+                {"solicitud": b.id, "cantidad": 30},
+                {"solicitud": c.id, "cantidad": 30},
+                {"solicitud": d.id, "cantidad": 25},
+                {"solicitud": d.id, "cantidad": 20},
+                {"solicitud": 999_999, "cantidad": 1},
+            ]
+        },
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+def test_asignar_lote_informa_fallos_parciales(
+    api_client,
+    admin_user,
+    filial,
+    otra_filial,
+    partido,
+    filial_user,
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+):
+    eventos = []
+    monkeypatch.setattr(
+        "apps.partidos.views.dispatch_webhooks",
+        lambda evento, payloads: eventos.extend(payloads),
+    )
+    Partido.objects.filter(pk=partido.pk).update(cupo_total=100, cupo_disponible=100)
+    a, b, c = _solicitudes(filial, partido, filial_user, 50, 40, 30)
+    (d,) = _solicitudes(otra_filial, partido, filial_user, 20)
+    api_client.force_authenticate(admin_user)
+    with CaptureQueriesContext(connection) as queries:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = _asignar_lote(api_client, partido, a, b, c, d)
+    assert response.status_code == status.HTTP_207_MULTI_STATUS
+    inserts = [
+        q for q in queries if q["sql"].startswith('INSERT INTO "auditoria_accion"')
+    ]
+    assert len(inserts) == 1
+    assert Accion.objects.count() == 6
+    assert [fila["solicitud"] for fila in response.data["asignadas"]] == [
+        a.id,
+        b.id,
+        d.id,
+    ]
+    assert {fila["solicitud"] for fila in response.data["errores"]} == {
+        c.id,
+        d.id,
+        999_999,
+    }
+    assert response.data["cupo_disponible"] == 0
+    partido.refresh_from_db()
+    assert partido.cupo_disponible == 0
+    b.refresh_from_db()
+    assert b.estado == SolicitudEntrada.Estados.PARCIAL
+    assert AsignacionEntrada.objects.count() == 3
+    assert sorted(evento["filial_id"] for evento in eventos) == sorted(
+        [filial.id, otra_filial.id]
+    )
+    assert estadisticas.verificar() == {}
+    assert cupos.reconciliar(corregir=False) == {}
+
+
+@pytest.mark.django_db
+def test_asignar_lote_revierte_si_falla_la_auditoria(
+    admin_user, filial, otra_filial, partido, filial_user, monkeypatch
+):
+    def _falla(registros):
+        raise RuntimeError("auditoría caída")
+
+    monkeypatch.setattr("apps.partidos.views.registrar", _falla)
+    a, b, c = _solicitudes(filial, partido, filial_user, 50, 40, 30)
+    (d,) = _solicitudes(otra_filial, partido, filial_user, 20)
+    client = APIClient(raise_request_exception=False)
+    client.force_authenticate(admin_user)
+    response = _asignar_lote(client, partido, a, b, c, d)
+    assert response.status_code == 500
+    assert not AsignacionEntrada.objects.exists()
+    partido.refresh_from_db()
+    assert partido.cupo_disponible == 200
+    a.refresh_from_db()
+    assert a.estado == SolicitudEntrada.Estados.PENDIENTE
+
+
+@pytest.mark.django_db
+def test_asignar_lote_todo_o_nada(api_client, admin_user, filial, partido, filial_user):
+    a, b = _solicitudes(filial, partido, filial_user, 10, 10)
+    api_client.force_authenticate(admin_user)
+    response = api_client.post(
+        f"/api/partidos/{partido.id}/asignar-lote/",
+        {
+            "asignaciones": [
+                {"solicitud": a.id, "cantidad": 10},
+                {"solicitud": b.id, "cantidad": 11},
+            ],
+            "parcial": False,
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["errores"][0]["solicitud"] == b.id
+    assert not AsignacionEntrada.objects.exists()
+    partido.refresh_from_db()
+    assert partido.cupo_disponible == 200
+
+
+@pytest.mark.django_db
+def test_asignar_lote_requiere_admin(api_client, filial_user, partido):
+    api_client.force_authenticate(filial_user)
+    response = api_client.post(
+        f"/api/partidos/{partido.id}/asignar-lote/",
+        {"asignaciones": [{"solicitud": 1, "cantidad": 1}]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_total_asignado_se_mantiene_al_crear_y_borrar(solicitud, admin_user):
+    cupos.asignar(solicitud, 5, admin_user)
+    asignacion = AsignacionEntrada.objects.create(
+        solicitud=solicitud, cantidad_asignada=3, asignado_por=admin_user
+    )
+    solicitud.refresh_from_db()
+    assert solicitud.total_asignado == 8
+    asignacion.delete()
+    solicitud.refresh_from_db()
+    assert solicitud.total_asignado == 5
+    assert cupos.recalcular_totales(corregir=False) == {}
+
+
+@pytest.mark.django_db
+def test_asignar_lote_actualiza_total_asignado(
+    api_client, admin_user, filial, partido, filial_user
+):
+    a, b = _solicitudes(filial, partido, filial_user, 10, 10)
+    api_client.force_authenticate(admin_user)
+    api_client.post(
+        f"/api/partidos/{partido.id}/asignar-lote/",
+        {"asignaciones": [{"solicitud": a.id, "cantidad": 4}]},
+        format="json",
+    )
+    response = api_client.get(
+        "/api/solicitudes-entrada/",
+        {"total_asignado__gte": 1, "ordering": "-total_asignado"},
+    )
+    assert [fila["id"] for fila in response.data["results"]] == [a.id]
+    assert response.data["results"][0]["total_asignado"] == 4
+    assert cupos.recalcular_totales(corregir=False) == {}
+
+
+@pytest.mark.django_db
+def test_rebuild_total_asignado(solicitud, admin_user):
+    cupos.asignar(solicitud, 6, admin_user)
+    SolicitudEntrada.objects.filter(pk=solicitud.pk).update(total_asignado=0)
+
+    with pytest.raises(CommandError):
+        call_command("rebuild_total_asignado", "--verificar")
+    call_command("rebuild_total_asignado")
+    call_command("rebuild_total_asignado", "--verificar")
+    solicitud.refresh_from_db()
+    assert solicitud.total_asignado == 6
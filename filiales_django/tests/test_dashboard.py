@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from apps.acciones.models import AccionSolidaria
+from apps.core import dashboard
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def metricas():
+    dashboard.reiniciar_metricas()
+    yield
+    dashboard.reiniciar_metricas()
+
+
+@pytest.mark.django_db
+def test_resumen_en_una_sola_consulta(filial, otra_filial, solicitud):
+    with CaptureQueriesContext(connection) as queries:
+        resumen = dashboard.calcular_resumen()
+    assert len(queries) == 1
+    assert resumen == {
+        "total_filiales": 2,
+        "filiales_activas": 2,
+        "total_integrantes": 0,
+        "total_acciones": 0,
+        "total_entradas": 1,
+        "solicitudes_pendientes": 1,
+    }
+    assert dashboard.calcular_resumen(otra_filial.id)["total_entradas"] == 0
+
+
+@pytest.mark.django_db
+def test_resumen_cacheado_e_invalidado_por_senales(metricas, filial, filial_user):
+    client = APIClient()
+    client.force_authenticate(filial_user)
+    assert client.get("/api/dashboard/").data["total_acciones"] == 0
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get("/api/dashboard/resumen/").data["filiales_activas"] == 1
+    assert not [q for q in queries if "COUNT" in q["sql"]]
+
+    AccionSolidaria.objects.create(
+        filial=filial, nombre="Colecta", descripcion="Ropa", fecha=date.today()
+    )
+    assert client.get("/api/dashboard/").data["total_acciones"] == 1
+    assert dashboard.metricas_cache()["hits"] == 1
+    assert dashboard.metricas_cache()["misses"] == 2
+
+
+@pytest.mark.django_db
+def test_metricas_solo_para_admin(metricas, admin_user, filial_user):
+    client = APIClient()
+    client.force_authenticate(filial_user)
+    assert client.get("/api/dashboard/cache/").status_code == 403
+    client.force_authenticate(admin_user)
+    respuesta = client.get("/api/dashboard/cache/")
+    assert respuesta.status_code == 200
+    assert respuesta.data["hit_ratio"] == 0.0
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+from apps.entradas import distribucion
+from apps.entradas.models import AsignacionEntrada, SolicitudEntrada
+from apps.filiales import estadisticas
+from apps.partidos.models import Partido
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+def test_proporcional_reparte_por_mayores_restos():
+    asignado = distribucion.proporcional([(1, 10), (2, 20), (3, 30)], 10)
+    assert asignado == {1: 2, 2: 3, 3: 5}
+    assert distribucion.proporcional([(1, 5), (2, 5)], 20) == {1: 5, 2: 5}
+
+
+def test_maxmin_cubre_primero_las_chicas():
+    asignado = distribucion.maxmin([(1, 2), (2, 10), (3, 10), (4, 3)], 16)
+    assert asignado == {1: 2, 4: 3, 2: 6, 3: 5}
+
+
+def test_repartir_prioriza_socios():
+    asignado = distribucion.repartir([(1, 8)], [(2, 8), (3, 8)], 10)
+    assert asignado == {1: 8, 2: 1, 3: 1}
+    assert distribucion.repartir([(1, 8)], [(2, 8)], None) == {1: 8, 2: 8}
+
+
+@pytest.mark.parametrize("metodo", sorted(distribucion.METODOS))
+def test_metodos_respetan_cupo_y_demanda_a_escala(metodo):
+    rnd = random.Random(7)
+    demandas = [(pk, rnd.randint(1, 80)) for pk in range(50_000)]
+    inicio = time.perf_counter()
+    asignado = distribucion.METODOS[metodo](demandas, 400_000)
+    assert time.perf_counter() - inicio < 1
+    assert sum(asignado.values()) == 400_000
+    assert all(0 <= asignado[pk] <= cantidad for pk, cantidad in demandas)
+
+
+@pytest.fixture
+def solicitudes(filial, otra_filial, partido, filial_user, admin_user):
+    Partido.objects.filter(pk=partido.pk).update(cupo_total=30, cupo_disponible=30)
+    filial_user.perfil.es_socio = True
+    filial_user.perfil.save(update_fields=["es_socio"])
+    return [
+        SolicitudEntrada.objects.create(
+            filial=filial_,
+            partido=partido,
+            cantidad_solicitada=cantidad,
+            created_by=usuario,
+        )
+        for filial_, usuario, cantidad in [
+            (filial, filial_user, 20),
+            (otra_filial, admin_user, 20),
+            (otra_filial, admin_user, 5),
+        ]
+    ]
+
+
+@pytest.mark.django_db
+def test_distribuir_previsualiza_sin_escribir(admin_user, partido, solicitudes):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    response = client.post(f"/api/partidos/{partido.id}/distribuir/", {}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["confirmado"] is False
+    assert response.data["total_asignado"] == 30
+    asignado = {
+        fila["id"]: fila["cantidad_asignada"] for fila in response.data["solicitudes"]
+    }
+    assert asignado == {
+        solicitudes[0].id: 20,
+        solicitudes[1].id: 5,
+        solicitudes[2].id: 5,
+    }
+    assert not AsignacionEntrada.objects.exists()
+
+
+@pytest.mark.django_db
+def test_distribuir_confirma_en_bloque(admin_user, partido, solicitudes):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    response = client.post(
+        f"/api/partidos/{partido.id}/distribuir/",
+        {"metodo": "proporcional", "prioridad_socios": False, "confirmar": True},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["confirmado"] is True
+    assert response.data["cupo_disponible"] == 0
+    assert AsignacionEntrada.objects.count() == 3
+    estados = set(SolicitudEntrada.objects.values_list("estado", flat=True).distinct())
+    assert estados == {SolicitudEntrada.Estados.PARCIAL}
+    assert estadisticas.verificar() == {}
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import smtplib
+from io import StringIO
+
+import pytest
+from apps.core.emails import enviar_pendientes
+from apps.core.models import CorreoSaliente
+from apps.core.services import send_notification_email
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.fixture
+def emails_async(settings):
+    settings.EMAILS_ENABLED = True
+    settings.EMAILS_ASYNC = True
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+
+@pytest.mark.django_db
+def test_send_notification_email_encola_por_destinatario(emails_async):
+    send_notification_email("Asunto", "Mensaje", ["a@test.com", "", "b@test.com"])
+
+    assert not mail.outbox
+    assert set(CorreoSaliente.objects.values_list("destinatario", flat=True)) == {
+        "a@test.com",
+        "b@test.com",
+    }
+
+
+@pytest.mark.django_db
+def test_digest_agrupa_rafagas_por_destinatario(emails_async):
+    for numero in range(50):
+        send_notification_email(
+            "Solicitud de entradas aprobada",
+            f"Se aprobó la solicitud {numero}.",
+            ["filial@test.com"],
+        )
+    send_notification_email("Filial habilitada", "Habilitada.", ["otra@test.com"])
+
+    resultado = enviar_pendientes(digest=True)
+
+    assert resultado.enviados == 51
+    assert resultado.correos == 2
+    digest = next(email for email in mail.outbox if email.to == ["filial@test.com"])
+    assert digest.subject == "Resumen de notificaciones (50)"
+    assert "Se aprobó la solicitud 49." in digest.body
+    assert not CorreoSaliente.objects.filter(
+        estado=CorreoSaliente.Estados.PENDIENTE
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_sin_digest_fusiona_solo_duplicados(emails_async):
+    for _ in range(3):
+        send_notification_email("Pedido aprobado", "El pedido 1.", ["f@test.com"])
+    send_notification_email("Pedido rechazado", "El pedido 2.", ["f@test.com"])
+
+    resultado = enviar_pendientes(digest=False)
+
+    assert resultado.correos == 2
+    assert sorted(email.subject for email in mail.outbox) == [
+        "Pedido aprobado",
+        "Pedido rechazado",
+    ]
+
+
+@pytest.mark.django_db
+def test_fallo_de_envio_reintenta(emails_async, monkeypatch):
+    send_notification_email("Asunto", "Mensaje", ["a@test.com"])
+
+    def falla(self, messages):
+        raise ConnectionError("SMTP caído")
+
+    monkeypatch.setattr(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages", falla
+    )
+    resultado = enviar_pendientes()
+
+    correo = CorreoSaliente.objects.get()
+    assert resultado.reintentos == 1
+    assert correo.estado == CorreoSaliente.Estados.PENDIENTE
+    assert correo.intentos == 1
+    assert "SMTP caído" in correo.ultimo_error
+
+
+class BackendQueSeCorta(EmailBackend):
+    """Como el SMTP: ``open()`` no reconecta mientras ``connection`` esté asignada."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection = None
+        self.aperturas = 0
+        self.cortar_en = "b@test.com"
+
+    def open(self):
+        if self.connection:
+            return False
+        self.aperturas += 1
+        self.connection = f"conexion-{self.aperturas}"
+        return True
+
+    def close(self):
+        self.connection = None
+
+    def send_messages(self, messages):
+        # Como el SMTP: si tuvo que abrir la conexión, la cierra al terminar.
+        nueva = self.open()
+        if self.connection == "conexion-1" and messages[0].to == [self.cortar_en]:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        enviados = super().send_messages(messages)
+        if nueva:
+            self.close()
+        return enviados
+
+
+@pytest.mark.django_db
+def test_corte_a_mitad_de_lote_reintenta_solo_lo_fallido(emails_async):
+    for destinatario in ("a@test.com", "b@test.com", "c@test.com", "d@test.com"):
+        send_notification_email("Asunto", "Mensaje", [destinatario])
+    connection = BackendQueSeCorta()
+    connection.open()
+
+    resultado = enviar_pendientes(connection=connection)
+
+    assert (resultado.enviados, resultado.reintentos) == (3, 1)
+    assert sorted(email.to[0] for email in mail.outbox) == [
+        "a@test.com",
+        "c@test.com",
+        "d@test.com",
+    ]
+    estados = dict(CorreoSaliente.objects.values_list("destinatario", "estado"))
+    assert estados == {
+        "a@test.com": CorreoSaliente.Estados.ENVIADO,
+        "b@test.com": CorreoSaliente.Estados.PENDIENTE,
+        "c@test.com": CorreoSaliente.Estados.ENVIADO,
+        "d@test.com": CorreoSaliente.Estados.ENVIADO,
+    }
+    # La conexión rota se descartó y el resto del lote compartió una sola nueva.
+    assert connection.aperturas == 2
+    assert connection.connection == "conexion-2"
+
+    CorreoSaliente.objects.update(proximo_intento=timezone.now())
+    assert enviar_pendientes(connection=connection).enviados == 1
+    assert len(mail.outbox) == 4
+
+
+@pytest.mark.django_db
+def test_comando_enviar_correos(emails_async):
+    send_notification_email("Asunto", "Mensaje", ["a@test.com"])
+
+    call_command("enviar_correos", "--una-vez", stdout=StringIO())
+
+    assert len(mail.outbox) == 1
+    assert CorreoSaliente.objects.get().estado == CorreoSaliente.Estados.ENVIADO
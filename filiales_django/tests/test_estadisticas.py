@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from apps.entradas.models import SolicitudEntrada
+from apps.filiales import estadisticas
+from apps.filiales.models import Autoridad, FilialEstadisticas
+from apps.pedidos.models import Pedido
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def _estadisticas(filial) -> FilialEstadisticas:
+    return FilialEstadisticas.objects.get(filial=filial)
+
+
+@pytest.mark.django_db
+def test_transiciones_actualizan_contadores(filial, otra_filial, solicitud, pedido):
+    assert _estadisticas(filial).solicitudes_pendiente == 1
+    assert _estadisticas(filial).pedidos_pendiente == 1
+
+    solicitud = SolicitudEntrada.objects.get(pk=solicitud.pk)
+    solicitud.estado = SolicitudEntrada.Estados.APROBADA
+    solicitud.save(update_fields=["estado", "updated_at"])
+    pedido.filial = otra_filial
+    pedido.estado = Pedido.Estados.ENTREGADO
+    pedido.save()
+
+    actual = _estadisticas(filial)
+    assert actual.solicitudes_pendiente == 0
+    assert actual.solicitudes_aprobada == 1
+    assert actual.pedidos_pendiente == 0
+    assert _estadisticas(otra_filial).pedidos_entregado == 1
+
+    solicitud.delete()
+    assert _estadisticas(filial).solicitudes_aprobada == 0
+    assert estadisticas.verificar() == {}
+
+
+@pytest.mark.django_db
+def test_cambiar_autoridades_ajusta_activas(admin_user, filial, monkeypatch):
+    monkeypatch.setattr(
+        "apps.filiales.views.dispatch_webhook", lambda evento, payload: None
+    )
+    for documento in ("10", "11"):
+        Autoridad.objects.create(
+            filial=filial,
+            cargo=Autoridad.Cargos.VOCAL,
+            persona_nombre="Antigua",
+            persona_documento=documento,
+            desde=date(2020, 1, 1),
+        )
+    assert _estadisticas(filial).autoridades_activas == 2
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    client.post(
+        f"/api/filiales/{filial.id}/cambiar-autoridades/",
+        [
+            {
+                "cargo": Autoridad.Cargos.PRESIDENTE,
+                "persona_nombre": "Nueva",
+                "persona_documento": "20",
+                "desde": "2024-01-01",
+            }
+        ],
+        format="json",
+    )
+    assert _estadisticas(filial).autoridades_activas == 1
+    assert estadisticas.verificar() == {}
+
+
+@pytest.mark.django_db
+def test_dashboard_lee_el_rollup(filial, filial_user, solicitud):
+    client = APIClient()
+    client.force_authenticate(filial_user)
+    with CaptureQueriesContext(connection) as queries:
+        respuesta = client.get("/api/dashboard/entradas/estadisticas/")
+    assert respuesta.data == {"pendiente": 1}
+    assert not [q for q in queries if "GROUP BY" in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_rebuild_estadisticas_detecta_y_corrige_desvios(filial, solicitud):
+    SolicitudEntrada.objects.filter(pk=solicitud.pk).update(
+        estado=SolicitudEntrada.Estados.RECHAZADA
+    )
+    with pytest.raises(CommandError):
+        call_command("rebuild_estadisticas", "--verificar")
+    call_command("rebuild_estadisticas")
+    assert _estadisticas(filial).solicitudes_rechazada == 1
+    call_command("rebuild_estadisticas", "--verificar")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from apps.auditoria.models import Accion
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def client(admin_user, filial):
+    Accion.objects.bulk_create(
+        [
+            Accion(
+                usuario=admin_user,
+                filial=filial,
+                recurso="Test",
+                recurso_id=str(numero),
+                accion=Accion.Tipos.CREAR,
+                payload={"numero": numero},
+            )
+            for numero in range(5)
+        ]
+    )
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    return client
+
+
+def _contenido(respuesta) -> bytes:
+    assert respuesta.streaming
+    return b"".join(respuesta.streaming_content)
+
+
+@pytest.mark.django_db
+def test_exportar_csv_con_payload(client):
+    respuesta = client.get("/api/auditoria/exportar/", {"incluir_payload": "true"})
+    filas = list(csv.reader(io.StringIO(_contenido(respuesta).decode())))
+    assert filas[0][-1] == "payload"
+    assert len(filas) == 6
+    assert {json.loads(fila[-1])["numero"] for fila in filas[1:]} == set(range(5))
+
+
+@pytest.mark.django_db
+def test_exportar_jsonl(client):
+    respuesta = client.get("/api/auditoria/exportar/", {"formato": "jsonl"})
+    assert respuesta["Content-Type"] == "application/x-ndjson"
+    registros = [json.loads(linea) for linea in _contenido(respuesta).splitlines()]
+    assert len(registros) == 5
+    assert "payload" not in registros[0]
+    assert registros[0]["recurso"] == "Test"
+
+
+@pytest.mark.django_db
+def test_exportar_csv_gzip(client):
+    respuesta = client.get("/api/auditoria/exportar/", {"formato": "csv.gz"})
+    assert respuesta["Content-Disposition"].endswith("auditoria.csv.gz")
+    texto = gzip.decompress(_contenido(respuesta)).decode()
+    assert texto.startswith("id,usuario,filial")
+    assert texto.count("\n") == 6
+
+
+@pytest.mark.django_db
+def test_exportar_formato_invalido(client):
+    assert client.get("/api/auditoria/exportar/", {"formato": "xml"}).status_code == 400
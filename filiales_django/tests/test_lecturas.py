@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+from apps.mensajes import lecturas
+from apps.mensajes.models import Conversacion, LecturaConversacion, Mensaje
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def conversaciones(admin_user, filial, otra_filial):
+    propia = Conversacion.objects.create(
+        asunto="Micros", creada_por=admin_user, filial=filial
+    )
+    ajena = Conversacion.objects.create(
+        asunto="Cena", creada_por=admin_user, filial=otra_filial
+    )
+    for conversacion in (propia, ajena):
+        for numero in range(3):
+            Mensaje.objects.create(
+                conversacion=conversacion, emisor=admin_user, texto=f"Hola {numero}"
+            )
+    return propia, ajena
+
+
+def _cliente(usuario) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(usuario)
+    return client
+
+
+@pytest.mark.django_db
+def test_no_leidos_en_una_consulta_y_con_alcance(
+    filial_user, conversaciones, django_assert_num_queries
+):
+    propia, _ = conversaciones
+    client = _cliente(filial_user)
+    filial_user.perfil  # noqa: B018 - lo precarga la autenticación
+    with django_assert_num_queries(1):
+        respuesta = client.get("/api/conversaciones/no-leidos/")
+    assert respuesta.data == {
+        "total": 3,
+        "conversaciones": [{"conversacion": propia.id, "no_leidos": 3}],
+    }
+
+    segundo = propia.mensajes.order_by("id")[1]
+    respuesta = client.post(f"/api/mensajes/{segundo.id}/marcar-leido-hasta/")
+    assert respuesta.data == {"conversacion": propia.id, "ultimo_leido": segundo.id}
+    assert client.get("/api/conversaciones/no-leidos/").data["total"] == 1
+
+    # Los mensajes propios no cuentan como pendientes.
+    Mensaje.objects.create(conversacion=propia, emisor=filial_user, texto="Listo")
+    assert client.get("/api/conversaciones/no-leidos/").data["total"] == 1
+
+
+@pytest.mark.django_db
+def test_el_cursor_no_retrocede(filial_user, conversaciones):
+    propia, _ = conversaciones
+    primero, _, ultimo = propia.mensajes.order_by("id")
+    assert lecturas.marcar_leido_hasta(filial_user, ultimo) == ultimo.id
+    assert lecturas.marcar_leido_hasta(filial_user, primero) == ultimo.id
+    lectura = LecturaConversacion.objects.get(usuario=filial_user)
+    assert lectura.ultimo_leido == ultimo.id
+
+
+@pytest.mark.django_db
+def test_no_puede_marcar_mensajes_de_otra_filial(filial_user, conversaciones):
+    _, ajena = conversaciones
+    mensaje = ajena.mensajes.first()
+    respuesta = _cliente(filial_user).post(
+        f"/api/mensajes/{mensaje.id}/marcar-leido-hasta/"
+    )
+    assert respuesta.status_code == 404
+    assert not LecturaConversacion.objects.exists()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import pytest
+from apps.auditoria.models import Accion
+from apps.core.pagination import CursorKeysetPagination
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def acciones(admin_user):
+    return Accion.objects.bulk_create(
+        [
+            Accion(
+                usuario=admin_user,
+                recurso="Test",
+                recurso_id=str(numero),
+                accion=Accion.Tipos.CREAR,
+            )
+            for numero in range(7)
+        ]
+    )
+
+
+@pytest.fixture
+def client(admin_user):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    return client
+
+
+def _ids(respuesta) -> list[int]:
+    return [fila["id"] for fila in respuesta.data["results"]]
+
+
+@pytest.mark.django_db
+def test_cursor_recorre_todas_las_paginas(client, acciones):
+    esperados = [
+        accion.id
+        for accion in sorted(acciones, key=lambda a: (a.created_at, a.id), reverse=True)
+    ]
+    respuesta = client.get("/api/auditoria/", {"cursor": "", "page_size": 3})
+    assert "count" not in respuesta.data
+    assert respuesta.data["previous"] is None
+    vistos = _ids(respuesta)
+    paginas = [respuesta]
+    while respuesta.data["next"]:
+        respuesta = client.get(respuesta.data["next"])
+        paginas.append(respuesta)
+        vistos += _ids(respuesta)
+    assert vistos == esperados
+    anterior = client.get(paginas[-1].data["previous"])
+    assert _ids(anterior) == _ids(paginas[-2])
+
+
+@pytest.mark.django_db
+def test_cursor_sin_count_ni_offset(client, acciones):
+    primera = client.get("/api/auditoria/", {"cursor": "", "page_size": 3})
+    with CaptureQueriesContext(connection) as queries:
+        client.get(primera.data["next"])
+    sqls = " ".join(q["sql"] for q in queries)
+    assert "COUNT(" not in sqls
+    assert "OFFSET" not in sqls
+
+
+def _condicion(queries) -> str:
+    (sql,) = [q["sql"] for q in queries if 'FROM "auditoria_accion"' in q["sql"]]
+    return sql.partition(" WHERE ")[2]
+
+
+@pytest.mark.django_db
+def test_cursor_compara_filas_para_usar_el_indice(client, acciones):
+    primera = client.get("/api/auditoria/", {"cursor": "", "page_size": 3})
+    with CaptureQueriesContext(connection) as queries:
+        segunda = client.get(primera.data["next"])
+    condicion = _condicion(queries)
+    assert '("auditoria_accion"."created_at", "auditoria_accion"."id") < (' in condicion
+    assert " OR " not in condicion
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(segunda.data["previous"])
+    assert (
+        '("auditoria_accion"."created_at", "auditoria_accion"."id") > ('
+        in _condicion(queries)
+    )
+
+
+def test_cursor_con_direcciones_mezcladas_acota_el_primer_campo():
+    paginacion = CursorKeysetPagination()
+    paginacion._fields = {
+        campo: Accion._meta.get_field(campo) for campo in ("created_at", "id")
+    }
+    filtro = paginacion._filtro(
+        [("created_at", True), ("id", False)], ["2026-01-01T00:00:00+00:00", "5"]
+    )
+    sql = str(Accion.objects.filter(filtro).query).partition(" WHERE ")[2]
+    assert sql.startswith('("auditoria_accion"."created_at" <= ')
+    assert '"auditoria_accion"."id" > 5' in sql
+
+
+@pytest.mark.django_db
+def test_cursor_invalido(client, acciones):
+    assert client.get("/api/auditoria/", {"cursor": "no-es-base64"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_conteo_ninguno_y_estimado(client, acciones):
+    with CaptureQueriesContext(connection) as queries:
+        respuesta = client.get("/api/auditoria/", {"conteo": "ninguno", "page_size": 5})
+    assert respuesta.data["count"] is None
+    assert len(respuesta.data["results"]) == 5
+    assert respuesta.data["next"]
+    assert not [q for q in queries if "COUNT(" in q["sql"]]
+
+    ultima = client.get(respuesta.data["next"])
+    assert len(ultima.data["results"]) == 2
+    assert ultima.data["next"] is None
+
+    # Fuera de PostgreSQL la estimación recurre al conteo exacto.
+    estimado = client.get("/api/auditoria/", {"conteo": "estimado"})
+    assert estimado.data["count"] == 7
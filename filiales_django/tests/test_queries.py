@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from apps.acciones.models import AccionImagen, AccionSolidaria
+from apps.core.queries import PresupuestoConsultasExcedido, normalizar_sql
+from apps.entradas.models import SolicitudEntrada
+from apps.mensajes.models import Conversacion, Mensaje
+from apps.pedidos.models import Pedido, PedidoItem
+from apps.pedidos.views import PedidoViewSet
+from rest_framework.test import APIClient
+
+FILAS = 8
+
+
+@pytest.fixture
+def registros(filial, filial_user, admin_user, partido, producto):
+    conversacion = Conversacion.objects.create(
+        asunto="General", creada_por=admin_user, filial=filial
+    )
+    for numero in range(FILAS):
+        pedido = Pedido.objects.create(filial=filial, created_by=filial_user)
+        PedidoItem.objects.create(pedido=pedido, producto=producto, cantidad=numero + 1)
+        SolicitudEntrada.objects.create(
+            filial=filial,
+            partido=partido,
+            cantidad_solicitada=2,
+            created_by=filial_user,
+        )
+        accion = AccionSolidaria.objects.create(
+            filial=filial,
+            nombre=f"Accion {numero}",
+            descripcion="-",
+            fecha=date.today(),
+        )
+        AccionImagen.objects.create(accion=accion, imagen=f"acciones/{numero}.jpg")
+        Mensaje.objects.create(
+            conversacion=conversacion, emisor=admin_user, texto=f"Hola {numero}"
+        )
+
+
+@pytest.fixture
+def client(admin_user):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    return client
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/api/pedidos/", "/api/solicitudes-entrada/", "/api/acciones/", "/api/mensajes/"],
+)
+@pytest.mark.django_db
+def test_listados_dentro_del_presupuesto(registros, client, url):
+    # El middleware estricto falla si hay N+1 o si se supera ``query_budget``.
+    respuesta = client.get(url)
+    assert respuesta.status_code == 200
+    assert len(respuesta.data["results"]) == FILAS
+
+
+@pytest.mark.django_db
+def test_presupuesto_excedido_falla(registros, client, monkeypatch):
+    monkeypatch.setattr(PedidoViewSet, "query_budget", {"list": 1})
+    with pytest.raises(PresupuestoConsultasExcedido, match="presupuesto de 1"):
+        client.get("/api/pedidos/")
+
+
+@pytest.mark.django_db
+def test_n_mas_1_muestreado_solo_se_registra(
+    registros, client, settings, monkeypatch, caplog
+):
+    settings.QUERY_BUDGET_STRICT = False
+    settings.QUERY_BUDGET_SAMPLE_RATE = 1.0
+    monkeypatch.setattr(PedidoViewSet, "queryset", Pedido.objects.all())
+    respuesta = client.get("/api/pedidos/")
+    assert respuesta.status_code == 200
+    assert f"N+1: {FILAS}x" in caplog.text
+
+
+def test_normalizar_sql_agrupa_literales():
+    assert normalizar_sql(
+        "SELECT * FROM t0 WHERE id IN (%s, %s, %s) AND nombre = 'x''y' LIMIT 21"
+    ) == normalizar_sql("SELECT * FROM t0 WHERE id IN (%s) AND nombre = 'z' LIMIT 5")
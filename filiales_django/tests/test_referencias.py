@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+from apps.core import referencias, respuestas
+from apps.entradas.serializers import SolicitudEntradaSerializer
+from apps.filiales.models import Filial
+from apps.partidos.models import Partido
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def _tablas(queries) -> str:
+    return " ".join(query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+def test_campo_referencia_resuelve_desde_cache(partido, filial):
+    datos = {"partido": partido.id, "cantidad_solicitada": 3}
+    assert SolicitudEntradaSerializer(data=datos).is_valid()
+    with CaptureQueriesContext(connection) as queries:
+        serializer = SolicitudEntradaSerializer(data=datos)
+        assert serializer.is_valid(), serializer.errors
+    assert "partidos_partido" not in _tablas(queries)
+    assert serializer.validated_data["partido"].titulo == partido.titulo
+
+    serializer = SolicitudEntradaSerializer(data={**datos, "partido": 999_999})
+    assert not serializer.is_valid()
+    assert "partido" in serializer.errors
+
+
+@pytest.mark.django_db
+def test_guardar_invalida_la_referencia(partido):
+    assert referencias.obtener(Partido, partido.id).habilitado
+    partido.habilitado = False
+    partido.save()
+    assert not referencias.obtener(Partido, partido.id).habilitado
+
+    serializer = SolicitudEntradaSerializer(
+        data={"partido": partido.id, "cantidad_solicitada": 3}
+    )
+    assert not serializer.is_valid()
+
+
+@pytest.mark.django_db
+def test_obtener_devuelve_copias(partido):
+    copia = referencias.obtener(Partido, partido.id)
+    copia.titulo = "Modificado"
+    assert referencias.obtener(Partido, partido.id).titulo == partido.titulo
+
+
+@pytest.mark.django_db
+def test_mapa_de_filiales_cacheado(admin_user, filial, otra_filial):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    assert len(client.get("/api/filiales/mapa/").json()) == 2
+    with CaptureQueriesContext(connection) as queries:
+        assert len(client.get("/api/filiales/mapa/").json()) == 2
+    assert "filiales_filial" not in _tablas(queries)
+
+    Filial.objects.filter(pk=otra_filial.pk).update(activa=False)
+    referencias.invalidar(Filial, [otra_filial.pk])
+    respuestas.invalidar(Filial._meta.label)
+    assert [fila["id"] for fila in client.get("/api/filiales/mapa/").json()] == [
+        filial.id
+    ]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+from apps.core import respuestas
+from apps.entradas import cupos
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def _cliente(usuario) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(usuario)
+    return client
+
+
+@pytest.mark.django_db
+def test_listado_de_partidos_cacheado_sin_consultas(admin_user, partido):
+    client = _cliente(admin_user)
+    primera = client.get("/api/partidos/")
+    assert primera.status_code == 200
+    with CaptureQueriesContext(connection) as queries:
+        segunda = client.get("/api/partidos/")
+    assert segunda.status_code == 200
+    assert segunda.json() == primera.json()
+    assert segunda["ETag"] == primera["ETag"]
+    assert not [q for q in queries if "partidos_partido" in q["sql"]]
+
+    no_modificado = client.get("/api/partidos/", HTTP_IF_NONE_MATCH=primera["ETag"])
+    assert no_modificado.status_code == 304
+
+
+@pytest.mark.django_db
+def test_clave_por_query_params_y_alcance(
+    admin_user, filial_user, filial, otra_filial, partido
+):
+    admin = _cliente(admin_user)
+    assert len(admin.get("/api/filiales/mapa/").json()) == 2
+    mapa_filial = _cliente(filial_user).get("/api/filiales/mapa/").json()
+    assert [fila["id"] for fila in mapa_filial] == [filial.id]
+
+    assert admin.get("/api/partidos/", {"habilitado": "false"}).json()["count"] == 0
+    assert admin.get("/api/partidos/").json()["count"] == 1
+
+
+@pytest.mark.django_db
+def test_clave_compartida_por_alcance_salvo_por_usuario(filial_user, filial):
+    companero = get_user_model().objects.create_user("companero", password="x")
+    companero.perfil.filial = filial
+    companero.perfil.save()
+
+    def clave(usuario, **kwargs):
+        request = RequestFactory().get("/api/filiales/mapa/")
+        request.user = usuario
+        return respuestas._clave("vista", request, **kwargs)
+
+    assert clave(filial_user) == clave(companero)
+    assert clave(filial_user, por_usuario=True) != clave(companero, por_usuario=True)
+
+
+@pytest.mark.django_db
+def test_update_de_cupo_invalida_el_listado(admin_user, partido):
+    client = _cliente(admin_user)
+    assert client.get("/api/partidos/").json()["results"][0]["cupo_disponible"] == 200
+    cupos.reservar(partido.id, 30)
+    assert client.get("/api/partidos/").json()["results"][0]["cupo_disponible"] == 170
+
+    partido.titulo = "Renombrado"
+    partido.save()
+    assert client.get("/api/partidos/").json()["results"][0]["titulo"] == "Renombrado"
+
+
+@pytest.mark.django_db
+def test_errores_no_se_cachean(admin_user, partido):
+    client = _cliente(admin_user)
+    assert client.get("/api/partidos/", {"page": 9}).status_code == 404
+    assert client.get("/api/partidos/", {"page": 9}).status_code == 404
+    assert client.get("/api/partidos/").status_code == 200
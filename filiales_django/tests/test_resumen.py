@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from apps.mensajes import resumen
+from apps.mensajes.models import LARGO_VISTA_PREVIA, Conversacion, Mensaje
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def conversacion(admin_user, filial):
+    return Conversacion.objects.create(
+        asunto="Micros", creada_por=admin_user, filial=filial
+    )
+
+
+def _enviar(conversacion, emisor, texto: str) -> Mensaje:
+    return Mensaje.objects.create(conversacion=conversacion, emisor=emisor, texto=texto)
+
+
+@pytest.mark.django_db
+def test_altas_ediciones_y_bajas_mantienen_el_resumen(admin_user, conversacion):
+    primero = _enviar(conversacion, admin_user, "Salimos a las 8")
+    segundo = _enviar(conversacion, admin_user, "x" * (LARGO_VISTA_PREVIA + 20))
+    conversacion.refresh_from_db()
+    assert conversacion.total_mensajes == 2
+    assert conversacion.ultimo_mensaje_at == segundo.created_at
+    assert conversacion.ultimo_mensaje_preview == "x" * LARGO_VISTA_PREVIA
+
+    segundo.texto = "Cambio de planes"
+    segundo.save()
+    conversacion.refresh_from_db()
+    assert conversacion.ultimo_mensaje_preview == "Cambio de planes"
+
+    segundo.delete()
+    conversacion.refresh_from_db()
+    assert conversacion.total_mensajes == 1
+    assert conversacion.ultimo_mensaje_at == primero.created_at
+    assert conversacion.ultimo_mensaje_preview == "Salimos a las 8"
+
+    primero.delete()
+    conversacion.refresh_from_db()
+    assert conversacion.total_mensajes == 0
+    assert conversacion.ultimo_mensaje_at is None
+    assert conversacion.ultimo_mensaje_preview == ""
+
+
+@pytest.mark.django_db
+def test_un_alta_anterior_no_desplaza_al_ultimo(admin_user, conversacion):
+    # Simula que otra transacción confirmó antes un mensaje más reciente.
+    posterior = timezone.now() + timedelta(minutes=1)
+    Conversacion.objects.filter(pk=conversacion.pk).update(
+        ultimo_mensaje_at=posterior, ultimo_mensaje_preview="Posterior"
+    )
+    _enviar(conversacion, admin_user, "Anterior")
+    conversacion.refresh_from_db()
+    assert conversacion.total_mensajes == 1
+    assert conversacion.ultimo_mensaje_at == posterior
+    assert conversacion.ultimo_mensaje_preview == "Posterior"
+
+
+@pytest.mark.django_db
+def test_recalcular_corrige_desvios(admin_user, conversacion):
+    _enviar(conversacion, admin_user, "Hola")
+    Conversacion.objects.update(total_mensajes=9, ultimo_mensaje_preview="?")
+    assert resumen.recalcular([conversacion.id]) == 1
+    conversacion.refresh_from_db()
+    assert (conversacion.total_mensajes, conversacion.ultimo_mensaje_preview) == (
+        1,
+        "Hola",
+    )
+
+
+@pytest.mark.django_db
+def test_borrar_la_conversacion_no_actualiza_por_mensaje(admin_user, conversacion):
+    for numero in range(3):
+        _enviar(conversacion, admin_user, f"Hola {numero}")
+    with CaptureQueriesContext(connection) as queries:
+        conversacion.delete()
+    assert not [q for q in queries if q["sql"].startswith("UPDATE")]
+
+
+@pytest.mark.django_db
+def test_bandeja_ordenada_por_actividad_sin_leer_mensajes(
+    admin_user, filial, conversacion
+):
+    vacia = Conversacion.objects.create(
+        asunto="Sin mensajes", creada_por=admin_user, filial=filial
+    )
+    reciente = Conversacion.objects.create(
+        asunto="Cena", creada_por=admin_user, filial=filial
+    )
+    _enviar(conversacion, admin_user, "Viejo")
+    Conversacion.objects.filter(pk=conversacion.pk).update(
+        ultimo_mensaje_at=timezone.now() - timedelta(days=1)
+    )
+    _enviar(reciente, admin_user, "Nuevo")
+
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    with CaptureQueriesContext(connection) as queries:
+        respuesta = client.get("/api/conversaciones/")
+    assert [fila["id"] for fila in respuesta.data["results"]] == [
+        reciente.id,
+        conversacion.id,
+        vacia.id,
+    ]
+    assert respuesta.data["results"][0]["ultimo_mensaje_preview"] == "Nuevo"
+    assert respuesta.data["results"][0]["total_mensajes"] == 1
+    assert not [q for q in queries if '"mensajes_mensaje"' in q["sql"]]
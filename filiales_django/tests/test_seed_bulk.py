@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from io import StringIO
+
+import pytest
+from apps.core.bulk import insertar, lotes
+from apps.entradas import cupos
+from apps.entradas.models import AsignacionEntrada, SolicitudEntrada
+from apps.filiales import estadisticas
+from apps.filiales.models import Filial
+from apps.mensajes.models import Mensaje
+from apps.partidos.models import Partido
+from apps.pedidos.models import PedidoItem
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+
+ARGUMENTOS = [
+    "--bulk",
+    "--batch-size=7",
+    "--filiales=3",
+    "--partidos=2",
+    "--solicitudes=40",
+    "--pedidos=5",
+    "--conversaciones=4",
+    "--mensajes=25",
+]
+
+
+def test_lotes_corta_en_bloques():
+    assert [len(lote) for lote in lotes(range(10), 4)] == [4, 4, 2]
+
+
+@pytest.mark.django_db
+def test_insertar_devuelve_ids_y_reporta_progreso():
+    avisos = []
+    ids = insertar(
+        Filial,
+        (
+            Filial(codigo=f"BULK-{n}", nombre=f"Bulk {n}", ciudad="X", provincia="Y")
+            for n in range(5)
+        ),
+        batch_size=2,
+        total=5,
+        con_ids=True,
+        progreso=lambda *aviso: avisos.append(aviso),
+    )
+    assert sorted(ids) == sorted(Filial.objects.values_list("pk", flat=True))
+    assert [insertados for _, insertados, _ in avisos] == [2, 4, 5]
+
+
+@pytest.mark.django_db
+def test_seed_datos_bulk_genera_datos_consistentes():
+    salida = StringIO()
+    call_command("seed_datos", *ARGUMENTOS, stdout=salida)
+
+    assert Filial.objects.count() == 3
+    assert SolicitudEntrada.objects.count() == 40
+    assert PedidoItem.objects.count() == 15
+    assert Mensaje.objects.count() == 25
+    assert get_user_model().objects.filter(username="admin_global").exists()
+    assert "100%" in salida.getvalue()
+
+    for solicitud in SolicitudEntrada.objects.exclude(
+        estado=SolicitudEntrada.Estados.PENDIENTE
+    ).exclude(estado=SolicitudEntrada.Estados.RECHAZADA):
+        assert solicitud.asignaciones.exists()
+    for partido in Partido.objects.all():
+        asignado = (
+            AsignacionEntrada.objects.filter(solicitud__partido=partido).aggregate(
+                total=Sum("cantidad_asignada")
+            )["total"]
+            or 0
+        )
+        assert partido.cupo_disponible == partido.cupo_total - asignado
+    assert estadisticas.verificar() == {}
+    assert cupos.recalcular_totales(corregir=False) == {}
+
+
+@pytest.mark.django_db
+def test_seed_datos_bulk_requiere_base_vacia(filial):
+    with pytest.raises(CommandError):
+        call_command("seed_datos", *ARGUMENTOS, stdout=StringIO())
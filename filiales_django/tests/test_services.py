@@ -23,6 +23,7 @@ def test_send_notification_email_respects_flags(settings, monkeypatch):
     assert not sent
 
     settings.EMAILS_ENABLED = True
+    settings.EMAILS_ASYNC = False
     send_notification_email("Asunto", "Mensaje", ["", "dest@test.com"])
     assert sent
 
@@ -41,6 +42,7 @@ def test_dispatch_webhook_conditions(settings, monkeypatch):
     assert not posted
 
     settings.WEBHOOKS_ENABLED = True
+    settings.WEBHOOKS_ASYNC = False
     settings.WEBHOOK_URL_EVENTOS = "https://webhook.test/eventos"
     dispatch_webhook("eventos", {"a": 1})
     assert posted
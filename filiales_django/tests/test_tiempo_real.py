@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from apps.core import pubsub
+from apps.core.pubsub import Evento, SuscripcionDesbordada
+from apps.mensajes import alcance, tiempo_real
+from apps.mensajes.models import Conversacion, Mensaje
+from apps.mensajes.views import stream_mensajes
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def test_broker_local_reparte_por_canal_y_corta_a_los_lentos():
+    async def escenario():
+        broker = pubsub.BrokerLocal(maximo=2)
+        rapida = await broker.suscribir(["a"])
+        otra = await broker.suscribir(["b"])
+        broker.publicar("a", Evento("hola", {"n": 1}))
+        assert (await rapida.recibir(1)).datos == {"n": 1}
+        assert await otra.recibir(0.01) is None
+        for _ in range(3):
+            broker.publicar("a", Evento("hola"))
+        await asyncio.sleep(0)
+        with pytest.raises(SuscripcionDesbordada):
+            await rapida.recibir(1)
+        await rapida.cerrar()
+        await otra.cerrar()
+        broker.publicar("a", Evento("nadie"))
+
+    async_to_sync(escenario)()
+
+
+def test_broker_incompleto_falla_al_instanciarse():
+    class SinSuscribir(pubsub.Broker):
+        def publicar(self, canal, evento):
+            pass
+
+    with pytest.raises(TypeError):
+        SinSuscribir()
+
+
+@pytest.fixture
+def conversaciones(admin_user, filial, otra_filial):
+    return (
+        Conversacion.objects.create(
+            asunto="Micros", creada_por=admin_user, filial=filial
+        ),
+        Conversacion.objects.create(
+            asunto="Cena", creada_por=admin_user, filial=otra_filial
+        ),
+    )
+
+
+@pytest.mark.django_db
+def test_stream_entrega_solo_lo_visible(
+    settings, filial_user, conversaciones, django_capture_on_commit_callbacks
+):
+    settings.MENSAJES_STREAM_KEEPALIVE = 0.05
+    propia, ajena = conversaciones
+    canales = alcance.canales(filial_user)
+
+    def enviar(conversacion, texto):
+        with django_capture_on_commit_callbacks(execute=True):
+            return Mensaje.objects.create(
+                conversacion=conversacion, emisor=filial_user, texto=texto
+            )
+
+    async def escenario():
+        stream = tiempo_real.eventos(filial_user, canales)
+        recibido = [await anext(stream)]
+        await sync_to_async(enviar)(ajena, "Ajeno")
+        mensaje = await sync_to_async(enviar)(propia, "Hola")
+        recibido += [await anext(stream), await anext(stream)]
+        await stream.aclose()
+        return mensaje, recibido
+
+    mensaje, (inicio, evento, ping) = async_to_sync(escenario)()
+    assert inicio == "retry: 3000\n\n"
+    assert evento.startswith(f"event: mensaje\nid: {mensaje.id}\ndata: ")
+    assert '"texto":"Hola"' in evento
+    assert ping == ": ping\n\n"
+
+
+@pytest.mark.django_db
+def test_reanuda_desde_last_event_id(settings, filial_user, conversaciones):
+    settings.MENSAJES_STREAM_KEEPALIVE = 0.01
+    propia, ajena = conversaciones
+    primero, segundo, _ = (
+        Mensaje.objects.create(conversacion=conversacion, emisor=filial_user, texto="-")
+        for conversacion in (propia, propia, ajena)
+    )
+    canales = alcance.canales(filial_user)
+
+    async def escenario():
+        stream = tiempo_real.eventos(filial_user, canales, primero.id)
+        recibido = [await anext(stream) for _ in range(3)]
+        await stream.aclose()
+        return recibido
+
+    _, pendiente, ping = async_to_sync(escenario)()
+    assert f"id: {segundo.id}\n" in pendiente
+    assert ping == ": ping\n\n"
+
+
+@pytest.mark.django_db
+def test_vista_autentica_y_exige_alcance(filial_user):
+    fabrica = RequestFactory()
+    respuesta = async_to_sync(stream_mensajes)(fabrica.get("/api/mensajes/stream/"))
+    assert respuesta.status_code == 401
+
+    client = APIClient()
+    client.force_authenticate(filial_user)
+    ticket = client.post("/api/mensajes/stream-ticket/").data["ticket"]
+    respuesta = async_to_sync(stream_mensajes)(
+        fabrica.get("/api/mensajes/stream/", {"ticket": ticket})
+    )
+    assert respuesta.status_code == 200
+    assert respuesta["Content-Type"] == "text/event-stream"
+
+    sin_filial = get_user_model().objects.create_user("suelto", password="x")
+    respuesta = async_to_sync(stream_mensajes)(
+        fabrica.get(
+            "/api/mensajes/stream/",
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(sin_filial)}",
+        )
+    )
+    assert respuesta.status_code == 403
+
+
+@pytest.mark.django_db
+def test_la_url_no_acepta_tokens_de_acceso_ni_tickets_vencidos(settings, filial_user):
+    fabrica = RequestFactory()
+    token = str(AccessToken.for_user(filial_user))
+    for parametros in ({"token": token}, {"ticket": token}):
+        request = fabrica.get("/api/mensajes/stream/", parametros)
+        assert tiempo_real.autenticar(request) is None
+
+    ticket = tiempo_real.emitir_ticket(filial_user)
+    request = fabrica.get("/api/mensajes/stream/", {"ticket": ticket})
+    assert tiempo_real.autenticar(request) == filial_user
+    settings.MENSAJES_STREAM_TICKET_TTL = -1
+    assert tiempo_real.autenticar(request) is None
+
+
+@pytest.mark.django_db
+def test_el_evento_se_serializa_al_confirmar(
+    monkeypatch, filial_user, conversaciones, django_capture_on_commit_callbacks
+):
+    serializados = []
+    original = tiempo_real.evento_mensaje
+    monkeypatch.setattr(
+        tiempo_real,
+        "evento_mensaje",
+        lambda mensaje: serializados.append(mensaje.pk) or original(mensaje),
+    )
+    publicados = []
+    monkeypatch.setattr(
+        pubsub, "publicar", lambda canales, evento: publicados.append(evento)
+    )
+    with django_capture_on_commit_callbacks() as callbacks:
+        mensaje = Mensaje.objects.create(
+            conversacion=conversaciones[0], emisor=filial_user, texto="Hola"
+        )
+        mensaje.texto = "Hola!"
+        mensaje.save()
+    assert serializados == []
+    for callback in callbacks:
+        callback()
+    assert serializados == [mensaje.pk, mensaje.pk]
+    assert [evento.tipo for evento in publicados] == ["mensaje", "mensaje_editado"]
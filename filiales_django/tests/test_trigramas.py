@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+from apps.core import trigramas
+from apps.filiales.models import Autoridad, Filial
+from rest_framework.test import APIClient
+
+
+def test_trigramas_como_pg_trgm():
+    assert trigramas.trigramas("Cat") == {"  c", " ca", "cat", "at "}
+    assert trigramas.similitud(
+        trigramas.trigramas("rosario"), trigramas.trigramas("rosario")
+    ) == pytest.approx(1.0)
+
+
+def test_indice_tolera_errores_y_subcadenas():
+    indice = trigramas.IndiceTrigramas(
+        [(1, "Filial Rosario", "Rosario"), (2, "Filial Córdoba", "Córdoba")]
+    )
+    assert [pk for pk, _ in indice.buscar("rosaroi", 5)] == [1]
+    assert [pk for pk, _ in indice.buscar("cordob", 5)] == [2]
+    assert [pk for pk, _ in indice.buscar("sari", 5)] == [1]
+    assert indice.buscar("zzzz", 5) == []
+
+
+@pytest.mark.django_db
+def test_endpoint_buscar_filiales(admin_user, filial, otra_filial):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    objetivo = Filial.objects.get(pk=otra_filial.pk)
+    texto = objetivo.nombre[:-1] + "x"
+    respuesta = client.get("/api/filiales/buscar/", {"q": texto, "limite": 1})
+    assert respuesta.status_code == 200
+    assert [fila["id"] for fila in respuesta.data] == [objetivo.id]
+    assert 0 < respuesta.data[0]["similitud"] <= 1
+    assert client.get("/api/filiales/buscar/", {"q": ""}).data == []
+
+
+@pytest.mark.django_db
+def test_endpoint_buscar_respeta_el_alcance(filial_user, filial, otra_filial):
+    for unidad, nombre in ((filial, "Juan Pérez"), (otra_filial, "Juana Pereyra")):
+        Autoridad.objects.create(
+            filial=unidad,
+            cargo=Autoridad.Cargos.PRESIDENTE,
+            persona_nombre=nombre,
+            persona_documento="123",
+            desde="2024-01-01",
+        )
+    client = APIClient()
+    client.force_authenticate(filial_user)
+    respuesta = client.get("/api/autoridades/buscar/", {"q": "juan peres"})
+    assert [fila["persona_nombre"] for fila in respuesta.data] == ["Juan Pérez"]
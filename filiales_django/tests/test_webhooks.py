@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pytest
+from apps.core.models import WebhookSaliente
+from apps.core.services import dispatch_webhook
+from apps.core.webhooks import crear_sesion, entregar_pendientes
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    recibidos: list[tuple[str, dict]] = []
+
+    def do_POST(self):  # noqa: N802 - API de http.server
+        longitud = int(self.headers.get("Content-Length", 0))
+        cuerpo = json.loads(self.rfile.read(longitud) or b"{}")
+        self.recibidos.append((self.path, cuerpo))
+        status = {"/ok": 200, "/invalido": 400}.get(self.path, 503)
+        self.send_response(status)
+        self.end_headers()
+
+    def log_message(self, *args):  # pragma: no cover - silencia la salida
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    _StubHandler.recibidos = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", _StubHandler.recibidos
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session():
+    session = crear_sesion()
+    session.trust_env = False
+    yield session
+    session.close()
+
+
+@pytest.mark.django_db
+def test_dispatch_webhook_encola_sin_llamar_al_receptor(settings, stub_server):
+    base_url, recibidos = stub_server
+    settings.WEBHOOKS_ENABLED = True
+    settings.WEBHOOKS_ASYNC = True
+    settings.WEBHOOK_URL_EVENTOS = f"{base_url}/ok"
+
+    dispatch_webhook("eventos", {"evento": "prueba"})
+
+    webhook = WebhookSaliente.objects.get()
+    assert webhook.estado == WebhookSaliente.Estados.PENDIENTE
+    assert not recibidos
+
+
+@pytest.mark.django_db
+def test_entregar_pendientes_envia_el_lote(settings, stub_server, session):
+    base_url, recibidos = stub_server
+    settings.WEBHOOKS_ENABLED = True
+    settings.WEBHOOK_URL_EVENTOS = f"{base_url}/ok"
+    for numero in range(3):
+        dispatch_webhook("eventos", {"numero": numero})
+
+    resultado = entregar_pendientes(session=session)
+
+    assert resultado.enviados == 3
+    assert sorted(cuerpo["numero"] for _, cuerpo in recibidos) == [0, 1, 2]
+    assert not WebhookSaliente.objects.exclude(
+        estado=WebhookSaliente.Estados.ENVIADO
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_entregar_pendientes_reintenta_y_descarta(settings, stub_server, session):
+    base_url, recibidos = stub_server
+    settings.WEBHOOKS_ENABLED = True
+    settings.WEBHOOK_MAX_INTENTOS = 2
+    settings.WEBHOOK_URL_EVENTOS = f"{base_url}/caido"
+    dispatch_webhook("eventos", {"a": 1})
+
+    resultado = entregar_pendientes(session=session)
+    webhook = WebhookSaliente.objects.get()
+    assert resultado.reintentos == 1
+    assert webhook.estado == WebhookSaliente.Estados.PENDIENTE
+    assert webhook.intentos == 1
+    assert webhook.proximo_intento > timezone.now()
+
+    # Todavía no corresponde reintentar.
+    assert entregar_pendientes(session=session).procesados == 0
+
+    WebhookSaliente.objects.update(proximo_intento=timezone.now())
+    resultado = entregar_pendientes(session=session)
+    webhook.refresh_from_db()
+    assert resultado.descartados == 1
+    assert webhook.estado == WebhookSaliente.Estados.DESCARTADO
+    assert "503" in webhook.ultimo_error
+    assert len(recibidos) == 2
+
+
+@pytest.mark.django_db
+def test_error_de_cliente_se_descarta_sin_reintentos(settings, stub_server, session):
+    base_url, _ = stub_server
+    settings.WEBHOOKS_ENABLED = True
+    settings.WEBHOOK_URL_EVENTOS = f"{base_url}/invalido"
+    dispatch_webhook("eventos", {"a": 1})
+
+    resultado = entregar_pendientes(session=session)
+
+    assert resultado.descartados == 1
+    assert WebhookSaliente.objects.get().intentos == 1
+
+
+@pytest.mark.django_db
+def test_comando_enviar_webhooks(settings, stub_server, monkeypatch):
+    base_url, recibidos = stub_server
+    settings.WEBHOOKS_ENABLED = True
+    settings.WEBHOOK_URL_AUDITORIA = f"{base_url}/ok"
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    dispatch_webhook("auditoria", {"id": 1})
+
+    call_command("enviar_webhooks", "--una-vez", stdout=StringIO())
+
+    assert recibidos == [("/ok", {"id": 1})]
+    assert WebhookSaliente.objects.get().estado == WebhookSaliente.Estados.ENVIADO